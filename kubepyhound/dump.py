@@ -1,6 +1,7 @@
 from typing_extensions import Annotated
 from kubernetes import client, config
-from kubernetes.dynamic import DynamicClient
+from kubernetes.client.exceptions import ApiException
+from urllib3.exceptions import MaxRetryError
 from kubepyhound.models.k8s.pod import Pod, Volume as PodVolume
 from kubepyhound.models.k8s.namespace import Namespace
 from kubepyhound.models.k8s.node import Node
@@ -9,6 +10,7 @@ from kubepyhound.models.k8s.cluster import Cluster
 from kubepyhound.models.k8s.cluster_role import ClusterRole
 from kubepyhound.models.k8s.resource import Resource
 from kubepyhound.models.k8s.resource_group import ResourceGroup, GroupVersion
+from kubepyhound.models.k8s.skipped import SkippedObjects
 from kubepyhound.models.k8s.role_binding import RoleBinding
 from kubepyhound.models.k8s.cluster_role_binding import ClusterRoleBinding
 from kubepyhound.models.k8s.endpoint_slice import EndpointSlice
@@ -20,25 +22,87 @@ from kubepyhound.models.k8s.replicaset import ReplicaSet
 from kubepyhound.models.k8s.daemonset import DaemonSet
 from kubepyhound.models.k8s.volume import Volume
 from kubepyhound.models.eks.user import IAMUser
-from kubepyhound.utils.helpers import DumpClient
+from kubepyhound.utils.helpers import (
+    DumpClient,
+    RAW_DIR,
+    dump_files,
+    load_objects,
+)
+from kubepyhound.utils.pager import (
+    paginate,
+    watch as watch_changes,
+    Page,
+    ResourceVersionExpired,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_WATCH_TIMEOUT,
+    METADATA_ONLY,
+    PRUNED_FIELDS,
+)
+from kubepyhound.utils.checkpoint import Checkpoint
+from kubepyhound.utils import protobuf
+from kubepyhound.utils.discovery import DiscoveryCatalog, APIResource, cache_file
+from kubepyhound.utils.pipeline import (
+    Pipeline,
+    Run,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_PARSE_WORKERS,
+)
+from kubepyhound.utils.throttle import (
+    RateLimiter,
+    ThrottledApiClient,
+    DEFAULT_QPS,
+    DEFAULT_BURST,
+    DEFAULT_POOL_SIZE,
+)
+from kubepyhound.utils.tables import load_tables, TABLES_PATH, DATABASE
 from kubepyhound.models.k8s.generic import Generic
 from kubepyhound.models.k8s.service_account import ServiceAccount
 from pathlib import Path
 from rich.progress import (
     Progress,
     SpinnerColumn,
+    TaskID,
     TextColumn,
     TimeElapsedColumn,
 )
 from enum import Enum
-from dataclasses import dataclass
+from http import HTTPStatus
+from dataclasses import dataclass, field, replace
+from contextvars import ContextVar
+from contextlib import nullcontext, redirect_stderr, redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pydantic import BaseModel
+from typing import Any, Callable, Iterator
 from rich.console import Console
-from functools import wraps
+from rich.table import Table
+from functools import partial, wraps
 import duckdb
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import threading
+import time
+import traceback
 import typer
-import glob
 
+DEFAULT_GENERIC_CONCURRENCY = 8
+DEFAULT_GENERIC_TIMEOUT = 60
+WATCH_CHECKPOINT = ".watch-checkpoint.json"
+DUMP_CHECKPOINT = ".dump-checkpoint.json"
+# Checkpoint entry with the last segment index and size per directory
+SEGMENTS_KEY = "segments"
+WATCH_RETRY_DELAY = 5
+DEFAULT_PARALLEL_CLUSTERS = 4
+CLUSTER_LOG = "dump.log"
+SHARD_RETRIES = 3
+SHARD_RETRY_DELAY = 2
+# Status 0 is how the client reports connection and TLS failures
+SHARD_RETRY_STATUSES = (0, 429, 500, 502, 503, 504)
 IDENTITY_MAPPING = {"User": User, "Group": Group}
+# Fields every resource type can be selected by
+SELECTOR_FIELDS = ("metadata.name", "metadata.namespace")
 RESOURCE_TYPES = {
     "Pod": Pod,
     "ServiceAccount": ServiceAccount,
@@ -56,14 +120,182 @@ RESOURCE_TYPES = {
 }
 
 
+def join_selectors(*selectors: str | None) -> str | None:
+    return ",".join(selector for selector in selectors if selector) or None
+
+
+def selector_fields(selector: str | None) -> set[str]:
+    """The fields a field selector compares, e.g. status.phase"""
+    if not selector:
+        return set()
+    return {
+        re.split("!=|==|=", requirement, maxsplit=1)[0].strip()
+        for requirement in selector.split(",")
+    }
+
+
+@dataclass
+class Selection:
+    """The objects to collect, as filters that the API server applies"""
+
+    namespaces: list[str] = field(default_factory=list)
+    exclude_namespaces: list[str] = field(default_factory=list)
+    label_selector: str | None = None
+    field_selector: str | None = None
+
+    def supporting(self, fields: tuple[str, ...]) -> "Selection":
+        """The selection for a resource type whose objects can also be
+        selected by ``fields``: the field selector only applies when the type
+        supports every field it compares, the API server rejects it otherwise"""
+        if selector_fields(self.field_selector) <= {*SELECTOR_FIELDS, *fields}:
+            return self
+        return replace(self, field_selector=None)
+
+    def list_calls(
+        self,
+        list_func: Callable[..., Any],
+        namespace_field: str | None = None,
+        namespaced_list_func: Callable[..., Any] | None = None,
+    ) -> list[Callable[..., Any]]:
+        """The list calls that together return the selected objects: one per
+        selected namespace, or a single call over all namespaces that leaves
+        out the excluded ones. ``namespace_field`` is the field holding the
+        namespace of an object, None when namespaces do not apply"""
+        if namespace_field and self.namespaces:
+            namespaces = [
+                namespace
+                for namespace in self.namespaces
+                if namespace not in self.exclude_namespaces
+            ]
+            if namespaced_list_func:
+                return [
+                    partial(
+                        namespaced_list_func,
+                        namespace=namespace,
+                        label_selector=self.label_selector,
+                        field_selector=self.field_selector,
+                    )
+                    for namespace in namespaces
+                ]
+            return [
+                partial(
+                    list_func,
+                    label_selector=self.label_selector,
+                    field_selector=join_selectors(
+                        self.field_selector, f"{namespace_field}={namespace}"
+                    ),
+                )
+                for namespace in namespaces
+            ]
+
+        field_selector = self.field_selector
+        if namespace_field:
+            field_selector = join_selectors(
+                field_selector,
+                *(
+                    f"{namespace_field}!={namespace}"
+                    for namespace in self.exclude_namespaces
+                ),
+            )
+        return [
+            partial(
+                list_func,
+                label_selector=self.label_selector,
+                field_selector=field_selector,
+            )
+        ]
+
+
 @dataclass
 class Options:
     client: DumpClient
+    page_size: int = DEFAULT_PAGE_SIZE
+    progress: Progress | None = None
+    refresh_discovery: bool = False
+    catalog: DiscoveryCatalog | None = None
+    selection: Selection = field(default_factory=Selection)
+    active_only: bool = False
+    context: str | None = None
+    pipeline: Pipeline | None = None
+    # Progress of `dump all`, so --resume can skip work that was done
+    checkpoint: Checkpoint | None = None
+    protobuf: bool = False
+    # Members to prune per collection resource, replacing Collection.prune
+    prune: dict[str, tuple[str, ...]] = field(default_factory=dict)
+    # Objects are stored as received, see raw_lines and expand_raw
+    raw: bool = False
+
+
+# Every request of the process draws from the same budget, set by --qps/--burst,
+# and goes through the connection pool of one shared client
+rate_limiter = RateLimiter()
+shared_client: ThrottledApiClient | None = None
+shared_client_lock = threading.Lock()
+
+
+def configure_client(qps: float, burst: int, pool_size: int, gzip: bool) -> None:
+    global shared_client
+    rate_limiter.configure(qps, burst)
+    with shared_client_lock:
+        shared_client = ThrottledApiClient(rate_limiter, pool_size=pool_size, gzip=gzip)
+
+
+def kube_client() -> client.ApiClient:
+    global shared_client
+    with shared_client_lock:
+        if shared_client is None:
+            shared_client = ThrottledApiClient(rate_limiter)
+        return shared_client
+
+
+# Collectors running concurrently in `dump all` share a single discovery
+discovery_lock = threading.Lock()
+
+
+def discovery_catalog(options: Options) -> DiscoveryCatalog:
+    with discovery_lock:
+        if options.catalog is None:
+            api_client = kube_client()
+            version = client.VersionApi(api_client).get_code(_preload_content=False)
+            server_version = json.loads(version.data)["gitVersion"]
+            options.catalog = DiscoveryCatalog.load(
+                api_client,
+                cache_file(cluster_name(options.context), server_version),
+                refresh=options.refresh_discovery,
+            )
+        return options.catalog
+
+
+@dataclass
+class CollectorTask:
+    progress: Progress
+    task_id: TaskID
+    name: str
+    count: int = 0
+
+    def advance(self, page: Page) -> None:
+        self.count += page.count
+        self.progress.update(
+            self.task_id,
+            description=f"Collecting {self.name}: page {page.number} ({self.count} objects)",
+        )
+
+
+current_task: ContextVar[CollectorTask | None] = ContextVar(
+    "current_task", default=None
+)
 
 
 class OutputFormat(str, Enum):
     simple = "simple"
     ndjson = "ndjson"
+    parquet = "parquet"
+    duckdb = "duckdb"
+
+
+class Compression(str, Enum):
+    gzip = "gzip"
+    zstd = "zstd"
 
 
 OutputPath = Annotated[
@@ -74,7 +306,6 @@ OutputPath = Annotated[
 ]
 
 dump_app = typer.Typer()
-config.load_kube_config()
 
 
 @dump_app.callback()
@@ -84,26 +315,205 @@ def main(
     output_format: OutputFormat = typer.Option(
         OutputFormat.simple, "--format", case_sensitive=False
     ),
+    page_size: int = typer.Option(
+        DEFAULT_PAGE_SIZE, "--page-size", min=1, help="Objects per list request"
+    ),
+    segment_size: int = typer.Option(
+        0,
+        "--segment-size",
+        min=0,
+        help="Start a new ndjson segment after this many MiB (0 disables rotation)",
+    ),
+    compression: Compression | None = typer.Option(
+        None, "--compress", case_sensitive=False, help="Compress every output file"
+    ),
+    refresh_discovery: bool = typer.Option(
+        False,
+        "--refresh-discovery",
+        help="Rediscover the API resources instead of using the cached discovery",
+    ),
+    namespaces: list[str] = typer.Option(
+        None, "--namespace", "-n", help="Only collect this namespace, may be repeated"
+    ),
+    exclude_namespaces: list[str] = typer.Option(
+        None, "--exclude-namespace", help="Skip this namespace, may be repeated"
+    ),
+    label_selector: str | None = typer.Option(
+        None, "--label-selector", "-l", help="Only collect objects with these labels"
+    ),
+    field_selector: str | None = typer.Option(
+        None,
+        "--field-selector",
+        help=(
+            "Only collect objects matching these fields, applied to the resource "
+            "types that support every field it compares"
+        ),
+    ),
+    active_only: bool = typer.Option(
+        False,
+        "--active-only",
+        help="Leave out terminated pods and ReplicaSets scaled down to zero",
+    ),
+    qps: float = typer.Option(
+        DEFAULT_QPS,
+        "--qps",
+        min=0,
+        help="Requests per second to the API server, 0 disables the limit",
+    ),
+    burst: int = typer.Option(
+        DEFAULT_BURST,
+        "--burst",
+        min=1,
+        help="Requests allowed above --qps in a burst, and at once",
+    ),
+    context: str | None = typer.Option(
+        None, "--context", help="Kubeconfig context to collect, the current by default"
+    ),
+    pool_size: int = typer.Option(
+        DEFAULT_POOL_SIZE,
+        "--pool-size",
+        min=1,
+        help="Connections to the API server kept open for concurrent requests",
+    ),
+    gzip: bool = typer.Option(
+        True, "--gzip/--no-gzip", help="Request gzip compressed API responses"
+    ),
+    parse_workers: int = typer.Option(
+        DEFAULT_PARSE_WORKERS,
+        "--parse-workers",
+        min=1,
+        help=(
+            "Threads validating listed objects, with a separate writer thread; "
+            "1 validates and writes them inline"
+        ),
+    ),
+    use_protobuf: bool = typer.Option(
+        False,
+        "--protobuf",
+        help="List built-in resources as protobuf instead of JSON",
+    ),
+    prune: list[str] = typer.Option(
+        None,
+        "--prune",
+        help=(
+            "Members to cut out of a resource's objects before validation, as "
+            "RESOURCE=FIELD,FIELD (e.g. pods=status,spec.tolerations), replacing "
+            "its default projection; RESOURCE= keeps everything. May be repeated"
+        ),
+    ),
+    raw: bool = typer.Option(
+        False,
+        "--raw",
+        help="Store listed objects as received, validated later by bootstrap",
+    ),
 ):
-    ctx.obj = Options(client=DumpClient(base_dir=output_dir, mode=output_format.value))
+    if raw and use_protobuf:
+        raise typer.BadParameter(
+            "--raw stores JSON and can not be combined with --protobuf"
+        )
+    if raw and active_only:
+        # Raw objects are not validated, so ReplicaSets can not be told apart
+        raise typer.BadParameter(
+            "--raw stores objects as received and can not be combined with "
+            "--active-only"
+        )
+    config.load_kube_config(context=context)
+    configure_client(qps, burst, pool_size, gzip)
+    dump_client = DumpClient(
+        base_dir=output_dir,
+        mode=output_format.value,
+        max_segment_bytes=segment_size * 1024 * 1024,
+        compression=compression.value if compression else None,
+    )
+    ctx.obj = Options(
+        client=dump_client,
+        page_size=page_size,
+        refresh_discovery=refresh_discovery,
+        selection=Selection(
+            namespaces=namespaces or [],
+            exclude_namespaces=exclude_namespaces or [],
+            label_selector=label_selector,
+            field_selector=check_field_selector(field_selector),
+        ),
+        active_only=active_only,
+        context=context,
+        pipeline=Pipeline(parse_workers) if parse_workers > 1 else None,
+        protobuf=use_protobuf,
+        prune=projections(prune or []),
+        raw=raw,
+    )
+    ctx.call_on_close(dump_client.close)
+    if ctx.obj.pipeline:
+        # Closed before the dump client, so queued writes still land
+        ctx.call_on_close(ctx.obj.pipeline.close)
+
+
+def check_field_selector(field_selector: str | None) -> str | None:
+    """Rejects a --field-selector that no collected resource type supports"""
+    supported = {*SELECTOR_FIELDS}
+    for get_collection in COLLECTIONS.values():
+        supported.update(get_collection().field_selectors)
+    unsupported = selector_fields(field_selector) - supported
+    if unsupported:
+        raise typer.BadParameter(
+            f"--field-selector: no resource type can be selected by "
+            f"{', '.join(sorted(unsupported))}"
+        )
+    return field_selector
+
+
+def projections(values: list[str]) -> dict[str, tuple[str, ...]]:
+    """Parses the --prune options into the members to prune per resource"""
+    resources = {get_collection().resource for get_collection in COLLECTIONS.values()}
+    pruned = {}
+    for value in values:
+        resource, separator, members = value.partition("=")
+        if not separator or resource not in resources:
+            raise typer.BadParameter(
+                f"--prune {value} must be RESOURCE=FIELD,..., with RESOURCE one "
+                f"of {', '.join(sorted(resources))}"
+            )
+        paths = tuple(member for member in members.split(",") if member)
+        # The list stream prunes members of the object and of its members
+        if any(path.count(".") > 1 for path in paths):
+            raise typer.BadParameter(
+                f"--prune {value}: fields can be at most two levels deep"
+            )
+        pruned[resource] = paths
+    return pruned
+
+
+def collector_progress() -> Progress:
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("{task.description}"),
+        TimeElapsedColumn(),
+        transient=False,
+        console=Console(),
+    )
 
 
 def progress_handler(task_name: str):
     def decorator(func):
         @wraps(func)
         def wrapper(ctx: typer.Context, *args, **kwargs):
-            console = Console()
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("{task.description}"),
-                TimeElapsedColumn(),
-                transient=False,
-                console=console,
+            # Concurrent runs share one live display owned by the caller
+            shared_progress = ctx.obj.progress
+            with (
+                nullcontext(shared_progress)
+                if shared_progress
+                else collector_progress()
             ) as task_progress:
                 task_id = task_progress.add_task(
                     f"Collecting {task_name}...", total=None
                 )
-                result = func(ctx, *args, **kwargs)
+                token = current_task.set(
+                    CollectorTask(task_progress, task_id, name=task_name)
+                )
+                try:
+                    result = func(ctx, *args, **kwargs)
+                finally:
+                    current_task.reset(token)
                 task_progress.update(
                     task_id,
                     description=f"Collecting {task_name}: complete ({result})",
@@ -116,104 +526,609 @@ def progress_handler(task_name: str):
     return decorator
 
 
-@dump_app.command()
-@progress_handler("namespaces")
-def namespaces(ctx: typer.Context):
-    dump_client: DumpClient = ctx.obj.client
-    resource_count = 0
+@dataclass
+class InactiveObjects:
+    """The objects of a collection that --active-only leaves out"""
+
+    reason: str
+    # Selects the active objects on the API server; the objects matching one
+    # of the inactive selectors are only counted, with metadata only lists
+    active_selector: str | None = None
+    inactive_selectors: tuple[str, ...] = ()
+    counted_resource: APIResource | None = None
+    # Objects that can only be told apart once they have been listed
+    is_inactive: Callable[[Any], bool] | None = None
+
+
+@dataclass
+class ProtobufResource:
+    """A built-in resource that --protobuf lists in the protobuf encoding,
+    decoding only the fields in ``message``"""
+
+    resource: APIResource
+    message: protobuf.Message
+
+    @classmethod
+    def of(
+        cls,
+        group_version: str,
+        name: str,
+        kind: str,
+        message: protobuf.Message,
+        namespaced: bool = True,
+    ) -> "ProtobufResource":
+        group, _, version = group_version.rpartition("/")
+        return cls(
+            APIResource(
+                group,
+                version,
+                Resource(
+                    name=name,
+                    kind=kind,
+                    singular_name=kind.lower(),
+                    namespaced=namespaced,
+                ),
+            ),
+            message,
+        )
+
+
+@dataclass
+class Collection:
+    """A list call and where its objects are written, shared by the list
+    based commands and ``watch``"""
+
+    list_func: Callable[..., Any]
+    model: type[BaseModel]
+    resource: str
+    namespaced: bool = True
+    on_object: Callable[[DumpClient, Any], None] | None = None
+    # Members cut out of every object before it is validated into ``model``,
+    # see projection()
+    prune: tuple[str, ...] = PRUNED_FIELDS
+    # Lists a single namespace, used when namespaces are selected
+    namespaced_list_func: Callable[..., Any] | None = None
+    # Field that namespace selections apply to, if not metadata.namespace
+    namespace_field: str | None = None
+    inactive: InactiveObjects | None = None
+    protobuf_resource: ProtobufResource | None = None
+    # Fields besides SELECTOR_FIELDS the API server selects these objects by
+    field_selectors: tuple[str, ...] = ()
+
+    def selection(self, options: Options) -> Selection:
+        selection = options.selection.supporting(self.field_selectors)
+        if options.active_only and self.inactive and self.inactive.active_selector:
+            return replace(
+                selection,
+                field_selector=join_selectors(
+                    selection.field_selector, self.inactive.active_selector
+                ),
+            )
+        return selection
+
+    def drops(self, options: Options, resource_object: Any) -> bool:
+        """Whether --active-only leaves out an object that was listed"""
+        return bool(
+            options.active_only
+            and self.inactive
+            and self.inactive.is_inactive
+            and self.inactive.is_inactive(resource_object)
+        )
+
+    def list_calls(
+        self, selection: Selection, use_protobuf: bool = False
+    ) -> list[Callable[..., Any]]:
+        namespace_field = self.namespace_field or (
+            "metadata.namespace" if self.namespaced else None
+        )
+        if use_protobuf and self.protobuf_resource:
+            list_func = partial(
+                self.protobuf_resource.resource.list_func(kube_client()),
+                header_params={"Accept": protobuf.ACCEPT},
+            )
+            return selection.list_calls(list_func, namespace_field, list_func)
+        return selection.list_calls(
+            self.list_func, namespace_field, self.namespaced_list_func
+        )
 
-    v1 = client.CoreV1Api()
-    namespaces = v1.list_namespace()
-    for ns in namespaces.items:
-        ns_object = Namespace(**ns.to_dict())
+    def projection(self, options: Options) -> tuple[str, ...]:
+        """The members to prune, as set with --prune or the default ``prune``.
+        --raw stores the objects whole unless pruned with --prune"""
+        return options.prune.get(self.resource, () if options.raw else self.prune)
+
+    def message(self, options: Options) -> protobuf.Message | None:
+        """The protobuf message of the objects when --protobuf applies"""
+        if options.protobuf and self.protobuf_resource:
+            return self.protobuf_resource.message
+        return None
+
+    def namespace(self, resource_object: Any) -> str | None:
+        return resource_object.metadata.namespace if self.namespaced else None
+
+    def write(self, dump_client: DumpClient, resource_object: Any) -> None:
         dump_client.write(
-            ns_object,
-            name=ns_object.metadata.name,
-            resource="namespaces",
-            namespace=None,
+            resource_object,
+            name=resource_object.metadata.name,
+            resource=self.resource,
+            namespace=self.namespace(resource_object),
+        )
+        if self.on_object:
+            self.on_object(dump_client, resource_object)
+
+    def delete(self, dump_client: DumpClient, resource_object: Any) -> None:
+        dump_client.delete(
+            name=resource_object.metadata.name,
+            resource=self.resource,
+            namespace=self.namespace(resource_object),
         )
-        resource_count += 1
-    return resource_count
 
 
-@dump_app.command()
-@progress_handler("daemonsets")
-def daemonsets(ctx: typer.Context):
-    dump_client: DumpClient = ctx.obj.client
+# Default projections: each keeps what the model of the collection reads, which
+# is all that sync and the DuckDB tables get to see
+METADATA_ONLY_FIELDS = (*PRUNED_FIELDS, "spec")
+POD_PRUNED_FIELDS = (
+    *PRUNED_FIELDS,
+    "spec.initContainers",
+    "spec.ephemeralContainers",
+    "spec.affinity",
+    "spec.tolerations",
+    "spec.topologySpreadConstraints",
+    "spec.securityContext",
+    "spec.dnsConfig",
+    "spec.hostAliases",
+    "spec.imagePullSecrets",
+    "spec.nodeSelector",
+    "spec.readinessGates",
+)
+WORKLOAD_PRUNED_FIELDS = (
+    *PRUNED_FIELDS,
+    "spec.selector",
+    "spec.strategy",
+    "spec.updateStrategy",
+    "spec.volumeClaimTemplates",
+    "spec.persistentVolumeClaimRetentionPolicy",
+)
+
+# Pod fields the API server selects by, besides SELECTOR_FIELDS
+POD_SELECTOR_FIELDS = (
+    "spec.nodeName",
+    "spec.restartPolicy",
+    "spec.schedulerName",
+    "spec.serviceAccountName",
+    "spec.hostNetwork",
+    "status.phase",
+    "status.podIP",
+    "status.podIPs",
+    "status.nominatedNodeName",
+)
+
+COLLECTIONS: dict[str, Callable[[], Collection]] = {
+    "namespaces": lambda: Collection(
+        client.CoreV1Api(kube_client()).list_namespace,
+        Namespace,
+        "namespaces",
+        namespaced=False,
+        namespace_field="metadata.name",
+        prune=METADATA_ONLY_FIELDS,
+        field_selectors=("status.phase",),
+    ),
+    "nodes": lambda: Collection(
+        client.CoreV1Api(kube_client()).list_node,
+        Node,
+        "nodes",
+        namespaced=False,
+        prune=METADATA_ONLY_FIELDS,
+        field_selectors=("spec.unschedulable",),
+    ),
+    "pods": lambda: Collection(
+        client.CoreV1Api(kube_client()).list_pod_for_all_namespaces,
+        Pod,
+        "pods",
+        prune=POD_PRUNED_FIELDS,
+        on_object=pod_volumes,
+        namespaced_list_func=client.CoreV1Api(kube_client()).list_namespaced_pod,
+        inactive=InactiveObjects(
+            reason="terminated (Succeeded or Failed)",
+            active_selector="status.phase!=Succeeded,status.phase!=Failed",
+            inactive_selectors=("status.phase=Succeeded", "status.phase=Failed"),
+            counted_resource=APIResource(
+                "",
+                "v1",
+                Resource(name="pods", kind="Pod", singular_name="pod", namespaced=True),
+            ),
+        ),
+        protobuf_resource=ProtobufResource.of("v1", "pods", "Pod", protobuf.POD),
+        field_selectors=POD_SELECTOR_FIELDS,
+    ),
+    "daemonsets": lambda: Collection(
+        client.AppsV1Api(kube_client()).list_daemon_set_for_all_namespaces,
+        DaemonSet,
+        "daemonsets",
+        prune=WORKLOAD_PRUNED_FIELDS,
+        namespaced_list_func=client.AppsV1Api(kube_client()).list_namespaced_daemon_set,
+        protobuf_resource=ProtobufResource.of(
+            "apps/v1", "daemonsets", "DaemonSet", protobuf.DAEMON_SET
+        ),
+    ),
+    "statefulsets": lambda: Collection(
+        client.AppsV1Api(kube_client()).list_stateful_set_for_all_namespaces,
+        StatefulSet,
+        "statefulsets",
+        prune=WORKLOAD_PRUNED_FIELDS,
+        namespaced_list_func=client.AppsV1Api(
+            kube_client()
+        ).list_namespaced_stateful_set,
+        protobuf_resource=ProtobufResource.of(
+            "apps/v1", "statefulsets", "StatefulSet", protobuf.STATEFUL_SET
+        ),
+    ),
+    "replicasets": lambda: Collection(
+        client.AppsV1Api(kube_client()).list_replica_set_for_all_namespaces,
+        ReplicaSet,
+        "replicasets",
+        prune=(*PRUNED_FIELDS, "spec.selector", "spec.template"),
+        namespaced_list_func=client.AppsV1Api(
+            kube_client()
+        ).list_namespaced_replica_set,
+        inactive=InactiveObjects(
+            reason="scaled down to zero replicas",
+            is_inactive=lambda replica_set: replica_set.replicas == 0,
+        ),
+        protobuf_resource=ProtobufResource.of(
+            "apps/v1", "replicasets", "ReplicaSet", protobuf.REPLICA_SET
+        ),
+        field_selectors=("status.replicas",),
+    ),
+    "deployments": lambda: Collection(
+        client.AppsV1Api(kube_client()).list_deployment_for_all_namespaces,
+        Deployment,
+        "deployments",
+        prune=WORKLOAD_PRUNED_FIELDS,
+        namespaced_list_func=client.AppsV1Api(kube_client()).list_namespaced_deployment,
+        protobuf_resource=ProtobufResource.of(
+            "apps/v1", "deployments", "Deployment", protobuf.DEPLOYMENT
+        ),
+    ),
+    "roles": lambda: Collection(
+        client.RbacAuthorizationV1Api(kube_client()).list_role_for_all_namespaces,
+        Role,
+        "roles",
+        namespaced_list_func=client.RbacAuthorizationV1Api(
+            kube_client()
+        ).list_namespaced_role,
+        protobuf_resource=ProtobufResource.of(
+            "rbac.authorization.k8s.io/v1", "roles", "Role", protobuf.ROLE
+        ),
+    ),
+    "role_bindings": lambda: Collection(
+        client.RbacAuthorizationV1Api(
+            kube_client()
+        ).list_role_binding_for_all_namespaces,
+        RoleBinding,
+        "role_bindings",
+        on_object=binding_subjects,
+        namespaced_list_func=(
+            client.RbacAuthorizationV1Api(kube_client()).list_namespaced_role_binding
+        ),
+        protobuf_resource=ProtobufResource.of(
+            "rbac.authorization.k8s.io/v1",
+            "rolebindings",
+            "RoleBinding",
+            protobuf.ROLE_BINDING,
+        ),
+    ),
+    "cluster_roles": lambda: Collection(
+        client.RbacAuthorizationV1Api(kube_client()).list_cluster_role,
+        ClusterRole,
+        "cluster_roles",
+        prune=(*PRUNED_FIELDS, "aggregationRule"),
+        namespaced=False,
+        protobuf_resource=ProtobufResource.of(
+            "rbac.authorization.k8s.io/v1",
+            "clusterroles",
+            "ClusterRole",
+            protobuf.CLUSTER_ROLE,
+            namespaced=False,
+        ),
+    ),
+    "cluster_role_bindings": lambda: Collection(
+        client.RbacAuthorizationV1Api(kube_client()).list_cluster_role_binding,
+        ClusterRoleBinding,
+        "cluster_role_bindings",
+        namespaced=False,
+        on_object=cluster_binding_subjects,
+        protobuf_resource=ProtobufResource.of(
+            "rbac.authorization.k8s.io/v1",
+            "clusterrolebindings",
+            "ClusterRoleBinding",
+            protobuf.CLUSTER_ROLE_BINDING,
+            namespaced=False,
+        ),
+    ),
+    "service_accounts": lambda: Collection(
+        client.CoreV1Api(kube_client()).list_service_account_for_all_namespaces,
+        ServiceAccount,
+        "serviceaccounts",
+        prune=(*PRUNED_FIELDS, "imagePullSecrets"),
+        namespaced_list_func=client.CoreV1Api(
+            kube_client()
+        ).list_namespaced_service_account,
+    ),
+    "endpoint_slices": lambda: Collection(
+        client.DiscoveryV1Api(kube_client()).list_endpoint_slice_for_all_namespaces,
+        EndpointSlice,
+        "endpoint_slices",
+        prune=(*PRUNED_FIELDS, "ports"),
+        namespaced_list_func=client.DiscoveryV1Api(
+            kube_client()
+        ).list_namespaced_endpoint_slice,
+    ),
+    "services": lambda: Collection(
+        client.CoreV1Api(kube_client()).list_service_for_all_namespaces,
+        Service,
+        "services",
+        prune=(
+            *PRUNED_FIELDS,
+            "spec.ports",
+            "spec.clusterIPs",
+            "spec.ipFamilies",
+            "spec.externalIPs",
+        ),
+        namespaced_list_func=client.CoreV1Api(kube_client()).list_namespaced_service,
+    ),
+}
+
+
+def count_inactive(
+    options: Options, collection: Collection, skipped: SkippedObjects
+) -> None:
+    """Adds the objects that the API server left out of the list to
+    ``skipped``, counted from metadata only lists"""
+    inactive = collection.inactive
+    if not inactive or not inactive.counted_resource:
+        return
+    list_func = inactive.counted_resource.list_func(kube_client())
+    user_selection = options.selection.supporting(collection.field_selectors)
+    for inactive_selector in inactive.inactive_selectors:
+        selection = replace(
+            user_selection,
+            field_selector=join_selectors(
+                user_selection.field_selector, inactive_selector
+            ),
+        )
+        for list_call in selection.list_calls(
+            list_func, "metadata.namespace", list_func
+        ):
+            for page in paginate(
+                partial(list_call, header_params={"Accept": METADATA_ONLY}),
+                Generic,
+                options.page_size,
+            ):
+                for generic_model in page.items:
+                    skipped.add(generic_model.metadata.namespace)
+
+
+def resumed_pages(
+    list_func: Callable[..., Any],
+    collection: Collection,
+    options: Options,
+    state: dict | None,
+    **kwargs,
+) -> Iterator[Page]:
+    """The pages of a list, starting from the continue token recorded in
+    ``state`` if any. Lists start over once the token has expired"""
+    list_pages = partial(
+        paginate,
+        list_func,
+        collection.model,
+        options.page_size,
+        collection.projection(options),
+        message=collection.message(options),
+        **kwargs,
+    )
+    if state:
+        pages = list_pages(
+            continue_token=state["continue"], pinned_version=state["resourceVersion"]
+        )
+        try:
+            first_page = next(pages)
+        except ApiException as e:
+            if e.status != HTTPStatus.GONE:
+                raise
+        else:
+            yield first_page
+            yield from pages
+            return
+    yield from list_pages()
+
+
+def raw_lines(raw_items: list[bytes]) -> list[bytes]:
+    # Newlines can only be whitespace between tokens, JSON strings escape them
+    return [item.replace(b"\n", b" ") + b"\n" for item in raw_items]
+
+
+def list_collection(
+    options: Options,
+    collection: Collection,
+    seen: set[tuple[str | None, str]] | None = None,
+    skipped: SkippedObjects | None = None,
+    checkpoint_key: str | None = None,
+    written: set[tuple[str | None, str]] | None = None,
+    **kwargs,
+) -> tuple[int, str | None]:
+    """Lists and writes every selected object of ``collection``, returning
+    the number of objects and the resourceVersion of the (last) list snapshot.
+    Objects left out by --active-only are written to ``skipped/``, unless the
+    caller passes its own ``skipped`` to collect them in. With a
+    ``checkpoint_key`` the continue token of every written page is recorded
+    in the checkpoint of `dump all`, and lists resume from there. Objects in
+    ``written`` are counted but not written again. With --raw the objects
+    are appended to ``raw/`` without validating them"""
+    task = current_task.get()
     resource_count = 0
+    write_skipped = skipped is None
+    if not (options.active_only and collection.inactive):
+        skipped = None
+    elif skipped is None:
+        skipped = SkippedObjects(
+            resource=collection.resource, reason=collection.inactive.reason
+        )
 
-    v1 = client.AppsV1Api()
-    replicasets = v1.list_daemon_set_for_all_namespaces()
-    for replica in replicasets.items:
-        replica_set = DaemonSet(**replica.to_dict())
-        dump_client.write(
-            replica_set,
-            name=replica_set.metadata.name,
-            resource="daemonsets",
-            namespace=replica_set.metadata.namespace,
+    def parse(validate: Callable[[bytes], Any], raw_items: list[bytes]) -> list[Any]:
+        return [validate(item) for item in raw_items]
+
+    checkpoint = options.checkpoint if checkpoint_key else None
+    # What the interrupted run wrote after its last checkpoint is listed again
+    if written is None:
+        written = (
+            options.client.written_objects(
+                collection.resource,
+                (
+                    collection.selection(options).namespaces
+                    if collection.namespaced
+                    else None
+                ),
+            )
+            if checkpoint and checkpoint.restored
+            else set()
         )
-        resource_count += 1
+
+    def write(resource_objects: list[Any]) -> None:
+        nonlocal resource_count
+        for resource_object in resource_objects:
+            if skipped and collection.drops(options, resource_object):
+                skipped.add(collection.namespace(resource_object))
+                continue
+            key = (collection.namespace(resource_object), resource_object.metadata.name)
+            if key not in written:
+                collection.write(options.client, resource_object)
+            if seen is not None:
+                seen.add(key)
+            resource_count += 1
+
+    pipeline = options.pipeline
+    run = Run()
+
+    def raw_key(line: bytes) -> tuple[str | None, str]:
+        metadata = json.loads(line)["metadata"]
+        return (
+            metadata.get("namespace") if collection.namespaced else None,
+            metadata["name"],
+        )
+
+    def write_raw(lines: list[bytes]) -> None:
+        nonlocal resource_count
+        resource_count += len(lines)
+        if written:
+            lines = [line for line in lines if raw_key(line) not in written]
+        options.client.write_raw(lines, collection.resource)
+
+    def submit(raw_items: list[bytes], validate: Callable[[bytes], Any]) -> float:
+        if options.raw:
+            parse_batch, write_batch = raw_lines, write_raw
+        else:
+            parse_batch, write_batch = partial(parse, validate), write
+        if pipeline is None:
+            write_batch(parse_batch(raw_items))
+            return 0.0
+        return pipeline.submit(run, raw_items, parse_batch, write_batch)
+
+    page = None
+    try:
+        for index, list_func in enumerate(
+            collection.list_calls(collection.selection(options), options.protobuf)
+        ):
+            list_key = f"lists/{checkpoint_key}/{index}"
+            state = checkpoint.get(list_key) if checkpoint else None
+            if state and state.get("complete"):
+                continue
+            for page in resumed_pages(list_func, collection, options, state, **kwargs):
+                if checkpoint and page.continue_token:
+                    # Every earlier page has to be written before this one
+                    # is where a resumed list starts
+                    run.when_written(
+                        partial(
+                            checkpoint.update,
+                            list_key,
+                            {
+                                "continue": page.continue_token,
+                                "resourceVersion": page.resource_version,
+                            },
+                        )
+                    )
+                started = time.monotonic()
+                blocked = 0.0
+                batch = []
+                for raw_item in page.raw_items:
+                    batch.append(raw_item)
+                    if len(batch) == DEFAULT_BATCH_SIZE:
+                        blocked += submit(batch, page.validate)
+                        batch = []
+                if batch:
+                    blocked += submit(batch, page.validate)
+                if pipeline:
+                    pipeline.record_fetch(
+                        page.count, time.monotonic() - started - blocked
+                    )
+                if run.error:
+                    raise run.error
+                if task:
+                    task.advance(page)
+            if checkpoint:
+                run.when_written(
+                    partial(checkpoint.update, list_key, {"complete": True})
+                )
+    finally:
+        # Batches of a failed list must not be written after it was retried
+        run.wait()
+    if run.error:
+        raise run.error
+
+    if skipped:
+        count_inactive(options, collection, skipped)
+        if write_skipped:
+            options.client.write(
+                skipped, name=collection.resource, resource="skipped", namespace=None
+            )
+    # The snapshot version is only known once the first page has been read
+    return resource_count, page.resource_version if page else None
+
+
+def collect(ctx: typer.Context, collection: Collection, **kwargs) -> int:
+    resource_count, _ = list_collection(
+        ctx.obj, collection, checkpoint_key=collection.resource, **kwargs
+    )
     return resource_count
 
 
+@dump_app.command()
+@progress_handler("namespaces")
+def namespaces(ctx: typer.Context):
+    return collect(ctx, COLLECTIONS["namespaces"]())
+
+
+@dump_app.command()
+@progress_handler("daemonsets")
+def daemonsets(ctx: typer.Context):
+    return collect(ctx, COLLECTIONS["daemonsets"]())
+
+
 @dump_app.command()
 @progress_handler("statefulset")
 def statefulsets(ctx: typer.Context):
-    dump_client: DumpClient = ctx.obj.client
-    resource_count = 0
-
-    v1 = client.AppsV1Api()
-    replicasets = v1.list_stateful_set_for_all_namespaces()
-    for replica in replicasets.items:
-        replica_set = StatefulSet(**replica.to_dict())
-        dump_client.write(
-            replica_set,
-            name=replica_set.metadata.name,
-            resource="statefulsets",
-            namespace=replica_set.metadata.namespace,
-        )
-        resource_count += 1
-    return resource_count
+    return collect(ctx, COLLECTIONS["statefulsets"]())
 
 
 @dump_app.command()
 @progress_handler("replicasets")
 def replicasets(ctx: typer.Context):
-    dump_client: DumpClient = ctx.obj.client
-    resource_count = 0
-
-    v1 = client.AppsV1Api()
-    replicasets = v1.list_replica_set_for_all_namespaces()
-    for replica in replicasets.items:
-        replica_set = ReplicaSet(**replica.to_dict())
-        dump_client.write(
-            replica_set,
-            name=replica_set.metadata.name,
-            resource="replicasets",
-            namespace=replica_set.metadata.namespace,
-        )
-        resource_count += 1
-    return resource_count
+    return collect(ctx, COLLECTIONS["replicasets"]())
 
 
 @dump_app.command()
 @progress_handler("deployments")
 def deployments(ctx: typer.Context):
-    dump_client: DumpClient = ctx.obj.client
-    resource_count = 0
-
-    v1 = client.AppsV1Api()
-    deployments = v1.list_deployment_for_all_namespaces()
-    for deployment in deployments.items:
-        dp_object = Deployment(**deployment.to_dict())
-        dump_client.write(
-            dp_object,
-            name=dp_object.metadata.name,
-            resource="deployments",
-            namespace=dp_object.metadata.namespace,
-        )
-        resource_count += 1
-    return resource_count
+    return collect(ctx, COLLECTIONS["deployments"]())
 
 
 def host_volumes(client: DumpClient, node_name: str, volumes: list[PodVolume]) -> int:
@@ -231,235 +1146,116 @@ def host_volumes(client: DumpClient, node_name: str, volumes: list[PodVolume]) -
     return resource_count
 
 
+def pod_volumes(client: DumpClient, pod_object: Pod) -> None:
+    if pod_object.spec.volumes:
+        host_volumes(client, pod_object.spec.node_name, pod_object.spec.volumes)
+
+
 @dump_app.command()
 @progress_handler("pods")
 def pods(ctx: typer.Context):
-    dump_client: DumpClient = ctx.obj.client
-    resource_count = 0
-
-    v1 = client.CoreV1Api()
-    pods = v1.list_pod_for_all_namespaces()
-    for pod in pods.items:
-        pod_object = Pod(**pod.to_dict())
-        dump_client.write(
-            pod_object,
-            name=pod_object.metadata.name,
-            resource="pods",
-            namespace=pod_object.metadata.namespace,
-        )
-        if pod_object.spec.volumes:
-            host_volumes(
-                dump_client, pod_object.spec.node_name, pod_object.spec.volumes
-            )
-        resource_count += 1
-
-    return resource_count
+    return collect(ctx, COLLECTIONS["pods"]())
 
 
 @dump_app.command()
 @progress_handler("nodes")
 def nodes(ctx: typer.Context):
-    dump_client: DumpClient = ctx.obj.client
-    resource_count = 0
+    return collect(ctx, COLLECTIONS["nodes"]())
 
-    v1 = client.CoreV1Api()
-    nodes = v1.list_node()
-    for node in nodes.items:
-        node_object = Node(**node.to_dict())
-        dump_client.write(
-            node_object,
-            name=node_object.metadata.name,
-            resource="nodes",
-            namespace=None,
-        )
-        resource_count += 1
-    return resource_count
+
+def cluster_name(context: str | None = None) -> str:
+    contexts, current_context = config.list_kube_config_contexts()
+    for kube_context in contexts:
+        if kube_context["name"] == context:
+            return kube_context["context"]["cluster"]
+    return current_context["context"]["cluster"]
 
 
 @dump_app.command()
 @progress_handler("cluster")
 def cluster(ctx: typer.Context):
     dump_client: DumpClient = ctx.obj.client
-    conf = config.list_kube_config_contexts()[1]
-    cluster_object = Cluster(name=conf["context"]["cluster"])
+    cluster_object = Cluster(name=cluster_name(ctx.obj.context))
     dump_client.write(
         cluster_object, name="cluster", resource="cluster", namespace=None
     )
     return 1
 
 
+def binding_subjects(client: DumpClient, binding: RoleBinding) -> None:
+    for subject in binding.subjects:
+        if subject.kind in ["User", "Group"]:
+            subject_object = IDENTITY_MAPPING[subject.kind](**subject.model_dump())
+            client.write(
+                subject_object,
+                name=subject_object.name.lower(),
+                resource=subject.kind.lower(),
+                namespace=binding.metadata.namespace,
+            )
+
+
+def cluster_binding_subjects(client: DumpClient, binding: ClusterRoleBinding) -> None:
+    for subject in binding.subjects:
+        if subject.kind in ["User", "Group"]:
+            subject_object = IDENTITY_MAPPING[subject.kind](**subject.model_dump())
+            client.write(
+                subject_object,
+                name=subject_object.name,
+                resource=subject.kind.lower(),
+                namespace=None,
+            )
+
+
 @dump_app.command()
 @progress_handler("role-bindings")
 def role_bindings(ctx: typer.Context):
-    dump_client: DumpClient = ctx.obj.client
-    resource_count = 0
-
-    v1 = client.RbacAuthorizationV1Api()
-    rolebs = v1.list_role_binding_for_all_namespaces()
-    for roleb in rolebs.items:
-        roleb_object = RoleBinding(**roleb.to_dict())
-        dump_client.write(
-            roleb_object,
-            name=roleb_object.metadata.name,
-            resource="role_bindings",
-            namespace=roleb_object.metadata.namespace,
-        )
-        resource_count += 1
-        for subject in roleb_object.subjects:
-            if subject.kind in ["User", "Group"]:
-                subject_object = IDENTITY_MAPPING[subject.kind](**subject.model_dump())
-                dump_client.write(
-                    subject_object,
-                    name=subject_object.name.lower(),
-                    resource=subject.kind.lower(),
-                    namespace=roleb_object.metadata.namespace,
-                )
-    return resource_count
+    return collect(ctx, COLLECTIONS["role_bindings"]())
 
 
 @dump_app.command()
 @progress_handler("roles")
 def roles(ctx: typer.Context):
-    dump_client: DumpClient = ctx.obj.client
-    resource_count = 0
-
-    v1 = client.RbacAuthorizationV1Api()
-    roles = v1.list_role_for_all_namespaces()
-    for role in roles.items:
-        role_object = Role(**role.to_dict())
-        dump_client.write(
-            role_object,
-            name=role_object.metadata.name,
-            resource="roles",
-            namespace=role_object.metadata.namespace,
-        )
-        resource_count += 1
-    return resource_count
+    return collect(ctx, COLLECTIONS["roles"]())
 
 
 @dump_app.command()
 @progress_handler("cluster-roles")
 def cluster_roles(ctx: typer.Context):
-    dump_client: DumpClient = ctx.obj.client
-    resource_count = 0
-
-    v1 = client.RbacAuthorizationV1Api()
-    roles = v1.list_cluster_role()
-    for role in roles.items:
-        role_object = ClusterRole(**role.to_dict())
-        dump_client.write(
-            role_object,
-            name=role_object.metadata.name,
-            resource="cluster_roles",
-            namespace=None,
-        )
-        resource_count += 1
-    return resource_count
+    return collect(ctx, COLLECTIONS["cluster_roles"]())
 
 
 @dump_app.command()
 @progress_handler("cluster role-bindings")
 def cluster_role_bindings(ctx: typer.Context):
-    dump_client: DumpClient = ctx.obj.client
-    resource_count = 0
-
-    v1 = client.RbacAuthorizationV1Api()
-    rolebs = v1.list_cluster_role_binding()
-    for roleb in rolebs.items:
-        roleb_object = ClusterRoleBinding(**roleb.to_dict())
-        dump_client.write(
-            roleb_object,
-            name=roleb_object.metadata.name,
-            resource="cluster_role_bindings",
-            namespace=None,
-        )
-        resource_count += 1
-
-        for subject in roleb_object.subjects:
-            if subject.kind in ["User", "Group"]:
-                subject_object = IDENTITY_MAPPING[subject.kind](**subject.model_dump())
-                dump_client.write(
-                    subject_object,
-                    name=subject_object.name,
-                    resource=subject.kind.lower(),
-                    namespace=None,
-                )
-    return resource_count
+    return collect(ctx, COLLECTIONS["cluster_role_bindings"]())
 
 
 @dump_app.command()
 @progress_handler("service accounts")
 def service_accounts(ctx: typer.Context):
-    dump_client: DumpClient = ctx.obj.client
-    resource_count = 0
-
-    v1 = client.CoreV1Api()
-    service_accounts = v1.list_service_account_for_all_namespaces()
-    for service_account in service_accounts.items:
-        sa_object = ServiceAccount(**service_account.to_dict())
-        dump_client.write(
-            sa_object,
-            name=sa_object.metadata.name,
-            resource="serviceaccounts",
-            namespace=sa_object.metadata.namespace,
-        )
-        resource_count += 1
-    return resource_count
+    return collect(ctx, COLLECTIONS["service_accounts"]())
 
 
 @dump_app.command()
 @progress_handler("endpoint slices")
 def endpoint_slices(ctx: typer.Context):
-    dump_client: DumpClient = ctx.obj.client
-    resource_count = 0
-
-    v1 = client.DiscoveryV1Api()
-    endpoint_slices = v1.list_endpoint_slice_for_all_namespaces()
-    for es in endpoint_slices.items:
-        es_object = EndpointSlice(**es.to_dict())
-        dump_client.write(
-            es_object,
-            name=es_object.metadata.name,
-            resource="endpoint_slices",
-            namespace=es_object.metadata.namespace,
-        )
-        resource_count += 1
-    return resource_count
+    return collect(ctx, COLLECTIONS["endpoint_slices"]())
 
 
 @dump_app.command()
 @progress_handler("services")
 def services(ctx: typer.Context):
-    dump_client: DumpClient = ctx.obj.client
-    resource_count = 0
-
-    v1 = client.CoreV1Api()
-    services = v1.list_service_for_all_namespaces()
-    for service in services.items:
-        service_object = Service(**service.to_dict())
-        dump_client.write(
-            service_object,
-            name=service_object.metadata.name,
-            resource="services",
-            namespace=service_object.metadata.namespace,
-        )
-        resource_count += 1
-    return resource_count
+    return collect(ctx, COLLECTIONS["services"]())
 
 
 @dump_app.command()
 @progress_handler("custom resource definitions")
 def custom_resource_definitions(ctx: typer.Context):
     dump_client: DumpClient = ctx.obj.client
+    catalog = discovery_catalog(ctx.obj)
     resource_count = 0
 
-    api = client.ApisApi()
-    custom = client.CustomObjectsApi()
-
-    groups = api.get_api_versions()
-
-    for group in groups.groups:
-        group_object = ResourceGroup(**group.to_dict())
+    for group_object in catalog.groups:
         dump_client.write(
             group_object,
             name=f"{group_object.name}",
@@ -467,18 +1263,13 @@ def custom_resource_definitions(ctx: typer.Context):
             namespace=None,
         )
 
-        resources = custom.get_api_resources(
-            group=group_object.name, version=group_object.preferred_version.version
-        )
-        for resource in resources.resources:
-            resource_object = Resource(
-                **resource.to_dict(),
-                api_group_name=group.name,
-                api_group_uid=group_object.uid,
-            )
+        for api_resource in catalog.resources.get(group_object.name, []):
+            resource_object = api_resource.definition
+            resource_object.api_group_name = group_object.name
+            resource_object.api_group_uid = group_object.uid
             dump_client.write(
                 resource_object,
-                name=f"{group.name}/{resource_object.name}",
+                name=f"{group_object.name}/{resource_object.name}",
                 resource="custom_resource_definitions",
                 namespace=None,
             )
@@ -491,10 +1282,9 @@ def custom_resource_definitions(ctx: typer.Context):
 @progress_handler("resource definitions")
 def resource_definitions(ctx: typer.Context):
     dump_client: DumpClient = ctx.obj.client
+    catalog = discovery_catalog(ctx.obj)
     resource_count = 0
 
-    v1 = client.CoreV1Api()
-    core_resources = v1.get_api_resources()
     core_group = ResourceGroup(
         name="__core__",
         preferred_version=GroupVersion(group_version="v1", version="v1"),
@@ -503,12 +1293,10 @@ def resource_definitions(ctx: typer.Context):
     dump_client.write(
         core_group, name=core_group.name, resource="api_groups", namespace=None
     )
-    for core_resource in core_resources.resources:
-        core_resource_object = Resource(
-            **core_resource.to_dict(),
-            api_group_name=core_group.name,
-            api_group_uid=core_group.uid,
-        )
+    for api_resource in catalog.resources.get("", []):
+        core_resource_object = api_resource.definition
+        core_resource_object.api_group_name = core_group.name
+        core_resource_object.api_group_uid = core_group.uid
         dump_client.write(
             core_resource_object,
             name=core_resource_object.name,
@@ -519,43 +1307,184 @@ def resource_definitions(ctx: typer.Context):
     return resource_count
 
 
+@dataclass
+class KindResult:
+    kind: str
+    api_version: str
+    count: int = 0
+    duration: float = 0.0
+    error: str | None = None
+
+
+def list_unmapped(
+    dump_client: DumpClient,
+    api_client: client.ApiClient,
+    api_resource: APIResource,
+    selection: Selection,
+    page_size: int,
+    timeout: float,
+) -> KindResult:
+    kind = api_resource.definition.kind
+    result = KindResult(kind, api_resource.group_version)
+    started = time.monotonic()
+    # The request timeout bounds a single hanging call, the deadline a slow
+    # kind that keeps returning pages
+    deadline = started + timeout
+    list_func = api_resource.list_func(api_client)
+    list_calls = selection.list_calls(
+        list_func,
+        "metadata.namespace" if api_resource.definition.namespaced else None,
+        list_func,
+    )
+    try:
+        for list_call in list_calls:
+            for page in paginate(
+                partial(
+                    list_call,
+                    header_params={"Accept": METADATA_ONLY},
+                    _request_timeout=(timeout, timeout),
+                ),
+                Generic,
+                page_size,
+            ):
+                for generic_model in page.items:
+                    # Metadata only items are all of kind PartialObjectMetadata
+                    generic_model.kind = kind
+                    dump_client.write(
+                        generic_model,
+                        name=generic_model.metadata.name,
+                        resource=f"unmapped/{generic_model.kind}",
+                        namespace=generic_model.metadata.namespace,
+                    )
+                    result.count += 1
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"gave up after {timeout}s")
+    except ApiException as e:
+        result.error = f"{e.status} {e.reason}"
+    except MaxRetryError as e:
+        result.error = type(e.reason).__name__
+    except Exception as e:
+        result.error = str(e) or type(e).__name__
+    result.duration = time.monotonic() - started
+    return result
+
+
+def kind_report(results: list[KindResult]) -> Table:
+    table = Table(title="Unmapped resources")
+    table.add_column("Kind")
+    table.add_column("API version")
+    table.add_column("Objects", justify="right")
+    table.add_column("Duration", justify="right")
+    table.add_column("Status")
+    for result in sorted(results, key=lambda result: result.duration, reverse=True):
+        table.add_row(
+            result.kind,
+            result.api_version,
+            str(result.count),
+            f"{result.duration:.2f}s",
+            f"[red]failed: {result.error}[/red]" if result.error else "ok",
+        )
+    return table
+
+
 @dump_app.command()
 @progress_handler("unmapped resources")
-def generic(ctx: typer.Context):
-    dump_client: DumpClient = ctx.obj.client
-    resource_count = 0
+def generic(
+    ctx: typer.Context,
+    concurrency: Annotated[
+        int,
+        typer.Option(
+            "--concurrency", min=1, help="Number of resource kinds listed at once"
+        ),
+    ] = DEFAULT_GENERIC_CONCURRENCY,
+    timeout: Annotated[
+        float,
+        typer.Option(
+            "--timeout", min=1, help="Seconds after which listing a kind is abandoned"
+        ),
+    ] = DEFAULT_GENERIC_TIMEOUT,
+):
+    options: Options = ctx.obj
+    task = current_task.get()
 
-    api_client = client.ApiClient()
-    dyn_client = DynamicClient(api_client)
+    api_client = kube_client()
+    catalog = discovery_catalog(options)
 
-    discovered_resources = dyn_client.resources.search()
     # Only check for resources that have no custom model,
     # support the list command and or not of kind *List
-    for resource in discovered_resources:
+    api_resources = [
+        api_resource
+        for api_resource in catalog.all_resources()
         if (
-            not resource.kind in RESOURCE_TYPES
-            and not resource.kind.endswith("List")
-            and "list" in resource.verbs
-        ):
-            resource_client = dyn_client.resources.get(
-                api_version=resource.api_version, kind=resource.kind
+            not api_resource.is_subresource
+            and not api_resource.definition.kind in RESOURCE_TYPES
+            and not api_resource.definition.kind.endswith("List")
+            and "list" in api_resource.definition.verbs
+        )
+    ]
+
+    results: list[KindResult] = []
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(
+                list_unmapped,
+                options.client,
+                api_client,
+                api_resource,
+                options.selection.supporting(()),
+                options.page_size,
+                timeout,
             )
-            items = resource_client.get()
-            for item in items.items:
-                generic_model = Generic(**item.to_dict())
-                resource_count += 1
-                dump_client.write(
-                    generic_model,
-                    name=generic_model.metadata.name,
-                    resource=f"unmapped/{generic_model.kind}",
-                    namespace=generic_model.metadata.namespace,
+            for api_resource in api_resources
+        ]
+        for future in as_completed(futures):
+            results.append(future.result())
+            if task:
+                task.progress.update(
+                    task.task_id,
+                    description=(
+                        f"Collecting {task.name}: {len(results)}/{len(futures)} kinds "
+                        f"({sum(result.count for result in results)} objects)"
+                    ),
                 )
 
-    return resource_count
+    console = task.progress.console if task else Console()
+    console.print(kind_report(results))
+    return sum(result.count for result in results)
+
+
+def expand_raw(options: Options) -> None:
+    """Validates the objects that `dump --raw` stored and writes them like
+    the collectors do, then removes the raw segments"""
+    dump_client = options.client
+    collections = {
+        collection.resource: collection
+        for collection in (get_collection() for get_collection in COLLECTIONS.values())
+    }
+    raw_resources = dump_client.raw_resources()
+    for resource in raw_resources:
+        collection = collections.get(resource)
+        if collection is None:
+            raise Exception(f"No collection stores raw {resource} objects")
+        raw_dir = dump_client.base_dir / RAW_DIR / resource
+        resource_count = 0
+        for raw_file in sorted(dump_files(f"{raw_dir}/*")):
+            for raw_object in load_objects(raw_file):
+                collection.write(
+                    dump_client, collection.model.model_validate(raw_object)
+                )
+                resource_count += 1
+        # The objects are on disk before their raw copies are removed
+        dump_client.flush()
+        shutil.rmtree(raw_dir)
+        typer.echo(f"Validated {resource_count} raw {resource}")
+    if raw_resources:
+        (dump_client.base_dir / RAW_DIR).rmdir()
 
 
 @dump_app.command()
 def bootstrap(
+    ctx: typer.Context,
     # This may be used later for some extra enrichment sauce
     queries_path: Annotated[
         Path,
@@ -566,28 +1495,540 @@ def bootstrap(
             readable=True,
             resolve_path=True,
         ),
-    ] = Path("kubepyhound/duckdb/tables"),
-    *args,
-    **kwargs,
+    ] = TABLES_PATH,
 ):
-    bootstrap_files = glob.glob(f"{queries_path}/*.sql")
-    con = duckdb.connect(database="k8s.duckdb", read_only=False)
-    for query in bootstrap_files:
-        with open(query, "r") as query_file:
-            sql_content = query_file.read()
-            con.execute(sql_content)
-    con.close()
+    dump_client = ctx.obj.client
+    expand_raw(ctx.obj)
+    # Flushes open segments and, for parquet dumps, exports the tables
+    dump_client.close()
+    if dump_client.mode == OutputFormat.duckdb and dump_client.filled_tables:
+        # The tables were filled while the raw objects were written
+        return
+    con = duckdb.connect(database=DATABASE, read_only=False)
+    try:
+        load_tables(con, dump_client.base_dir, queries_path)
+    finally:
+        con.close()
+
+
+def watch_collection(
+    options: Options,
+    name: str,
+    collection: Collection,
+    checkpoint: Checkpoint,
+    stop: threading.Event,
+    timeout_seconds: int = DEFAULT_WATCH_TIMEOUT,
+) -> None:
+    dump_client = options.client
+    # watch only accepts selections that are served by a single list call
+    (list_func,) = collection.list_calls(collection.selection(options))
+    resource_version = checkpoint.get(name)
+    while not stop.is_set():
+        try:
+            if resource_version is None:
+                # Objects deleted while nobody was watching are only noticed here
+                seen: set[tuple[str | None, str]] = set()
+                resource_count, resource_version = list_collection(
+                    options, collection, seen=seen
+                )
+                stale = [
+                    stored
+                    for stored in dump_client.stored(
+                        collection.resource, collection.namespaced
+                    )
+                    if stored not in seen
+                ]
+                for namespace, object_name in stale:
+                    dump_client.delete(object_name, collection.resource, namespace)
+                checkpoint.update(name, resource_version)
+                typer.echo(
+                    f"Listed {resource_count} {name} at resourceVersion "
+                    f"{resource_version}, removed {len(stale)} stale objects"
+                )
+
+            for event in watch_changes(
+                list_func,
+                collection.model,
+                resource_version,
+                timeout_seconds=timeout_seconds,
+            ):
+                if event.type == "DELETED" or (
+                    event.object is not None and collection.drops(options, event.object)
+                ):
+                    collection.delete(dump_client, event.object)
+                elif event.object is not None:
+                    collection.write(dump_client, event.object)
+                resource_version = event.resource_version or resource_version
+                checkpoint.update(name, resource_version)
+                if stop.is_set():
+                    return
+        except ResourceVersionExpired:
+            typer.echo(f"resourceVersion of {name} expired, relisting")
+            resource_version = None
+        except Exception as e:
+            typer.echo(
+                f"Watching {name} failed ({e}), retrying in {WATCH_RETRY_DELAY}s",
+                err=True,
+            )
+            stop.wait(WATCH_RETRY_DELAY)
 
 
 @dump_app.command()
-def all(ctx: typer.Context):
+def watch(
+    ctx: typer.Context,
+    resources: list[str] = typer.Option(
+        None,
+        "--resource",
+        help=f"Resource to watch, may be repeated ({', '.join(COLLECTIONS)})",
+    ),
+    timeout_seconds: int = typer.Option(
+        DEFAULT_WATCH_TIMEOUT,
+        "--timeout",
+        min=1,
+        help="Seconds after which each watch request is renewed",
+    ),
+):
+    options: Options = ctx.obj
+    if options.client.mode != OutputFormat.simple or options.raw:
+        raise typer.BadParameter(
+            "watch keeps one file per object up to date and needs --format simple"
+        )
+    names = resources or list(COLLECTIONS)
+    unknown = [name for name in names if name not in COLLECTIONS]
+    if unknown:
+        raise typer.BadParameter(f"Can not watch {', '.join(unknown)}")
+    if len(options.selection.namespaces) > 1:
+        raise typer.BadParameter("watch follows at most one --namespace")
+
+    # Modified events often leave the stored fields as they were
+    options.client.deduplicated = None
+    checkpoint = Checkpoint(options.client.base_dir / WATCH_CHECKPOINT)
+    stop = threading.Event()
+    # Each watch blocks on its own stream until the server ends it
+    watchers = [
+        threading.Thread(
+            target=watch_collection,
+            args=(options, name, COLLECTIONS[name](), checkpoint, stop),
+            kwargs={"timeout_seconds": timeout_seconds},
+            name=f"watch-{name}",
+            daemon=True,
+        )
+        for name in names
+    ]
+    for watcher in watchers:
+        watcher.start()
+    try:
+        while not stop.wait(1):
+            if not any(watcher.is_alive() for watcher in watchers):
+                break
+    except KeyboardInterrupt:
+        stop.set()
+    finally:
+        checkpoint.save()
+
+
+# Collected namespace by namespace with `dump all --shard-namespaces`
+SHARDED_COLLECTIONS = (
+    "pods",
+    "roles",
+    "role_bindings",
+    "service_accounts",
+    "statefulsets",
+    "replicasets",
+    "daemonsets",
+    "deployments",
+    "services",
+)
+
+
+def namespace_shards(options: Options) -> list[str]:
+    """The selected namespaces that exist, or every namespace that is not
+    excluded"""
+    collection = COLLECTIONS["namespaces"]()
+    # The label and field selectors are meant for the objects in the shards
+    selection = replace(options.selection, label_selector=None, field_selector=None)
+    names = []
+    for list_func in collection.list_calls(selection):
+        for page in paginate(
+            list_func,
+            collection.model,
+            options.page_size,
+            collection.projection(options),
+        ):
+            names.extend(namespace.metadata.name for namespace in page.items)
+    return sorted(names)
+
+
+def collect_shard(
+    options: Options, name: str, namespace: str
+) -> tuple[int, SkippedObjects | None]:
+    """Lists a single namespace of a collection, retrying when the API server
+    is unavailable or throttles the request. What a failed attempt wrote is
+    cut out of the segments of the shard before it is listed again; raw
+    segments are shared by every namespace, so the objects a failed attempt
+    wrote to them are skipped instead"""
+    collection = COLLECTIONS[name]()
+    shard_options = replace(
+        options,
+        selection=replace(
+            options.selection, namespaces=[namespace], exclude_namespaces=[]
+        ),
+    )
+    dump_client = options.client
+    checkpoint = options.checkpoint
+    checkpoint_key = f"{collection.resource}/{namespace}"
+    shard_dir = f"namespaces/{namespace}/{collection.resource}"
+    written = None
+    attempt = 0
+    while True:
+        skipped = None
+        if options.active_only and collection.inactive:
+            skipped = SkippedObjects(
+                resource=collection.resource, reason=collection.inactive.reason
+            )
+        segment_ends = None if options.raw else dump_client.segment_ends(shard_dir)
+        list_state = (
+            checkpoint.entries(f"lists/{checkpoint_key}/") if checkpoint else {}
+        )
+        try:
+            resource_count, _ = list_collection(
+                shard_options,
+                collection,
+                skipped=skipped,
+                checkpoint_key=checkpoint_key,
+                written=written,
+            )
+            return resource_count, skipped
+        except (ApiException, MaxRetryError) as e:
+            if attempt == SHARD_RETRIES or (
+                isinstance(e, ApiException) and e.status not in SHARD_RETRY_STATUSES
+            ):
+                raise
+            if segment_ends is None:
+                dump_client.flush()
+                written = dump_client.written_objects(collection.resource, [namespace])
+            else:
+                # The list starts over where this attempt did
+                if checkpoint:
+                    checkpoint.replace(f"lists/{checkpoint_key}/", list_state)
+                dump_client.roll_back(segment_ends, shard_dir)
+                if checkpoint:
+                    checkpoint.save()
+            time.sleep(SHARD_RETRY_DELAY * 2**attempt)
+            attempt += 1
+
+
+@progress_handler("namespaced resources")
+def sharded_collections(ctx: typer.Context, workers: int = 1) -> int:
+    """Collects every namespaced collection namespace by namespace, running
+    up to ``workers`` (namespace, collection) shards at once"""
+    options: Options = ctx.obj
+    task = current_task.get()
+    namespaces = namespace_shards(options)
+    checkpoint = options.checkpoint
+    shards = [
+        (namespace, name)
+        for namespace in namespaces
+        for name in SHARDED_COLLECTIONS
+        if not (checkpoint and checkpoint.get(f"shards/{namespace}/{name}"))
+    ]
+    remaining = dict.fromkeys(namespaces, 0)
+    for namespace, _ in shards:
+        remaining[namespace] += 1
+    namespace_counts = dict.fromkeys(namespaces, 0)
+    namespace_tasks: dict[str, TaskID] = {}
+    tasks_lock = threading.Lock()
+    skipped: dict[str, SkippedObjects] = {}
+    resource_count = 0
+    completed = sum(1 for count in remaining.values() if not count)
+
+    def run_shard(name: str, namespace: str):
+        with tasks_lock:
+            if namespace not in namespace_tasks:
+                namespace_tasks[namespace] = task.progress.add_task(
+                    f"  {namespace}...", total=None
+                )
+        return collect_shard(options, name, namespace)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(run_shard, name, namespace): (namespace, name)
+            for namespace, name in shards
+        }
+        try:
+            for future in as_completed(futures):
+                namespace, name = futures[future]
+                shard_count, shard_skipped = future.result()
+                if checkpoint:
+                    checkpoint.update(f"shards/{namespace}/{name}", True)
+                resource_count += shard_count
+                namespace_counts[namespace] += shard_count
+                if shard_skipped:
+                    skipped.setdefault(
+                        shard_skipped.resource,
+                        SkippedObjects(
+                            resource=shard_skipped.resource,
+                            reason=shard_skipped.reason,
+                        ),
+                    ).merge(shard_skipped)
+
+                remaining[namespace] -= 1
+                done = len(SHARDED_COLLECTIONS) - remaining[namespace]
+                with tasks_lock:
+                    namespace_task = namespace_tasks[namespace]
+                if remaining[namespace]:
+                    task.progress.update(
+                        namespace_task,
+                        description=f"  {namespace}: {done}/{len(SHARDED_COLLECTIONS)} types ({namespace_counts[namespace]} objects)",
+                    )
+                else:
+                    task.progress.remove_task(namespace_task)
+                    completed += 1
+                task.progress.update(
+                    task.task_id,
+                    description=f"Collecting namespaced resources: {completed}/{len(namespaces)} namespaces ({resource_count} objects)",
+                )
+        except BaseException:
+            executor.shutdown(cancel_futures=True)
+            raise
+
+    for resource, resource_skipped in skipped.items():
+        options.client.write(
+            resource_skipped, name=resource, resource="skipped", namespace=None
+        )
+    return resource_count
+
+
+def pipeline_report(pipeline: Pipeline) -> Table:
+    elapsed, stages = pipeline.stats()
+    table = Table(title="Pipeline")
+    table.add_column("Stage")
+    table.add_column("Workers", justify="right")
+    table.add_column("Objects", justify="right")
+    table.add_column("Busy", justify="right")
+    table.add_column("Utilization", justify="right")
+    table.add_column("Max queue", justify="right")
+    for stage in stages:
+        utilization = stage.utilization(elapsed)
+        table.add_row(
+            stage.name,
+            str(stage.workers) if stage.workers else "collectors",
+            str(stage.items),
+            f"{stage.busy:.2f}s",
+            f"{utilization:.0%}" if utilization is not None else "-",
+            str(stage.max_depth) if stage.workers else "-",
+        )
+    return table
+
+
+@dataclass
+class ClusterResult:
+    context: str
+    cluster: str
+    output_dir: Path
+    count: int = 0
+    duration: float = 0.0
+    error: str | None = None
+
+
+def cluster_report(results: list[ClusterResult]) -> Table:
+    table = Table(title="Clusters")
+    table.add_column("Context")
+    table.add_column("Cluster")
+    table.add_column("Objects", justify="right")
+    table.add_column("Duration", justify="right")
+    table.add_column("Status")
+    for result in results:
+        table.add_row(
+            result.context,
+            result.cluster,
+            str(result.count),
+            f"{result.duration:.2f}s",
+            f"[red]failed: {result.error}[/red]" if result.error else "ok",
+        )
+    return table
+
+
+def selected_contexts(contexts: str | None, all_contexts: bool) -> list[dict]:
+    available = {
+        kube_context["name"]: kube_context
+        for kube_context in config.list_kube_config_contexts()[0]
+    }
+    if all_contexts:
+        return list(available.values())
+    names = [name.strip() for name in (contexts or "").split(",") if name.strip()]
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise Exception(f"Unknown kubeconfig contexts: {', '.join(unknown)}")
+    return [available[name] for name in dict.fromkeys(names)]
+
+
+def collect_context(
+    context: str,
+    output_dir: Path,
+    dump_params: dict[str, Any],
+    all_params: dict[str, Any],
+) -> tuple[int, float, str | None]:
+    """Runs `dump all` for a single kubeconfig context in a worker process,
+    returning the number of objects, the duration and the error if any"""
+    started = time.monotonic()
+    output_dir.mkdir(exist_ok=True)
+    # Relative paths such as k8s.duckdb end up in the cluster's own subtree
+    os.chdir(output_dir)
+    with (
+        open(output_dir / CLUSTER_LOG, "w") as log,
+        redirect_stdout(log),
+        redirect_stderr(log),
+    ):
+        try:
+            command = typer.main.get_command(dump_app)
+            with typer.Context(command):
+                # The typer callback converts the raw parameters of the parent
+                command.callback(
+                    **{**dump_params, "output_dir": output_dir, "context": context}
+                )
+                resource_count = command.commands["all"].callback(**all_params)
+            return resource_count, time.monotonic() - started, None
+        except Exception as e:
+            traceback.print_exc()
+            return 0, time.monotonic() - started, str(e) or type(e).__name__
+
+
+def collect_contexts(
+    ctx: typer.Context,
+    kube_contexts: list[dict],
+    parallel_clusters: int,
+    all_params: dict[str, Any],
+) -> list[ClusterResult]:
+    """Collects every context into ``<output_dir>/<cluster>``, with at most
+    ``parallel_clusters`` worker processes at once"""
+    options: Options = ctx.obj
+    results = [
+        ClusterResult(
+            context=kube_context["name"],
+            cluster=kube_context["context"]["cluster"],
+            output_dir=options.client.base_dir
+            / re.sub(r"[^\w.-]", "_", kube_context["context"]["cluster"]),
+        )
+        for kube_context in kube_contexts
+    ]
+    output_dirs: dict[Path, str] = {}
+    for result in results:
+        if result.output_dir in output_dirs:
+            raise Exception(
+                f"Contexts {output_dirs[result.output_dir]} and {result.context} "
+                f"both collect {result.output_dir}, select only one of them"
+            )
+        output_dirs[result.output_dir] = result.context
+
+    # Every cluster gets a fresh process, with its own kubeconfig and clients
+    with (
+        collector_progress() as progress,
+        ProcessPoolExecutor(
+            max_workers=parallel_clusters,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=1,
+        ) as executor,
+    ):
+        futures = {}
+        for result in results:
+            task_id = progress.add_task(f"Collecting {result.context}...", total=None)
+            future = executor.submit(
+                collect_context,
+                result.context,
+                result.output_dir,
+                ctx.parent.params,
+                all_params,
+            )
+            futures[future] = (result, task_id)
+        for future in as_completed(futures):
+            result, task_id = futures[future]
+            result.count, result.duration, result.error = future.result()
+            progress.update(
+                task_id,
+                description=(
+                    f"Collecting {result.context}: failed"
+                    if result.error
+                    else f"Collecting {result.context}: complete ({result.count})"
+                ),
+            )
+    return results
+
+
+def record_segments(dump_client: DumpClient, state: dict[str, Any]) -> None:
+    """Writes out the dump before its checkpoint is saved, so the checkpoint
+    never refers to objects that are still buffered, and records where its
+    segments end; a resumed dump cuts them back to there"""
+    state[SEGMENTS_KEY] = {**state.get(SEGMENTS_KEY, {}), **dump_client.flush()}
+
+
+def checkpointed_collector(
+    name: str, func: Callable[[typer.Context], int], ctx: typer.Context
+) -> int:
+    """Runs a collector of `dump all` unless the dump that is resumed already
+    completed it"""
+    options: Options = ctx.obj
+    key = f"collectors/{name}"
+    if options.checkpoint.get(key):
+        console = options.progress.console if options.progress else Console()
+        console.print(f"Skipping {name}, collected before the dump was interrupted")
+        return 0
+    resource_count = func(ctx)
+    options.checkpoint.update(key, True)
+    options.checkpoint.save()
+    return resource_count
+
+
+@dump_app.command()
+def all(
+    ctx: typer.Context,
+    workers: int = typer.Option(
+        1, "--workers", min=1, help="Number of collectors to run concurrently"
+    ),
+    shard_namespaces: bool = typer.Option(
+        False,
+        "--shard-namespaces",
+        help="List namespaced resources namespace by namespace across the workers",
+    ),
+    contexts: str | None = typer.Option(
+        None,
+        "--contexts",
+        help="Comma separated kubeconfig contexts to collect, each into its own subtree",
+    ),
+    all_contexts: bool = typer.Option(
+        False, "--all-contexts", help="Collect every kubeconfig context"
+    ),
+    parallel_clusters: int = typer.Option(
+        DEFAULT_PARALLEL_CLUSTERS,
+        "--parallel-clusters",
+        min=1,
+        help="Number of clusters collected at once with --contexts/--all-contexts",
+    ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help="Continue an interrupted dump in the same directory instead of starting over",
+    ),
+):
+    if contexts or all_contexts:
+        results = collect_contexts(
+            ctx,
+            selected_contexts(contexts, all_contexts),
+            parallel_clusters,
+            {**ctx.params, "contexts": None, "all_contexts": False},
+        )
+        Console().print(cluster_report(results))
+        if any(result.error for result in results):
+            raise typer.Exit(code=1)
+        return sum(result.count for result in results)
+
     dump_functions = [
         ("cluster", cluster),
         ("namespaces", namespaces),
         ("nodes", nodes),
         ("pods", pods),
         ("roles", roles),
-        ("rolebindings", role_bindings),
+        ("role_bindings", role_bindings),
         ("cluster_roles", cluster_roles),
         ("cluster_role_bindings", cluster_role_bindings),
         ("service_accounts", service_accounts),
@@ -599,8 +2040,71 @@ def all(ctx: typer.Context):
         ("resource_definitions", resource_definitions),
         ("custom_resource_definitions", custom_resource_definitions),
         ("generic", generic),
-        ("db", bootstrap),
+    ]
+    if shard_namespaces:
+        dump_functions = [
+            (name, func)
+            for name, func in dump_functions
+            if name not in SHARDED_COLLECTIONS
+        ]
+        dump_functions.append(
+            ("namespaced", partial(sharded_collections, workers=workers))
+        )
+
+    dump_client: DumpClient = ctx.obj.client
+    checkpoint_path = dump_client.base_dir / DUMP_CHECKPOINT
+    if not resume:
+        checkpoint_path.unlink(missing_ok=True)
+    ctx.obj.checkpoint = Checkpoint(
+        checkpoint_path, before_save=partial(record_segments, dump_client)
+    )
+    segment_ends = ctx.obj.checkpoint.get(SEGMENTS_KEY)
+    if segment_ends is None:
+        # Segments that were there before the dump started are left as they are
+        ctx.obj.checkpoint.update(SEGMENTS_KEY, dump_client.segment_ends())
+    else:
+        dump_client.roll_back(segment_ends)
+    dump_functions = [
+        (name, partial(checkpointed_collector, name, func))
+        for name, func in dump_functions
     ]
 
-    for _, func in dump_functions:
-        ctx.invoke(func, ctx)
+    resource_count = 0
+    try:
+        if workers == 1:
+            for _, func in dump_functions:
+                resource_count += ctx.invoke(func, ctx)
+        else:
+            with collector_progress() as progress:
+                ctx.obj.progress = progress
+                try:
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        futures = [
+                            executor.submit(func, ctx) for _, func in dump_functions
+                        ]
+                        for future in as_completed(futures):
+                            resource_count += future.result()
+                finally:
+                    ctx.obj.progress = None
+    finally:
+        # Updates are saved periodically, the latest must survive a failure
+        ctx.obj.checkpoint.save()
+
+    # The database is only built once every collector has finished writing,
+    # raw dumps are validated and loaded by a later `dump bootstrap`
+    if not ctx.obj.raw:
+        ctx.invoke(bootstrap, ctx)
+    # Nothing is left to resume
+    ctx.obj.checkpoint = None
+    checkpoint_path.unlink(missing_ok=True)
+    if ctx.obj.pipeline:
+        Console().print(pipeline_report(ctx.obj.pipeline))
+    suppressed = ctx.obj.client.suppressed
+    if suppressed:
+        Console().print(
+            f"Skipped {suppressed.total()} duplicate writes: "
+            + ", ".join(
+                f"{resource} ({count})" for resource, count in suppressed.most_common()
+            )
+        )
+    return resource_count
@@ -0,0 +1,8 @@
+from pydantic import BaseModel, ConfigDict
+from pydantic.alias_generators import to_camel
+
+
+class KubeModel(BaseModel):
+    # Fields keep the snake_case names used in the dumps, while the camelCase
+    # keys of raw API JSON are accepted as aliases
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, field_validator, Field
+from pydantic import field_validator, Field
 from datetime import datetime
+from kubepyhound.models.k8s.base import KubeModel
 from kubepyhound.models.entries import Node, NodeProperties, Edge, EdgePath
 from kubepyhound.models import lookups
 from typing import Optional
@@ -48,14 +49,14 @@ VERB_TO_PERMISSION = {
 }
 
 
-class Metadata(BaseModel):
+class Metadata(KubeModel):
     name: str
     uid: str
     creation_timestamp: datetime
     labels: dict | None = None
 
 
-class Rule(BaseModel):
+class Rule(KubeModel):
     api_groups: Optional[list[str]] = ["__core__"]
     resources: Optional[list[str]] = []
     verbs: list[Verbs]
@@ -68,7 +69,7 @@ class Rule(BaseModel):
         return v
 
 
-class ClusterRole(BaseModel):
+class ClusterRole(KubeModel):
     metadata: Metadata
     rules: list[Rule] = []
     kind: str | None = "ClusterRole"
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, field_validator
+from pydantic import field_validator
 from datetime import datetime
+from kubepyhound.models.k8s.base import KubeModel
 from kubepyhound.models.entries import (
     Node,
     NodeProperties,
@@ -12,27 +13,27 @@ from kubepyhound.models import lookups
 from kubepyhound.utils.guid import get_guid, NodeTypes
 
 
-class Subject(BaseModel):
+class Subject(KubeModel):
     api_group: str | None = None
     kind: str
     name: str
     namespace: str | None = None
 
 
-class RoleRef(BaseModel):
+class RoleRef(KubeModel):
     api_group: str
     kind: str
     name: str
 
 
-class Metadata(BaseModel):
+class Metadata(KubeModel):
     name: str
     uid: str
     creation_timestamp: datetime
     labels: dict | None = None
 
 
-class ClusterRoleBinding(BaseModel):
+class ClusterRoleBinding(KubeModel):
     kind: str | None = "ClusterRoleBinding"
     metadata: Metadata
     role_ref: RoleRef
@@ -1,12 +1,13 @@
-from pydantic import BaseModel, field_validator, ConfigDict
+from pydantic import field_validator, ConfigDict
 from datetime import datetime
+from kubepyhound.models.k8s.base import KubeModel
 from kubepyhound.models.entries import Node, NodeProperties, Edge, EdgePath
 from kubepyhound.utils.guid import get_guid
 from kubepyhound.utils.guid import NodeTypes
 from kubepyhound.models.k8s.pod import Container
 
 
-class Metadata(BaseModel):
+class Metadata(KubeModel):
     name: str
     uid: str
     namespace: str
@@ -18,30 +19,30 @@ class Metadata(BaseModel):
         return v if v is not None else {}
 
 
-class HostPath(BaseModel):
+class HostPath(KubeModel):
     path: str
 
 
-class Volume(BaseModel):
+class Volume(KubeModel):
     name: str
     host_path: HostPath | None = None
 
 
-class TemplateSpec(BaseModel):
+class TemplateSpec(KubeModel):
     containers: list[Container] | None = None
     volumes: list[Volume] | None = None
 
 
-class Template(BaseModel):
+class Template(KubeModel):
     # metadata: Metadata
     spec: TemplateSpec
 
 
-class Spec(BaseModel):
+class Spec(KubeModel):
     template: Template
 
 
-class Deployment(BaseModel):
+class Deployment(KubeModel):
     kind: str | None = "Deployment"
     metadata: Metadata
     spec: Spec
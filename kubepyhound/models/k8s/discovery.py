@@ -0,0 +1,42 @@
+from kubepyhound.models.k8s.base import KubeModel
+
+
+class GroupVersionKind(KubeModel):
+    group: str = ""
+    version: str = ""
+    kind: str = ""
+
+
+class SubresourceDiscovery(KubeModel):
+    subresource: str
+    response_kind: GroupVersionKind | None = None
+    verbs: list[str] = []
+
+
+class ResourceDiscovery(KubeModel):
+    resource: str
+    response_kind: GroupVersionKind | None = None
+    scope: str = "Cluster"
+    singular_resource: str = ""
+    verbs: list[str] = []
+    categories: list[str] = []
+    subresources: list[SubresourceDiscovery] = []
+
+
+class VersionDiscovery(KubeModel):
+    version: str
+    resources: list[ResourceDiscovery] = []
+
+
+class GroupMetadata(KubeModel):
+    name: str = ""
+
+
+class GroupDiscovery(KubeModel):
+    metadata: GroupMetadata = GroupMetadata()
+    # Ordered by preference, the first version is the preferred one
+    versions: list[VersionDiscovery] = []
+
+
+class GroupDiscoveryList(KubeModel):
+    items: list[GroupDiscovery] = []
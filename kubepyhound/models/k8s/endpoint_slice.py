@@ -1,8 +1,9 @@
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
+from kubepyhound.models.k8s.base import KubeModel
 
 
-class TargetRef(BaseModel):
+class TargetRef(KubeModel):
     api_version: str | None = None
     field_path: str | None = None
     name: str
@@ -10,7 +11,7 @@ class TargetRef(BaseModel):
     uid: str
 
 
-class Endpoint(BaseModel):
+class Endpoint(KubeModel):
     target_ref: TargetRef | None = None
 
 
@@ -19,7 +20,7 @@ class Labels(BaseModel):
     service_name: str = Field(alias="kubernetes.io/service-name")
 
 
-class Metadata(BaseModel):
+class Metadata(KubeModel):
     name: str
     uid: str
     creation_timestamp: datetime
@@ -27,7 +28,7 @@ class Metadata(BaseModel):
     namespace: str
 
 
-class EndpointSlice(BaseModel):
+class EndpointSlice(KubeModel):
     address_type: str
     metadata: Metadata
     endpoints: list[Endpoint]
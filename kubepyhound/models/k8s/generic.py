@@ -1,12 +1,13 @@
-from pydantic import BaseModel, ConfigDict, Field, BeforeValidator, computed_field
+from pydantic import ConfigDict, Field, BeforeValidator, computed_field
 from datetime import datetime
+from kubepyhound.models.k8s.base import KubeModel
 from kubepyhound.models.entries import Node, NodeProperties, Edge, EdgePath
 from kubepyhound.utils.guid import get_guid
 from kubepyhound.utils.guid import NodeTypes
 from typing import Optional
 
 
-class Metadata(BaseModel):
+class Metadata(KubeModel):
     name: str
     uid: str | None = None
     namespace: str | None = None
@@ -14,9 +15,9 @@ class Metadata(BaseModel):
     labels: dict | None = None
 
 
-class Generic(BaseModel):
+class Generic(KubeModel):
     metadata: Metadata
-    kind: str
+    kind: str | None = None
 
 
 class ExtendedProperties(NodeProperties):
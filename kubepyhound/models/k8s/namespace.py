@@ -1,17 +1,18 @@
-from pydantic import BaseModel, field_validator
+from pydantic import field_validator
 from datetime import datetime
+from kubepyhound.models.k8s.base import KubeModel
 from kubepyhound.models.entries import Node, NodeProperties, Edge, EdgePath
 from kubepyhound.models import lookups
 
 
-class Metadata(BaseModel):
+class Metadata(KubeModel):
     name: str
     uid: str
     creation_timestamp: datetime
     labels: dict
 
 
-class Namespace(BaseModel):
+class Namespace(KubeModel):
     metadata: Metadata
     kind: str | None = "Namespace"
 
@@ -1,19 +1,20 @@
-from pydantic import BaseModel, field_validator
+from pydantic import field_validator
 from datetime import datetime
+from kubepyhound.models.k8s.base import KubeModel
 from kubepyhound.models.entries import NodeProperties, Edge, EdgePath
 from kubepyhound.models.entries import Node as GraphNode
 from kubepyhound.models import lookups
 from kubepyhound.utils.guid import get_guid, NodeTypes
 
 
-class Metadata(BaseModel):
+class Metadata(KubeModel):
     name: str
     uid: str
     creation_timestamp: datetime
     labels: dict = {}
 
 
-class Node(BaseModel):
+class Node(KubeModel):
     metadata: Metadata
     kind: str | None = "Node"
 
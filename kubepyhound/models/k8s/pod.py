@@ -1,5 +1,4 @@
 from pydantic import (
-    BaseModel,
     ConfigDict,
     Field,
     BeforeValidator,
@@ -9,6 +8,7 @@ from pydantic import (
 )
 from datetime import datetime
 from pydantic_core import PydanticUseDefault
+from kubepyhound.models.k8s.base import KubeModel
 from kubepyhound.models.entries import Node, NodeProperties, Edge, EdgePath
 from typing import Optional, Any, TypeVar, Annotated
 from kubepyhound.utils.guid import get_guid, get_generic_guid, NodeTypes
@@ -25,26 +25,26 @@ T = TypeVar("T")
 DefaultIfNone = Annotated[T, BeforeValidator(default_if_none)]
 
 
-class SecurityContext(BaseModel):
+class SecurityContext(KubeModel):
     allow_privilege_escalation: DefaultIfNone[bool | None] = False
     privileged: DefaultIfNone[bool | None] = False
 
 
-class VolumeMount(BaseModel):
+class VolumeMount(KubeModel):
     mount_path: str
     name: str
 
 
-class HostPath(BaseModel):
+class HostPath(KubeModel):
     path: str
 
 
-class Volume(BaseModel):
+class Volume(KubeModel):
     name: str
     host_path: HostPath | None = None
 
 
-class Container(BaseModel):
+class Container(KubeModel):
     image: str
     security_context: DefaultIfNone[SecurityContext | None] = Field(
         default_factory=SecurityContext
@@ -52,7 +52,7 @@ class Container(BaseModel):
     volume_mounts: list[VolumeMount] | None = []
 
 
-class Spec(BaseModel):
+class Spec(KubeModel):
     node_name: str | None = None
     service_account_name: Optional[str] = "default"
     containers: list[Container]
@@ -61,7 +61,7 @@ class Spec(BaseModel):
     volumes: DefaultIfNone[list[Volume] | None] = Field(default=[])
 
 
-class OwnerReferences(BaseModel):
+class OwnerReferences(KubeModel):
     api_version: str
     controller: bool
     kind: str
@@ -69,7 +69,7 @@ class OwnerReferences(BaseModel):
     uid: str
 
 
-class Metadata(BaseModel):
+class Metadata(KubeModel):
     name: str
     uid: str
     namespace: str
@@ -82,7 +82,7 @@ class Metadata(BaseModel):
         return v if v is not None else {}
 
 
-class Pod(BaseModel):
+class Pod(KubeModel):
     metadata: Metadata
     spec: Spec
     kind: str | None = "Pod"
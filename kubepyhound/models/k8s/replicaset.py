@@ -1,6 +1,7 @@
-from pydantic import BaseModel, field_validator, ConfigDict, PrivateAttr
+from pydantic import field_validator, ConfigDict, PrivateAttr, Field, AliasPath
 from datetime import datetime
 
+from kubepyhound.models.k8s.base import KubeModel
 from kubepyhound.models.entries import Node, NodeProperties, Edge, EdgePath
 
 # from pydantic_core import PydanticUseDefault
@@ -9,7 +10,7 @@ from kubepyhound.utils.guid import NodeTypes
 from kubepyhound.models.k8s.pod import Container
 
 
-class OwnerReferences(BaseModel):
+class OwnerReferences(KubeModel):
     api_version: str
     controller: bool
     kind: str
@@ -17,7 +18,7 @@ class OwnerReferences(BaseModel):
     uid: str
 
 
-class Metadata(BaseModel):
+class Metadata(KubeModel):
     name: str
     uid: str
     namespace: str
@@ -30,9 +31,13 @@ class Metadata(BaseModel):
         return v if v is not None else {}
 
 
-class ReplicaSet(BaseModel):
+class ReplicaSet(KubeModel):
     kind: str | None = "ReplicaSet"
     metadata: Metadata
+    # Only used to leave out scaled down ReplicaSets, not part of the dump
+    replicas: int | None = Field(
+        default=None, exclude=True, validation_alias=AliasPath("spec", "replicas")
+    )
 
     @field_validator("kind", mode="before")
     def set_default_if_none(cls, v):
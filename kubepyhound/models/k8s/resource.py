@@ -1,11 +1,12 @@
-from pydantic import BaseModel, model_validator, computed_field
+from pydantic import Field, model_validator, computed_field
+from kubepyhound.models.k8s.base import KubeModel
 from kubepyhound.models.entries import Node, NodeProperties, Edge, EdgePath
 from kubepyhound.utils.guid import get_guid, NodeTypes
 from typing_extensions import Self
 from typing import Optional
 
 
-class Resource(BaseModel):
+class Resource(KubeModel):
     name: str
     categories: Optional[list[str]] = []
     kind: str
@@ -16,6 +17,8 @@ class Resource(BaseModel):
     # uid: Optional[str] = None
     api_group_name: Optional[str] = ""
     api_group_uid: Optional[str] = ""
+    # Only used to pick listable resources, not part of the dump
+    verbs: list[str] = Field(default=[], exclude=True)
 
     @computed_field
     @property
@@ -30,6 +33,11 @@ class Resource(BaseModel):
     #     return self
 
 
+class ResourceDefinitionList(KubeModel):
+    group_version: str | None = None
+    resources: list[Resource] = []
+
+
 class ExtendedProperties(NodeProperties):
     kind: str
     api_group_name: Optional[str] = ""
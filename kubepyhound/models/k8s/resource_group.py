@@ -1,16 +1,17 @@
-from pydantic import BaseModel, model_validator, computed_field
+from pydantic import model_validator, computed_field
+from kubepyhound.models.k8s.base import KubeModel
 from kubepyhound.models.entries import Node, NodeProperties, Edge, EdgePath
 from kubepyhound.utils.guid import get_guid, NodeTypes
 from typing_extensions import Self
 from typing import Optional
 
 
-class GroupVersion(BaseModel):
+class GroupVersion(KubeModel):
     group_version: str
     version: str
 
 
-class ResourceGroup(BaseModel):
+class ResourceGroup(KubeModel):
     name: str
     api_version: Optional[str] = None
     preferred_version: GroupVersion
@@ -22,6 +23,10 @@ class ResourceGroup(BaseModel):
         return get_guid(self.name, NodeTypes.K8sResourceGroup, "")
 
 
+class ResourceGroupList(KubeModel):
+    groups: list[ResourceGroup] = []
+
+
 class ResourceGroupNode(Node):
 
     @property
@@ -0,0 +1,16 @@
+from pydantic import Field
+from typing import Generic, TypeVar
+from kubepyhound.models.k8s.base import KubeModel
+
+T = TypeVar("T")
+
+
+class ListMetadata(KubeModel):
+    resource_version: str | None = None
+    continue_: str | None = Field(default=None, alias="continue")
+
+
+class ResourceList(KubeModel, Generic[T]):
+    kind: str | None = None
+    metadata: ListMetadata = Field(default_factory=ListMetadata)
+    items: list[T] = []
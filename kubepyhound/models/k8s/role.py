@@ -1,5 +1,6 @@
-from pydantic import BaseModel, field_validator, Field
+from pydantic import field_validator, Field
 from datetime import datetime
+from kubepyhound.models.k8s.base import KubeModel
 from kubepyhound.models.entries import Node, NodeProperties, Edge, EdgePath
 from kubepyhound.models import lookups
 from typing import Optional
@@ -38,11 +39,11 @@ VERB_TO_PERMISSION = {
 }
 
 
-class Spec(BaseModel):
+class Spec(KubeModel):
     node_name: str
 
 
-class Metadata(BaseModel):
+class Metadata(KubeModel):
     name: str
     uid: str
     namespace: str
@@ -50,7 +51,7 @@ class Metadata(BaseModel):
     labels: dict | None = None
 
 
-class Rule(BaseModel):
+class Rule(KubeModel):
     api_groups: list[str] = ["__core__"]
     resources: list[str]
     verbs: list[Verbs]
@@ -63,7 +64,7 @@ class Rule(BaseModel):
         return v
 
 
-class Role(BaseModel):
+class Role(KubeModel):
     metadata: Metadata
     rules: Optional[list[Rule]] = []
     kind: str | None = "Role"
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, field_validator
+from pydantic import field_validator
 from datetime import datetime
+from kubepyhound.models.k8s.base import KubeModel
 from kubepyhound.models.entries import (
     Node,
     NodeProperties,
@@ -13,20 +14,20 @@ from kubepyhound.utils.guid import get_guid
 from kubepyhound.utils.guid import NodeTypes
 
 
-class Subject(BaseModel):
+class Subject(KubeModel):
     api_group: str | None = None
     kind: str
     name: str
     namespace: str | None = None
 
 
-class RoleRef(BaseModel):
+class RoleRef(KubeModel):
     api_group: str
     kind: str
     name: str
 
 
-class Metadata(BaseModel):
+class Metadata(KubeModel):
     name: str
     uid: str
     namespace: str
@@ -34,12 +35,11 @@ class Metadata(BaseModel):
     labels: dict | None = None
 
 
-class RoleBinding(BaseModel):
+class RoleBinding(KubeModel):
     kind: str | None = "RoleBinding"
     subjects: list[Subject] = []
     metadata: Metadata
     role_ref: RoleRef
-    subjects: list[Subject]
 
     @field_validator("kind", mode="before")
     def set_default_if_none(cls, v):
@@ -1,13 +1,13 @@
-from pydantic import BaseModel
 from datetime import datetime
+from kubepyhound.models.k8s.base import KubeModel
 
 
-class Spec(BaseModel):
+class Spec(KubeModel):
     type: str
     selector: dict | None = None
 
 
-class Metadata(BaseModel):
+class Metadata(KubeModel):
     name: str
     uid: str
     creation_timestamp: datetime
@@ -15,7 +15,7 @@ class Metadata(BaseModel):
     namespace: str
 
 
-class Service(BaseModel):
+class Service(KubeModel):
     metadata: Metadata
     spec: Spec
     kind: str | None = "Service"
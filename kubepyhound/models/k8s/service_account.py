@@ -1,32 +1,33 @@
-from pydantic import BaseModel, field_validator
+from pydantic import field_validator
 from datetime import datetime
+from kubepyhound.models.k8s.base import KubeModel
 from kubepyhound.models.entries import Node, NodeProperties, Edge, EdgePath
 from kubepyhound.models import lookups
 from kubepyhound.utils.guid import get_guid
 from kubepyhound.utils.guid import NodeTypes
 
 
-class Secret(BaseModel):
+class Secret(KubeModel):
     field_path: str
     name: str
     namespace: str
     uid: str
 
 
-class Subject(BaseModel):
+class Subject(KubeModel):
     api_group: str | None = None
     kind: str
     name: str
     namespace: str | None = None
 
 
-class RoleRef(BaseModel):
+class RoleRef(KubeModel):
     api_group: str
     kind: str
     name: str
 
 
-class Metadata(BaseModel):
+class Metadata(KubeModel):
     name: str
     uid: str
     namespace: str
@@ -34,7 +35,7 @@ class Metadata(BaseModel):
     labels: dict | None = None
 
 
-class ServiceAccount(BaseModel):
+class ServiceAccount(KubeModel):
     kind: str | None = "ServiceAccount"
     metadata: Metadata
     automount_service_account_token: bool | None = None
@@ -0,0 +1,21 @@
+from kubepyhound.models.k8s.base import KubeModel
+
+
+class SkippedObjects(KubeModel):
+    """Objects of a resource type that were deliberately not collected, so
+    their absence can be told apart from objects that do not exist"""
+
+    resource: str
+    reason: str
+    count: int = 0
+    namespaces: dict[str, int] = {}
+
+    def add(self, namespace: str | None, count: int = 1) -> None:
+        self.count += count
+        if namespace:
+            self.namespaces[namespace] = self.namespaces.get(namespace, 0) + count
+
+    def merge(self, other: "SkippedObjects") -> None:
+        self.count += other.count
+        for namespace, count in other.namespaces.items():
+            self.namespaces[namespace] = self.namespaces.get(namespace, 0) + count
@@ -25,13 +25,18 @@ from kubepyhound.models.k8s.volume import VolumeNode
 from typing_extensions import Annotated
 from dataclasses import dataclass
 from pathlib import Path
-from kubepyhound.utils.helpers import load_json, process_stale_refs
+from kubepyhound.utils.helpers import (
+    dump_files,
+    load_cluster,
+    load_objects,
+    process_stale_refs,
+)
 from rich.progress import Progress
 from typing import Type, TypeVar
 from kubepyhound.utils.api import BloodHound
 from kubepyhound.utils.lookup import LookupManager
+from kubepyhound.utils.tables import has_parquet_tables, DATABASE
 import duckdb
-import glob
 import typer
 
 T = TypeVar("T", bound=GraphNode)
@@ -108,16 +113,17 @@ class ResourceGraph:
         graph_entries = GraphEntries()
         with Progress() as progress:
             task = progress.add_task(
-                f"Converting {len(self.files)} {self.model_class.__name__}s",
+                f"Converting {self.model_class.__name__}s from {len(self.files)} files",
                 total=len(self.files),
             )
             for resource in self.files:
-                node = self.model_class.from_input(**load_json(resource))
-                node._lookup = self.lookup
-                node._cluster = self.cluster
-                graph_entries.nodes.append(node)
-                for edge in node.edges:
-                    graph_entries.edges.append(edge)
+                for resource_object in load_objects(resource):
+                    node = self.model_class.from_input(**resource_object)
+                    node._lookup = self.lookup
+                    node._cluster = self.cluster
+                    graph_entries.nodes.append(node)
+                    for edge in node.edges:
+                        graph_entries.edges.append(edge)
                 progress.advance(task)
 
         self._graph = Graph(graph=graph_entries)
@@ -166,6 +172,16 @@ def process_resources(
         graph.to_bloodhound(options.session, options)
 
 
+def lookup_manager(input: Path) -> LookupManager:
+    lookup = LookupManager(directory=str(input))
+    # Parquet dumps carry their own tables, others use the bootstrapped database
+    if has_parquet_tables(input):
+        lookup.bootstrap()
+    else:
+        lookup.con = duckdb.connect(database=DATABASE, read_only=False)
+    return lookup
+
+
 @sync_app.callback()
 def sync_callback(
     ctx: typer.Context,
@@ -184,10 +200,9 @@ def sync_callback(
     token_id: Annotated[str, typer.Option(envvar="BHE_API_ID")],
     token_key: Annotated[str, typer.Option(envvar="BHE_API_KEY")],
 ):
-    lookup = LookupManager()
-    lookup.con = duckdb.connect(database="k8s.duckdb", read_only=False)
+    lookup = lookup_manager(input)
     session = BloodHound(token_id=token_id, token_key=token_key, bhe_uri=bhe_uri)
-    cluster_metadata = load_json(f"{input}/cluster/cluster.json")
+    cluster_metadata = load_cluster(input)
     cluster_id = cluster_metadata["name"]
     ctx.obj = SyncOptions(input, session, lookup=lookup, cluster=cluster_id)
 
@@ -224,9 +239,8 @@ def convert_callback(
         ),
     ],
 ):
-    lookup = LookupManager()
-    lookup.con = duckdb.connect(database="k8s.duckdb", read_only=False)
-    cluster_metadata = load_json(f"{input}/cluster/cluster.json")
+    lookup = lookup_manager(input)
+    cluster_metadata = load_cluster(input)
     ctx.obj = ConvertOptions(
         input, output=output, lookup=lookup, cluster=cluster_metadata["name"]
     )
@@ -235,46 +249,42 @@ def convert_callback(
 @sync_app.command()
 @convert_app.command()
 def cluster(ctx: typer.Context):
-    resource_files = glob.glob(f"{ctx.obj.input}/cluster/*.json", recursive=True)
+    resource_files = dump_files(f"{ctx.obj.input}/cluster/*")
     process_resources(resource_files, ClusterNode, ctx.obj)
 
 
 @sync_app.command()
 @convert_app.command()
 def namespaces(ctx: typer.Context):
-    resource_files = glob.glob(f"{ctx.obj.input}/namespaces/*.json", recursive=True)
+    resource_files = dump_files(f"{ctx.obj.input}/namespaces/*")
     process_resources(resource_files, NamespaceNode, ctx.obj)
 
 
 @sync_app.command()
 @convert_app.command()
 def nodes(ctx: typer.Context):
-    resource_files = glob.glob(f"{ctx.obj.input}/nodes/*.json", recursive=True)
+    resource_files = dump_files(f"{ctx.obj.input}/nodes/*")
     process_resources(resource_files, NodeOutput, ctx.obj)
 
 
 @sync_app.command()
 @convert_app.command()
 def pods(ctx: typer.Context):
-    resource_files = glob.glob(
-        f"{ctx.obj.input}/namespaces/**/pods/*.json", recursive=True
-    )
+    resource_files = dump_files(f"{ctx.obj.input}/namespaces/**/pods/*")
     process_resources(resource_files, PodNode, ctx.obj)
 
 
 @sync_app.command()
 @convert_app.command()
 def roles(ctx: typer.Context):
-    resource_files = glob.glob(
-        f"{ctx.obj.input}/namespaces/**/roles/*.json", recursive=True
-    )
+    resource_files = dump_files(f"{ctx.obj.input}/namespaces/**/roles/*")
     process_resources(resource_files, RoleNode, ctx.obj)
 
 
 @sync_app.command()
 @convert_app.command()
 def volumes(ctx: typer.Context):
-    resource_files = glob.glob(f"{ctx.obj.input}/volumes/*.json", recursive=True)
+    resource_files = dump_files(f"{ctx.obj.input}/volumes/*")
     process_resources(resource_files, VolumeNode, ctx.obj)
 
 
@@ -282,17 +292,14 @@ def volumes(ctx: typer.Context):
 @convert_app.command()
 # @process_stale_refs("rolebindings", output_dir="./output")
 def role_bindings(ctx: typer.Context):
-    resource_files = glob.glob(
-        f"{ctx.obj.input}/namespaces/**/role_bindings/*.json",
-        recursive=True,
-    )
+    resource_files = dump_files(f"{ctx.obj.input}/namespaces/**/role_bindings/*")
     process_resources(resource_files, RoleBindingNode, ctx.obj)
 
 
 @sync_app.command()
 @convert_app.command()
 def cluster_roles(ctx: typer.Context):
-    resource_files = glob.glob(f"{ctx.obj.input}/cluster_roles/*.json", recursive=True)
+    resource_files = dump_files(f"{ctx.obj.input}/cluster_roles/*")
     process_resources(resource_files, ClusterRoleNode, ctx.obj)
 
 
@@ -300,132 +307,106 @@ def cluster_roles(ctx: typer.Context):
 @convert_app.command()
 # @process_stale_refs("rolebindings", output_dir="./output")
 def cluster_role_bindings(ctx: typer.Context):
-    resource_files = glob.glob(
-        f"{ctx.obj.input}/cluster_role_bindings/*.json", recursive=True
-    )
+    resource_files = dump_files(f"{ctx.obj.input}/cluster_role_bindings/*")
     process_resources(resource_files, ClusterRoleBindingNode, ctx.obj)
 
 
 @sync_app.command()
 @convert_app.command()
 def stale(ctx: typer.Context):
-    resource_files = glob.glob(
-        f"{ctx.obj.input}/stale_objects/**/*.json", recursive=True
-    )
+    resource_files = dump_files(f"{ctx.obj.input}/stale_objects/**/*")
     process_resources(resource_files, StaleNode, ctx.obj)
 
 
 @sync_app.command()
 @convert_app.command()
 def resource_groups(ctx: typer.Context):
-    resource_files = glob.glob(f"{ctx.obj.input}/api_groups/**/*.json", recursive=True)
+    resource_files = dump_files(f"{ctx.obj.input}/api_groups/**/*")
     process_resources(resource_files, ResourceGroupNode, ctx.obj)
 
 
 @sync_app.command()
 @convert_app.command()
 def custom_resource_definitions(ctx: typer.Context):
-    resource_files = glob.glob(
-        f"{ctx.obj.input}/custom_resource_definitions/**/*.json",
-        recursive=True,
-    )
+    resource_files = dump_files(f"{ctx.obj.input}/custom_resource_definitions/**/*")
     process_resources(resource_files, CustomResourceNode, ctx.obj)
 
 
 @sync_app.command()
 @convert_app.command()
 def resource_definitions(ctx: typer.Context):
-    resource_files = glob.glob(
-        f"{ctx.obj.input}/resource_definitions/**/*.json", recursive=True
-    )
+    resource_files = dump_files(f"{ctx.obj.input}/resource_definitions/**/*")
     process_resources(resource_files, ResourceNode, ctx.obj)
 
 
 @sync_app.command()
 @convert_app.command()
 def service_accounts(ctx: typer.Context):
-    resource_files = glob.glob(
-        f"{ctx.obj.input}/namespaces/**/serviceaccounts/*.json",
-        recursive=True,
-    )
+    resource_files = dump_files(f"{ctx.obj.input}/namespaces/**/serviceaccounts/*")
     process_resources(resource_files, ServiceAccountNode, ctx.obj)
 
 
 @sync_app.command()
 @convert_app.command()
 def groups(ctx: typer.Context):
-    resource_files = glob.glob(f"{ctx.obj.input}/group/*.json", recursive=True)
+    resource_files = dump_files(f"{ctx.obj.input}/group/*")
     process_resources(resource_files, GroupNode, ctx.obj)
 
 
 @sync_app.command()
 @convert_app.command()
 def users(ctx: typer.Context):
-    resource_files = glob.glob(f"{ctx.obj.input}/user/*.json", recursive=True)
+    resource_files = dump_files(f"{ctx.obj.input}/user/*")
     process_resources(resource_files, UserNode, ctx.obj)
 
 
 @sync_app.command()
 @convert_app.command()
 def statefulsets(ctx: typer.Context):
-    resource_files = glob.glob(
-        f"{ctx.obj.input}/namespaces/**/statefulsets/*.json", recursive=True
-    )
+    resource_files = dump_files(f"{ctx.obj.input}/namespaces/**/statefulsets/*")
     process_resources(resource_files, StatefulSetNode, ctx.obj)
 
 
 @sync_app.command()
 @convert_app.command()
 def deployments(ctx: typer.Context):
-    resource_files = glob.glob(
-        f"{ctx.obj.input}/namespaces/**/deployments/*.json", recursive=True
-    )
+    resource_files = dump_files(f"{ctx.obj.input}/namespaces/**/deployments/*")
     process_resources(resource_files, DeploymentNode, ctx.obj)
 
 
 @sync_app.command()
 @convert_app.command()
 def replicasets(ctx: typer.Context):
-    resource_files = glob.glob(
-        f"{ctx.obj.input}/namespaces/**/replicasets/*.json", recursive=True
-    )
+    resource_files = dump_files(f"{ctx.obj.input}/namespaces/**/replicasets/*")
     process_resources(resource_files, ReplicaSetNode, ctx.obj)
 
 
 @sync_app.command()
 @convert_app.command()
 def daemonsets(ctx: typer.Context):
-    resource_files = glob.glob(
-        f"{ctx.obj.input}/namespaces/**/daemonsets/*.json", recursive=True
-    )
+    resource_files = dump_files(f"{ctx.obj.input}/namespaces/**/daemonsets/*")
     process_resources(resource_files, DaemonSetNode, ctx.obj)
 
 
 @sync_app.command()
 @convert_app.command()
 def eks(ctx: typer.Context):
-    resource_files = glob.glob(
-        f"{ctx.obj.input}/identities/aws/**/*.json", recursive=True
-    )
+    resource_files = dump_files(f"{ctx.obj.input}/identities/aws/**/*")
     process_resources(resource_files, IAMUserNode, ctx.obj)
 
 
 @sync_app.command()
 @convert_app.command()
 def dynamic(ctx: typer.Context):
-    resource_files = glob.glob(
-        f"{ctx.obj.input}/namespaces/**/dynamic/*.json", recursive=True
-    )
+    resource_files = dump_files(f"{ctx.obj.input}/namespaces/**/dynamic/*")
     process_resources(resource_files, DynamicNode, ctx.obj)
 
 
 @sync_app.command()
 @convert_app.command()
 def generic(ctx: typer.Context):
-    resource_files = glob.glob(
-        f"{ctx.obj.input}/namespaces/*/unmapped/**/*.json", recursive=True
-    )
-    resource_files += glob.glob(f"{ctx.obj.input}/unmapped/**/*.json", recursive=True)
+    resource_files = dump_files(f"{ctx.obj.input}/namespaces/*/unmapped/**/*")
+    resource_files += dump_files(f"{ctx.obj.input}/unmapped/**/*")
     process_resources(resource_files, GenericNode, ctx.obj)
 
 
@@ -470,4 +451,4 @@ def all(ctx: typer.Context):
     ]
 
     for _, func in sync_functions:
-        ctx.invoke(func)
+        ctx.invoke(func, ctx)
@@ -0,0 +1,78 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+DEFAULT_SAVE_INTERVAL = 5
+
+
+class Checkpoint:
+    """JSON state kept next to a dump so long running commands can resume.
+
+    ``update`` saves at most once every ``save_interval`` seconds, call
+    ``save`` to force it. Files are replaced atomically, so a crash never
+    leaves a half written checkpoint behind. ``before_save`` is called with
+    the state (and the lock held) before every save, to write out what the
+    state refers to and record more of it.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        save_interval: float = DEFAULT_SAVE_INTERVAL,
+        before_save: Callable[[dict[str, Any]], None] | None = None,
+    ):
+        self.path = Path(path)
+        self.save_interval = save_interval
+        self.before_save = before_save
+        # Whether the state is that of an earlier, interrupted run
+        self.restored = self.path.exists()
+        self.state: dict[str, Any] = (
+            json.loads(self.path.read_text()) if self.restored else {}
+        )
+        self._lock = threading.Lock()
+        self._saved_at = 0.0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return self.state.get(key, default)
+
+    def update(self, key: str, value: Any) -> None:
+        with self._lock:
+            if value is None:
+                self.state.pop(key, None)
+            else:
+                self.state[key] = value
+            if time.monotonic() - self._saved_at >= self.save_interval:
+                self._save()
+
+    def entries(self, prefix: str) -> dict[str, Any]:
+        """The state of the keys starting with ``prefix``"""
+        with self._lock:
+            return {
+                key: value
+                for key, value in self.state.items()
+                if key.startswith(prefix)
+            }
+
+    def replace(self, prefix: str, entries: dict[str, Any]) -> None:
+        """Replaces the state of the keys starting with ``prefix`` with
+        ``entries``, as returned by ``entries`` earlier"""
+        with self._lock:
+            for key in [key for key in self.state if key.startswith(prefix)]:
+                del self.state[key]
+            self.state.update(entries)
+
+    def save(self) -> None:
+        with self._lock:
+            self._save()
+
+    def _save(self) -> None:
+        if self.before_save:
+            self.before_save(self.state)
+        temporary_path = self.path.with_name(f"{self.path.name}.tmp")
+        temporary_path.write_text(json.dumps(self.state, indent=2))
+        os.replace(temporary_path, self.path)
+        self._saved_at = time.monotonic()
@@ -0,0 +1,285 @@
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Callable, Iterator
+from kubernetes.client import ApiClient
+from kubernetes.client.exceptions import ApiException
+from kubepyhound.models.k8s.discovery import GroupDiscoveryList, VersionDiscovery
+from kubepyhound.models.k8s.resource import Resource, ResourceDefinitionList
+from kubepyhound.models.k8s.resource_group import (
+    ResourceGroup,
+    ResourceGroupList,
+    GroupVersion,
+)
+
+DISCOVERY_CACHE = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "kubepyhound"
+    / "discovery"
+)
+ROOT_DOCUMENTS = ("/api", "/apis")
+AGGREGATED_DISCOVERY = "as=APIGroupDiscoveryList"
+DISCOVERY_ACCEPT = ",".join(
+    [
+        "application/json;g=apidiscovery.k8s.io;v=v2;as=APIGroupDiscoveryList",
+        "application/json;g=apidiscovery.k8s.io;v=v2beta1;as=APIGroupDiscoveryList",
+        "application/json",
+    ]
+)
+QUERY_PARAMS = {
+    "_continue": "continue",
+    "limit": "limit",
+    "field_selector": "fieldSelector",
+    "label_selector": "labelSelector",
+    "resource_version": "resourceVersion",
+    "resource_version_match": "resourceVersionMatch",
+    "timeout_seconds": "timeoutSeconds",
+    "watch": "watch",
+    "allow_watch_bookmarks": "allowWatchBookmarks",
+}
+
+
+def cache_file(cluster_name: str, server_version: str) -> Path:
+    key = re.sub(r"[^\w.-]", "_", f"{cluster_name}-{server_version}")
+    return DISCOVERY_CACHE / f"{key}.json"
+
+
+class DiscoveryDocuments:
+    """Gets the discovery documents a catalog is built from and keeps them, so
+    the next catalog can start from these ``cached`` documents.
+
+    Every document is revalidated, with If-None-Match when the API server
+    sent an ETag for it, so an unchanged document costs a 304 instead of a
+    body. A group version document can change while the root documents stay
+    the same (a new CRD in an existing group version), so they are never
+    served from the cache without asking.
+    """
+
+    def __init__(self, api_client: ApiClient, cached: dict | None = None):
+        self.api_client = api_client
+        self.cached: dict[str, dict] = cached or {}
+        self.documents: dict[str, dict] = {}
+
+    def get(self, path: str, accept: str = "application/json") -> dict:
+        document = self._request(path, accept, self.cached.get(path))
+        self.documents[path] = document
+        return document
+
+    def _request(self, path: str, accept: str, cached: dict | None) -> dict:
+        header_params = {"Accept": accept}
+        if cached and cached["etag"]:
+            header_params["If-None-Match"] = cached["etag"]
+        try:
+            response = self.api_client.call_api(
+                path,
+                "GET",
+                header_params=header_params,
+                auth_settings=["BearerToken"],
+                _preload_content=False,
+                _return_http_data_only=True,
+            )
+        except ApiException as e:
+            if cached and e.status == HTTPStatus.NOT_MODIFIED:
+                return cached
+            raise
+        try:
+            body = response.data.decode()
+        finally:
+            response.release_conn()
+        return {
+            "etag": response.headers.get("ETag"),
+            "content_type": response.headers.get("Content-Type", ""),
+            "body": body,
+        }
+
+
+@dataclass
+class APIResource:
+    group: str
+    version: str
+    definition: Resource
+
+    @property
+    def group_version(self) -> str:
+        return f"{self.group}/{self.version}" if self.group else self.version
+
+    def path(self, namespace: str | None = None) -> str:
+        prefix = f"/apis/{self.group_version}" if self.group else f"/api/{self.version}"
+        if namespace:
+            prefix = f"{prefix}/namespaces/{namespace}"
+        return f"{prefix}/{self.definition.name}"
+
+    @property
+    def is_subresource(self) -> bool:
+        return "/" in self.definition.name
+
+    def list_func(self, api_client: ApiClient) -> Callable[..., Any]:
+        """A list call for this resource that accepts the same arguments as the
+        generated ``list_*`` methods, e.g. ``namespace``, ``limit`` and
+        ``_continue``"""
+
+        def list_resource(
+            namespace: str | None = None,
+            header_params: dict | None = None,
+            _preload_content: bool = False,
+            _request_timeout: Any = None,
+            **params,
+        ):
+            query_params = [
+                (QUERY_PARAMS[key], value)
+                for key, value in params.items()
+                if value is not None
+            ]
+            return api_client.call_api(
+                self.path(namespace),
+                "GET",
+                query_params=query_params,
+                header_params={"Accept": "application/json", **(header_params or {})},
+                auth_settings=["BearerToken"],
+                _preload_content=_preload_content,
+                _return_http_data_only=True,
+                _request_timeout=_request_timeout,
+            )
+
+        return list_resource
+
+
+def _version_resources(group: str, version: VersionDiscovery) -> Iterator[APIResource]:
+    for resource in version.resources:
+        namespaced = resource.scope == "Namespaced"
+        yield APIResource(
+            group,
+            version.version,
+            Resource(
+                name=resource.resource,
+                categories=resource.categories,
+                kind=resource.response_kind.kind if resource.response_kind else "",
+                singular_name=resource.singular_resource,
+                namespaced=namespaced,
+                verbs=resource.verbs,
+            ),
+        )
+        # Legacy discovery lists subresources as resources named <resource>/<sub>
+        for subresource in resource.subresources:
+            response_kind = subresource.response_kind
+            yield APIResource(
+                group,
+                version.version,
+                Resource(
+                    name=f"{resource.resource}/{subresource.subresource}",
+                    kind=response_kind.kind if response_kind else "",
+                    group=(
+                        response_kind.group
+                        if response_kind and response_kind.group != group
+                        else None
+                    ),
+                    singular_name="",
+                    namespaced=namespaced,
+                    verbs=subresource.verbs,
+                ),
+            )
+
+
+@dataclass
+class DiscoveryCatalog:
+    """The API surface of a cluster: every API group with the resources served
+    by its preferred version. The core group is stored under ``""`` in
+    ``resources`` and is not part of ``groups``.
+
+    ``fetch`` uses aggregated discovery, which returns all of ``/api`` and
+    ``/apis`` in two requests, and falls back to one request per group for
+    API servers that do not support it.
+    """
+
+    groups: list[ResourceGroup] = field(default_factory=list)
+    resources: dict[str, list[APIResource]] = field(default_factory=dict)
+    documents: dict[str, dict] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def fetch(
+        cls, api_client: ApiClient, cached: dict | None = None
+    ) -> "DiscoveryCatalog":
+        catalog = cls()
+        discovery = DiscoveryDocuments(api_client, cached)
+        for path in ROOT_DOCUMENTS:
+            document = discovery.get(path, DISCOVERY_ACCEPT)
+            if AGGREGATED_DISCOVERY in document["content_type"]:
+                catalog.add_aggregated(
+                    GroupDiscoveryList.model_validate_json(document["body"])
+                )
+            elif path == "/api":
+                catalog.add_legacy_core(discovery)
+            else:
+                catalog.add_legacy_groups(
+                    discovery, ResourceGroupList.model_validate_json(document["body"])
+                )
+        catalog.documents = discovery.documents
+        return catalog
+
+    @classmethod
+    def load(
+        cls, api_client: ApiClient, path: Path, refresh: bool = False
+    ) -> "DiscoveryCatalog":
+        """Builds the catalog from the documents cached in ``path``, after
+        revalidating them, and stores the documents it was built from.
+        ``refresh`` ignores the cache and discovers everything again."""
+        cached = None
+        if path.exists() and not refresh:
+            cached = json.loads(path.read_text())
+        catalog = cls.fetch(api_client, cached)
+        if catalog.documents != cached:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temporary_path = path.with_name(f"{path.name}.tmp")
+            temporary_path.write_text(json.dumps(catalog.documents))
+            os.replace(temporary_path, path)
+        return catalog
+
+    def add_aggregated(self, discovery: GroupDiscoveryList) -> None:
+        for group in discovery.items:
+            if not group.versions:
+                continue
+            name = group.metadata.name
+            preferred = group.versions[0]
+            if name:
+                versions = [
+                    GroupVersion(
+                        group_version=f"{name}/{version.version}",
+                        version=version.version,
+                    )
+                    for version in group.versions
+                ]
+                self.groups.append(
+                    ResourceGroup(
+                        name=name, preferred_version=versions[0], versions=versions
+                    )
+                )
+            self.resources[name] = list(_version_resources(name, preferred))
+
+    def add_legacy_core(self, discovery: DiscoveryDocuments) -> None:
+        core_resources = ResourceDefinitionList.model_validate_json(
+            discovery.get("/api/v1")["body"]
+        )
+        self.resources[""] = [
+            APIResource("", "v1", resource) for resource in core_resources.resources
+        ]
+
+    def add_legacy_groups(
+        self, discovery: DiscoveryDocuments, groups: ResourceGroupList
+    ) -> None:
+        for group in groups.groups:
+            preferred = group.preferred_version
+            resources = ResourceDefinitionList.model_validate_json(
+                discovery.get(f"/apis/{preferred.group_version}")["body"]
+            )
+            self.groups.append(group)
+            self.resources[group.name] = [
+                APIResource(group.name, preferred.version, resource)
+                for resource in resources.resources
+            ]
+
+    def all_resources(self) -> Iterator[APIResource]:
+        for resources in self.resources.values():
+            yield from resources
@@ -1,9 +1,25 @@
 import typer
+import glob
+import gzip
+import io
 import json
-from pathlib import Path
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Iterator
 from functools import wraps
 from enum import Enum
 from pydantic import BaseModel
+from kubepyhound.utils.tables import table_definitions, TableWriter, DATABASE
+import duckdb
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 
 class OutputFormat(str, Enum):
@@ -11,49 +27,465 @@ class OutputFormat(str, Enum):
     ndjson = "ndjson"
 
 
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+DEFAULT_MAX_OPEN_STREAMS = 64
+# Objects stored as received from the API server by `dump --raw`
+RAW_DIR = "raw"
+# Written once for every object they are derived from, the host volumes of
+# pods and the users and groups of bindings; other objects are listed once
+DERIVED_RESOURCES = frozenset({"volumes", "user", "group"})
+SEGMENT_NAME = re.compile(r"part-(\d+)\.ndjson")
+# Where segments are written, relative to the base directory
+SEGMENT_GLOBS = ("*/part-*", "namespaces/*/*/part-*", f"{RAW_DIR}/*/part-*")
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+DUMP_EXTENSIONS = tuple(
+    f"{extension}{suffix}"
+    for extension in ("json", "ndjson")
+    for suffix in ("", *COMPRESSION_SUFFIXES.values())
+)
+
+
+def open_dump_file(path: str | Path, mode: str = "rb") -> BinaryIO:
+    """Opens a dump file, compressing or decompressing based on its suffix"""
+    path = str(path)
+    if path.endswith(".gz"):
+        stream = gzip.GzipFile(path, mode)
+    elif path.endswith(".zst"):
+        if zstandard is None:
+            raise Exception(f"Reading or writing {path} requires the zstandard package")
+        if "r" in mode:
+            stream = zstandard.ZstdDecompressor().stream_reader(
+                open(path, "rb"), read_across_frames=True
+            )
+        else:
+            stream = zstandard.ZstdCompressor().stream_writer(open(path, mode))
+    else:
+        return open(path, mode, buffering=DEFAULT_BUFFER_SIZE)
+
+    if "r" in mode:
+        return io.BufferedReader(stream, DEFAULT_BUFFER_SIZE)
+    return io.BufferedWriter(stream, DEFAULT_BUFFER_SIZE)
+
+
 def load_json(input_file: str):
-    with open(input_file, "r") as f:
+    with open_dump_file(input_file) as f:
         json_object = json.loads(f.read())
     return json_object
 
 
+def load_objects(input_file: str):
+    """Yields every object in a dump file, one per line for ndjson segments"""
+    if ".ndjson" not in Path(input_file).name:
+        yield load_json(input_file)
+        return
+    with open_dump_file(input_file) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def dump_files(pattern: str) -> list[str]:
+    """Globs ``pattern`` for every file extension a dump may use, e.g.
+    ``output/namespaces/**/pods/*`` matches both ``<pod>.json`` files and
+    ``part-00000.ndjson.zst`` segments"""
+    return [
+        path
+        for extension in DUMP_EXTENSIONS
+        for path in glob.glob(f"{pattern}.{extension}", recursive=True)
+    ]
+
+
+def load_cluster(input_dir: str | Path) -> dict:
+    for cluster_file in dump_files(f"{input_dir}/cluster/*"):
+        for cluster in load_objects(cluster_file):
+            return cluster
+    return {}
+
+
+@dataclass
+class Segment:
+    directory: Path
+    suffix: str = ""
+    index: int = 0
+    size: int | None = None
+    handle: BinaryIO | None = None
+
+    @property
+    def path(self) -> Path:
+        return self.directory / f"part-{self.index:05d}.ndjson{self.suffix}"
+
+
 class DumpClient:
-    def __init__(self, base_dir: Path, mode: str):
+    """Writes collected objects below ``base_dir``.
+
+    ``simple`` writes one pretty-printed JSON file per object. ``ndjson``
+    appends objects to segment files that mirror the same directory layout
+    (``namespaces/<namespace>/<resource>/part-00000.ndjson``), keeping one
+    buffered handle open per stream and optionally starting a new segment
+    once ``max_segment_bytes`` is reached. Call ``close`` to flush them.
+    With ``compression`` (``gzip`` or ``zstd``) every file is compressed and
+    named accordingly, e.g. ``part-00000.ndjson.zst``.
+    Writing a derived object that was already written with identical content
+    (such as a host volume shared by every pod of a DaemonSet) is skipped, and
+    counted per resource in ``suppressed``; set ``deduplicated`` to None to
+    skip identical rewrites of every resource, as ``watch`` does.
+    ``parquet`` writes the same segments and on ``close`` additionally
+    exports every DuckDB table to ``<table>.parquet`` in ``base_dir``; the
+    segments stay, as convert still reads the full objects. ``duckdb`` writes
+    the same segments and appends every object to the tables in
+    ``k8s.duckdb`` as it is collected, so no bootstrap is needed.
+    ``write_raw`` appends objects that were not validated into a model to
+    ``raw/<resource>/`` segments in any mode.
+    """
+
+    def __init__(
+        self,
+        base_dir: Path,
+        mode: str,
+        max_segment_bytes: int = 0,
+        max_open_streams: int = DEFAULT_MAX_OPEN_STREAMS,
+        compression: str | None = None,
+    ):
         self.base_dir = Path(base_dir).resolve()
+        self.max_segment_bytes = max_segment_bytes
+        self.max_open_streams = max_open_streams
+        self.mode = mode
+        self.suffix = COMPRESSION_SUFFIXES[compression] if compression else ""
+        self._unexported = False
+        self._directories: set[Path] = set()
+        # Directories that resolve to a path inside base_dir
+        self._contained: set[Path] = set()
+        self._segments: dict[Path, Segment] = {}
+        # Least recently written streams are closed first once the limit is hit
+        self._open_segments: OrderedDict[Path, Segment] = OrderedDict()
+        # Collectors may run concurrently and share streams (users, groups)
+        self._lock = threading.Lock()
+        # Hash of the last document written per (resource, namespace, name),
+        # of the resources in ``deduplicated`` only
+        self._written: dict[tuple[str, str | None, str], int] = {}
+        self.deduplicated: frozenset[str] | None = DERIVED_RESOURCES
+        # (resource, namespace, hash) of the derived lines kept by roll_back
+        self._restored: set[tuple[str, str | None, int]] = set()
+        self.suppressed: Counter[str] = Counter()
         self._writer = {
             "simple": self._to_json,
             "ndjson": self._to_ndjson,
+            "parquet": self._to_ndjson,
+            "duckdb": self._to_ndjson,
         }[mode]
+        # Opened with the first object, so a client that writes nothing (like
+        # the parent of a --contexts dump) leaves no database behind
+        self._tables: TableWriter | None = None
+        self.filled_tables = False
 
     def write(
         self, data: BaseModel, name: str, resource: str, namespace: str | None = None
     ) -> None:
         self._writer(data, name, resource, namespace)
 
-    def _to_json(
-        self, data: BaseModel, name: str, resource: str, namespace: str | None = None
-    ):
+    def write_raw(self, lines: list[bytes], resource: str) -> None:
+        """Appends ``lines`` (one JSON object each) to the raw segments of
+        ``resource``"""
+        output_dir = self.base_dir / RAW_DIR / resource
+        with self._lock:
+            for line in lines:
+                self._append(output_dir, line)
+
+    def raw_resources(self) -> list[str]:
+        raw_dir = self.base_dir / RAW_DIR
+        if not raw_dir.is_dir():
+            return []
+        return sorted(path.name for path in raw_dir.iterdir() if path.is_dir())
+
+    def delete(self, name: str, resource: str, namespace: str | None = None) -> None:
+        if self.mode != "simple":
+            raise Exception(f"Objects can not be deleted from {self.mode} dumps")
         output_path = (
-            self.base_dir / "namespaces" / namespace / resource / f"{name}.json"
+            self._output_dir(resource, namespace) / f"{name}.json{self.suffix}"
+        )
+        self._check_path(output_path)
+        with self._lock:
+            self._written.pop((resource, namespace, name), None)
+        output_path.unlink(missing_ok=True)
+
+    def stored(
+        self, resource: str, namespaced: bool = True
+    ) -> Iterator[tuple[str | None, str]]:
+        """Yields the namespace and name of every stored ``resource`` object"""
+        extension = f".json{self.suffix}"
+        pattern = (
+            f"namespaces/*/{resource}/*{extension}"
+            if namespaced
+            else f"{resource}/*{extension}"
+        )
+        for path in self.base_dir.glob(pattern):
+            namespace = path.parent.parent.name if namespaced else None
+            yield namespace, path.name[: -len(extension)]
+
+    def flush(self) -> dict[str, list[int]]:
+        """Writes out everything written so far, returning where the segments
+        written to end: the index and size on disk of the last segment per
+        directory, relative to ``base_dir``. Segments are closed rather than
+        flushed, so compressed ones end with a complete gzip member or zstd
+        frame; they are opened again with the next write"""
+        with self._lock:
+            self._close_segments()
+            if self._tables is not None:
+                self._tables.flush()
+            return {
+                directory.relative_to(self.base_dir).as_posix(): [
+                    segment.index,
+                    segment.path.stat().st_size,
+                ]
+                for directory, segment in self._segments.items()
+                if segment.path.exists()
+            }
+
+    def segment_ends(self, directory: str | None = None) -> dict[str, list[int]]:
+        """Where every segment directory in ``base_dir`` ends, see ``flush``.
+        With ``directory`` (relative to ``base_dir``) only where that one
+        ends, closing its open segment first"""
+        ends: dict[str, list[int]] = {}
+        with self._lock:
+            if directory is not None:
+                self._close_segment(self.base_dir / directory)
+            for segment_dir, index, path in self._segment_files(directory):
+                if index >= ends.get(segment_dir, [-1])[0]:
+                    ends[segment_dir] = [index, path.stat().st_size]
+        return ends
+
+    def roll_back(
+        self, ends: dict[str, list[int]], directory: str | None = None
+    ) -> None:
+        """Cuts the segments in ``base_dir`` back to ``ends`` (see ``flush``),
+        dropping whatever was appended after they were recorded, including
+        lines cut short by a crash, and skips writing the derived objects
+        that are left once more. Must be called before anything is written,
+        unless only the segments of ``directory`` are cut back, e.g. to list
+        them again while other directories are written: the tables those
+        segments feed are then loaded again"""
+        with self._lock:
+            if directory is not None:
+                # The tables are loaded from what is on disk
+                self._close_segments()
+                self._segments.pop(self.base_dir / directory, None)
+            for segment_dir, index, path in self._segment_files(directory):
+                last_index, size = ends.get(segment_dir, (-1, 0))
+                if index > last_index:
+                    path.unlink()
+                    continue
+                if index == last_index and path.stat().st_size > size:
+                    os.truncate(path, size)
+                # Derived objects are written again by the objects listed again
+                resource = PurePosixPath(segment_dir).name
+                if resource in DERIVED_RESOURCES:
+                    namespace = (
+                        segment_dir.split("/")[1] if "/" in segment_dir else None
+                    )
+                    with open_dump_file(path) as segment:
+                        self._restored.update(
+                            (resource, namespace, hash(line)) for line in segment
+                        )
+            if directory is not None and self._tables is not None:
+                self._tables.reload(directory)
+
+    def written_objects(
+        self, resource: str, namespaces: list[str] | None = None
+    ) -> set[tuple[str | None, str]]:
+        """The namespace and name of every ``resource`` object in the segments
+        (the raw segments with --raw), optionally only in ``namespaces``"""
+        namespace_dirs = [
+            self.base_dir / "namespaces" / namespace / resource
+            for namespace in namespaces or []
+        ] or self.base_dir.glob(f"namespaces/*/{resource}")
+        directories: list[tuple[Path, str | None]] = [
+            (directory, directory.parent.name) for directory in namespace_dirs
+        ]
+        if not namespaces:
+            directories.append((self.base_dir / resource, None))
+        written = set()
+        for directory, namespace in directories:
+            for path in directory.glob("part-*"):
+                for resource_object in load_objects(str(path)):
+                    written.add((namespace, resource_object["metadata"]["name"]))
+        # Raw objects are as the API server sent them
+        for path in (self.base_dir / RAW_DIR / resource).glob("part-*"):
+            for resource_object in load_objects(str(path)):
+                metadata = resource_object["metadata"]
+                if not namespaces or metadata.get("namespace") in namespaces:
+                    written.add((metadata.get("namespace"), metadata["name"]))
+        return written
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_segments()
+            # Only export again once something new has been written
+            if self.mode == "parquet" and self._unexported:
+                self._export_parquet()
+                self._unexported = False
+            if self._tables is not None:
+                self._tables.flush()
+                self._tables.con.close()
+                self._tables = None
+
+    def _close_segments(self) -> None:
+        while self._open_segments:
+            _, segment = self._open_segments.popitem(last=False)
+            segment.handle.close()
+            segment.handle = None
+
+    def _close_segment(self, directory: Path) -> None:
+        segment = self._open_segments.pop(directory, None)
+        if segment is not None:
+            segment.handle.close()
+            segment.handle = None
+
+    def _segment_files(
+        self, directory: str | None = None
+    ) -> Iterator[tuple[str, int, Path]]:
+        """The directory relative to ``base_dir``, index and path of every
+        segment on disk, or of the segments in ``directory`` only"""
+        patterns = SEGMENT_GLOBS if directory is None else (f"{directory}/part-*",)
+        for pattern in patterns:
+            for path in self.base_dir.glob(pattern):
+                match = SEGMENT_NAME.fullmatch(path.name.removesuffix(self.suffix))
+                if match:
+                    directory = path.parent.relative_to(self.base_dir).as_posix()
+                    yield directory, int(match[1]), path
+
+    def _export_parquet(self) -> None:
+        con = duckdb.connect()
+        try:
+            for definition in table_definitions():
+                definition.export_parquet(con, self.base_dir)
+        finally:
+            con.close()
+
+    def _output_dir(self, resource: str, namespace: str | None) -> Path:
+        output_dir = (
+            self.base_dir / "namespaces" / namespace / resource
             if namespace
-            else self.base_dir / resource / f"{name}.json"
+            else self.base_dir / resource
         )
-        resolved_path = output_path.resolve()
-        if not resolved_path.is_relative_to(self.base_dir):
+        return output_dir
+
+    def _duplicate(
+        self, document: bytes, name: str, resource: str, namespace: str | None
+    ) -> bool:
+        """Records ``document`` as written, returning whether the exact same
+        document was written before. Must be called with the lock held"""
+        if self.deduplicated is not None and resource not in self.deduplicated:
+            return False
+        key = (resource, namespace, name)
+        digest = hash(document)
+        if (
+            self._written.get(key) == digest
+            or (resource, namespace, digest) in self._restored
+        ):
+            self.suppressed[resource] += 1
+            return True
+        self._written[key] = digest
+        return False
+
+    def _ensure_dir(self, directory: Path) -> None:
+        if directory not in self._directories:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._directories.add(directory)
+
+    def _check_path(self, output_path: Path) -> None:
+        directory = output_path.parent
+        if directory in self._contained:
+            return
+        # resolve() follows symlinks, so neither ".." nor a link can lead out
+        if not directory.resolve().is_relative_to(self.base_dir):
             raise Exception(
                 f"Filename {output_path} is not in {self.base_dir} directory"
             )
+        self._contained.add(directory)
 
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "w") as file_obj:
-            file_obj.write(data.model_dump_json(indent=2))
+    def _to_json(
+        self, data: BaseModel, name: str, resource: str, namespace: str | None = None
+    ):
+        output_path = (
+            self._output_dir(resource, namespace) / f"{name}.json{self.suffix}"
+        )
+        self._check_path(output_path)
+        document = data.model_dump_json(indent=2).encode()
+        with self._lock:
+            if self._duplicate(document, name, resource, namespace):
+                return
+        self._ensure_dir(output_path.parent)
+        with open_dump_file(output_path, "wb") as file_obj:
+            file_obj.write(document)
 
     def _to_ndjson(
         self, data: BaseModel, name: str, resource: str, namespace: str | None = None
     ):
-        output_file = self.base_dir / f"{resource}.ndjson"
-        with open(output_file, "a") as file_obj:
-            file_obj.write(f"{data.model_dump_json().replace("\n", "")}\n")
+        output_dir = self._output_dir(resource, namespace)
+        document = data.model_dump_json()
+        line = document.encode() + b"\n"
+        with self._lock:
+            if self._duplicate(line, name, resource, namespace):
+                return
+            # Before appending, as a new table writer loads the segments
+            tables = self._table_writer() if self.mode == "duckdb" else None
+            self._append(output_dir, line)
+            self._unexported = True
+            if tables is not None:
+                tables.append(
+                    output_dir.relative_to(self.base_dir).as_posix(), name, document
+                )
+
+    def _table_writer(self) -> TableWriter:
+        """The writer of the ``k8s.duckdb`` tables, created with the tables of
+        what the dump already holds. Must be called with the lock held"""
+        if self._tables is None:
+            self._tables = TableWriter(duckdb.connect(database=DATABASE), self.base_dir)
+            self.filled_tables = True
+        return self._tables
+
+    def _append(self, output_dir: Path, line: bytes) -> None:
+        """Appends ``line`` to the current segment of ``output_dir``, starting
+        a new one when it is full. Must be called with the lock held"""
+        segment = self._open_segment(output_dir)
+        if (
+            self.max_segment_bytes
+            and segment.size
+            and segment.size + len(line) > self.max_segment_bytes
+        ):
+            segment.handle.close()
+            segment.index += 1
+            segment.size = None
+            self._open_file(segment)
+        segment.handle.write(line)
+        segment.size += len(line)
+
+    def _open_segment(self, output_dir: Path) -> Segment:
+        segment = self._segments.get(output_dir)
+        if segment is None:
+            self._check_path(output_dir / "part")
+            self._ensure_dir(output_dir)
+            segment = self._segments[output_dir] = Segment(output_dir, self.suffix)
+
+        if segment.handle is not None:
+            self._open_segments.move_to_end(output_dir)
+            return segment
+
+        if len(self._open_segments) >= self.max_open_streams:
+            _, evicted = self._open_segments.popitem(last=False)
+            evicted.handle.close()
+            evicted.handle = None
+        self._open_file(segment)
+        self._open_segments[output_dir] = segment
+        return segment
+
+    def _open_file(self, segment: Segment) -> None:
+        # Sizes are counted before compression, starting from what an earlier
+        # run left behind. Compressed appends start a new gzip member or zstd
+        # frame, which readers treat as one continuous stream
+        if segment.size is None:
+            segment.size = segment.path.stat().st_size if segment.path.exists() else 0
+        segment.handle = open_dump_file(segment.path, "ab")
 
 
 def process_stale_refs(resource_type: str, output_dir: str = "./output"):
@@ -2,7 +2,8 @@ import json
 import os
 import duckdb
 from duckdb import DuckDBPyConnection
-import glob
+from kubepyhound.utils.helpers import load_cluster
+from kubepyhound.utils.tables import load_tables, TABLES_PATH
 from typing import Dict, Any, Optional
 from pathlib import Path
 
@@ -106,18 +107,13 @@ class LookupManager:
             [resource_type, namespace],
         )
 
-    def bootstrap(self, query_path: Path) -> None:
-        bootstrap_files = glob.glob(f"{query_path}/*.sql")
-        for query in bootstrap_files:
-            with open(query, "r") as query_file:
-                sql_content = query_file.read()
-                self.con.execute(sql_content)
-        self.con.close()
+    def bootstrap(self, query_path: Path = TABLES_PATH) -> None:
+        load_tables(self.con, Path(self.directory), query_path)
 
     @property
     def cluster(self) -> Dict[str, Any]:
         if self._cluster is None:
-            self._cluster = self._load_json("cluster/cluster.json")
+            self._cluster = load_cluster(self.directory)
         return self._cluster
 
     # @property
@@ -0,0 +1,203 @@
+import json
+from dataclasses import dataclass
+from functools import partial
+from http import HTTPStatus
+from typing import Any, Callable, Iterable, Iterator
+from kubernetes.client.exceptions import ApiException
+from pydantic import BaseModel
+from kubepyhound.models.k8s.resource_list import ResourceList
+from kubepyhound.utils import protobuf
+from kubepyhound.utils.stream import ListItemStream, CHUNK_SIZE
+
+DEFAULT_PAGE_SIZE = 500
+# Bulk that none of the dump models read, cut out of every item before it is
+# validated
+PRUNED_FIELDS = ("metadata.managedFields", "metadata.annotations", "status")
+# Only the metadata of every item, falls back to the full objects for API
+# servers that do not support the conversion
+METADATA_ONLY = (
+    "application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1,"
+    "application/json"
+)
+
+
+@dataclass
+class Page:
+    items: Iterator[Any]
+    number: int
+    resource_version: str | None
+    count: int = 0
+    # The token this page was requested with, None for the first page
+    continue_token: str | None = None
+    # The same items as JSON (or protobuf), for consumers that validate them
+    # elsewhere with ``validate``. Only one of ``items`` and ``raw_items`` can
+    # be consumed
+    raw_items: Iterator[bytes] = iter(())
+    validate: Callable[[bytes], Any] | None = None
+
+
+def _count_items(raw_items: Iterator[bytes], page: Page) -> Iterator[bytes]:
+    for raw_item in raw_items:
+        page.count += 1
+        yield raw_item
+
+
+def _validate_protobuf(
+    model: type[BaseModel], message: protobuf.Message, raw_item: bytes
+) -> Any:
+    return model.model_validate(protobuf.decode(raw_item, message))
+
+
+def paginate(
+    list_func: Callable[..., Any],
+    model: type[BaseModel],
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prune: Iterable[str] = PRUNED_FIELDS,
+    continue_token: str | None = None,
+    pinned_version: str | None = None,
+    message: protobuf.Message | None = None,
+    **kwargs,
+) -> Iterator[Page]:
+    """Yield the results of a list call one page at a time.
+
+    Responses are requested without preloading and the body is split into
+    items while it is still being received. Each item is validated straight
+    into ``model`` as soon as it is complete, so neither the kubernetes
+    client objects nor the full response body are ever held in memory.
+    ``Page.items`` must be consumed before the next page is requested.
+    The members listed in ``prune`` are cut out of every item beforehand.
+
+    Only the first request is made without a continue token; every following
+    page is served from the snapshot of that first response, so all pages
+    share the resourceVersion recorded on page one. Pass the
+    ``continue_token`` and ``pinned_version`` of an earlier page to resume
+    from that page.
+
+    Responses that the API server sent as protobuf (see ``protobuf.ACCEPT``)
+    are read as a whole and their items decoded with ``message`` instead,
+    which leaves out every field the message does not list.
+    """
+    envelope_model = ResourceList[model]
+    number = 0
+    while True:
+        response = list_func(
+            limit=page_size,
+            _continue=continue_token,
+            _preload_content=False,
+            **kwargs,
+        )
+        number += 1
+        page = Page(
+            items=iter(()),
+            number=number,
+            resource_version=pinned_version,
+            continue_token=continue_token,
+        )
+        content_type = response.headers.get("Content-Type") or ""
+        if message is not None and content_type.startswith(protobuf.CONTENT_TYPE):
+            stream = None
+            list_metadata, raw_items = protobuf.split_list(response.data)
+            page.raw_items = _count_items(iter(raw_items), page)
+            page.validate = partial(_validate_protobuf, model, message)
+        else:
+            stream = ListItemStream(response.stream(CHUNK_SIZE), prune)
+            page.raw_items = _count_items(iter(stream), page)
+            page.validate = model.model_validate_json
+        page.items = (page.validate(item) for item in page.raw_items)
+        try:
+            yield page
+            # Drain whatever the consumer left so the envelope is complete
+            for _ in page.raw_items:
+                pass
+        finally:
+            response.release_conn()
+
+        if stream is None:
+            envelope = envelope_model.model_validate({"metadata": list_metadata})
+        else:
+            envelope = envelope_model.model_validate_json(stream.envelope)
+        resource_version = envelope.metadata.resource_version
+        continue_token = envelope.metadata.continue_
+        if pinned_version is None:
+            pinned_version = resource_version
+            page.resource_version = resource_version
+        elif resource_version and resource_version != pinned_version:
+            raise Exception(
+                f"List snapshot moved from resourceVersion {pinned_version} to {resource_version}"
+            )
+        if not continue_token:
+            return
+
+
+DEFAULT_WATCH_TIMEOUT = 300
+
+
+class ResourceVersionExpired(Exception):
+    pass
+
+
+def _iter_lines(response: Any) -> Iterator[bytes]:
+    """The lines of a streamed response, like the kubernetes client's
+    iter_resp_lines but decompressing gzip encoded responses"""
+    buffer = bytearray()
+    for chunk in response.stream(amt=None, decode_content=True):
+        buffer.extend(chunk)
+        while (end := buffer.find(b"\n")) >= 0:
+            yield bytes(buffer[:end])
+            del buffer[: end + 1]
+    if buffer:
+        yield bytes(buffer)
+
+
+@dataclass
+class WatchEvent:
+    type: str
+    resource_version: str | None
+    object: Any = None
+
+
+def watch(
+    list_func: Callable[..., Any],
+    model: type[BaseModel],
+    resource_version: str,
+    timeout_seconds: int = DEFAULT_WATCH_TIMEOUT,
+    **kwargs,
+) -> Iterator[WatchEvent]:
+    """Streams the changes made after ``resource_version`` until the server
+    ends the watch. Bookmarks are yielded without an object so the caller can
+    checkpoint them. Raises ResourceVersionExpired (410 Gone) once the version
+    is too old to resume from, after which the caller has to relist."""
+    try:
+        response = list_func(
+            watch=True,
+            allow_watch_bookmarks=True,
+            resource_version=resource_version,
+            timeout_seconds=timeout_seconds,
+            _preload_content=False,
+            **kwargs,
+        )
+    except ApiException as e:
+        if e.status == HTTPStatus.GONE:
+            raise ResourceVersionExpired(resource_version) from e
+        raise
+
+    try:
+        for line in _iter_lines(response):
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            raw_object = event["object"]
+            if event["type"] == "ERROR":
+                if raw_object.get("code") == HTTPStatus.GONE:
+                    raise ResourceVersionExpired(resource_version)
+                raise Exception(f"Watch failed: {raw_object.get('message')}")
+            event_version = raw_object.get("metadata", {}).get("resourceVersion")
+            if event["type"] == "BOOKMARK":
+                yield WatchEvent(event["type"], event_version)
+            else:
+                yield WatchEvent(
+                    event["type"], event_version, model.model_validate(raw_object)
+                )
+    finally:
+        response.close()
+        response.release_conn()
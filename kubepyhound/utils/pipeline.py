@@ -0,0 +1,185 @@
+import queue
+from collections import deque
+import threading
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Sequence
+
+# A single worker validates and writes inline on the collector threads
+DEFAULT_PARSE_WORKERS = 1
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_BATCH_SIZE = 100
+
+
+@dataclass
+class StageStats:
+    name: str
+    workers: int
+    items: int = 0
+    busy: float = 0.0
+    max_depth: int = 0
+
+    def utilization(self, elapsed: float) -> float | None:
+        if not self.workers or not elapsed:
+            return None
+        return self.busy / (elapsed * self.workers)
+
+
+class Run:
+    """The batches of a single list that are still in the pipeline"""
+
+    def __init__(self):
+        self.error: BaseException | None = None
+        self._submitted = 0
+        self._pending: set[int] = set()
+        self._callbacks: deque[tuple[int, Callable[[], None]]] = deque()
+        self._condition = threading.Condition()
+
+    def start(self) -> int:
+        with self._condition:
+            batch = self._submitted
+            self._submitted += 1
+            self._pending.add(batch)
+            return batch
+
+    def done(self, batch: int, error: BaseException | None = None) -> None:
+        with self._condition:
+            self._pending.discard(batch)
+            if error is not None and self.error is None:
+                self.error = error
+            self._call_ready()
+            self._condition.notify_all()
+
+    def when_written(self, callback: Callable[[], None]) -> None:
+        """Calls ``callback`` once every batch submitted so far was written,
+        never if one of them failed. Callbacks are called in the order they
+        were added"""
+        with self._condition:
+            self._callbacks.append((self._submitted, callback))
+            self._call_ready()
+
+    def wait(self) -> None:
+        """Blocks until every batch was written or failed, see ``error``"""
+        with self._condition:
+            while self._pending:
+                self._condition.wait()
+
+    def _call_ready(self) -> None:
+        # Called with the condition held, so that the writer and the collector
+        # threads can not call two callbacks out of order
+        if self.error is not None:
+            self._callbacks.clear()
+            return
+        written = min(self._pending, default=self._submitted)
+        while self._callbacks and self._callbacks[0][0] <= written:
+            self._callbacks.popleft()[1]()
+
+
+class Stage:
+    """Runs jobs from a bounded queue on ``workers`` threads"""
+
+    def __init__(self, name: str, workers: int, queue_size: int):
+        self.stats = StageStats(name, workers)
+        self.queue: queue.Queue[Callable[[], int] | None] = queue.Queue(queue_size)
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"{name}-{index}", daemon=True)
+            for index in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, job: Callable[[], int]) -> float:
+        """Queues ``job``, returning how long the queue was full"""
+        started = time.monotonic()
+        self.queue.put(job)
+        blocked = time.monotonic() - started
+        depth = self.queue.qsize()
+        with self._lock:
+            self.stats.max_depth = max(self.stats.max_depth, depth)
+        return blocked
+
+    def close(self) -> None:
+        for _ in self._threads:
+            self.queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _run(self) -> None:
+        while (job := self.queue.get()) is not None:
+            started = time.monotonic()
+            items = job()
+            with self._lock:
+                self.stats.busy += time.monotonic() - started
+                self.stats.items += items
+
+
+class Pipeline:
+    """Bounded fetch, parse and write stages for the dump collectors.
+
+    Collector threads fetch pages and split them into raw items (the fetch
+    stage), batches of items are validated into models by ``parse_workers``
+    threads and a single writer thread stores them, so no stage waits for
+    another as long as the queues in between have room.
+    """
+
+    def __init__(
+        self,
+        parse_workers: int = DEFAULT_PARSE_WORKERS,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ):
+        self.fetch = StageStats("fetch", 0)
+        self.parse = Stage("parse", parse_workers, queue_size)
+        self.write = Stage("write", 1, queue_size)
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+
+    def submit(
+        self,
+        run: Run,
+        items: Sequence[Any],
+        parse: Callable[[Sequence[Any]], Sequence[Any]],
+        write: Callable[[Sequence[Any]], None],
+    ) -> float:
+        """Parses ``items`` on the parse workers and hands the result to the
+        writer thread. Returns how long the parse queue was full"""
+
+        batch = run.start()
+
+        def write_job(parsed: Sequence[Any]) -> int:
+            try:
+                write(parsed)
+            except Exception as e:
+                run.done(batch, e)
+            else:
+                run.done(batch)
+            return len(parsed)
+
+        def parse_job() -> int:
+            try:
+                parsed = parse(items)
+            except Exception as e:
+                run.done(batch, e)
+            else:
+                self.write.submit(partial(write_job, parsed))
+            return len(items)
+
+        return self.parse.submit(parse_job)
+
+    def record_fetch(self, items: int, busy: float) -> None:
+        with self._lock:
+            self.fetch.items += items
+            self.fetch.busy += busy
+
+    def stats(self) -> tuple[float, list[StageStats]]:
+        """Seconds since the pipeline started and the stats of every stage"""
+        return time.monotonic() - self._started, [
+            self.fetch,
+            self.parse.stats,
+            self.write.stats,
+        ]
+
+    def close(self) -> None:
+        self.parse.close()
+        self.write.close()
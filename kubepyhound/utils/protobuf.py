@@ -0,0 +1,236 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Iterator
+
+CONTENT_TYPE = "application/vnd.kubernetes.protobuf"
+# The API server answers in JSON for types it has no protobuf encoding for,
+# such as custom resources
+ACCEPT = f"{CONTENT_TYPE}, application/json"
+# Prefix of every protobuf encoded response, followed by a runtime.Unknown
+MAGIC = b"k8s\x00"
+
+_VARINT = 0
+_FIXED64 = 1
+_LENGTH_DELIMITED = 2
+_FIXED32 = 5
+
+
+@dataclass(frozen=True)
+class Field:
+    """A field of a protobuf message and the JSON member it is decoded into.
+
+    ``type`` is one of ``string``, ``bytes``, ``bool``, ``int``, ``time``
+    (a meta/v1 Time), ``map`` (string to string), ``message`` or ``inline``
+    (a message whose members are merged into the parent, like VolumeSource)
+    """
+
+    name: str
+    type: str = "string"
+    message: dict[int, "Field"] = field(default_factory=dict)
+    repeated: bool = False
+
+
+Message = dict[int, Field]
+
+
+def _varint(buf: memoryview, pos: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+def _fields(buf: bytes | memoryview) -> Iterator[tuple[int, int, Any]]:
+    """The field number, wire type and value of every field in ``buf``,
+    length delimited values as memoryviews into ``buf``"""
+    buf = memoryview(buf)
+    pos = 0
+    while pos < len(buf):
+        key, pos = _varint(buf, pos)
+        number, wire_type = key >> 3, key & 0x7
+        if wire_type == _VARINT:
+            value, pos = _varint(buf, pos)
+        elif wire_type == _LENGTH_DELIMITED:
+            length, pos = _varint(buf, pos)
+            value = buf[pos : pos + length]
+            pos += length
+        elif wire_type == _FIXED64:
+            value = buf[pos : pos + 8]
+            pos += 8
+        elif wire_type == _FIXED32:
+            value = buf[pos : pos + 4]
+            pos += 4
+        else:
+            raise Exception(f"Unsupported protobuf wire type {wire_type}")
+        yield number, wire_type, value
+
+
+def _time(buf: memoryview) -> datetime:
+    time = decode(buf, TIME)
+    return datetime.fromtimestamp(
+        time.get("seconds", 0) + time.get("nanos", 0) / 1e9, timezone.utc
+    )
+
+
+def _value(member: Field, value: Any) -> Any:
+    if member.type == "string":
+        return str(value, "utf-8")
+    if member.type == "bytes":
+        return bytes(value)
+    if member.type == "bool":
+        return bool(value)
+    if member.type == "int":
+        # int32 and int64 are two's complement varints
+        return value - (1 << 64) if value >= 1 << 63 else value
+    if member.type == "time":
+        return _time(value)
+    return decode(value, member.message)
+
+
+def decode(buf: bytes | memoryview, message: Message) -> dict:
+    """Decodes the fields of ``message`` in ``buf`` into the JSON shape of
+    the object (camelCase members), leaving out every other field"""
+    decoded: dict[str, Any] = {}
+    for number, _, value in _fields(buf):
+        member = message.get(number)
+        if member is None:
+            continue
+        if member.type == "inline":
+            decoded.update(decode(value, member.message))
+        elif member.type == "map":
+            entry = decode(value, MAP_ENTRY)
+            decoded.setdefault(member.name, {})[entry.get("key", "")] = entry.get(
+                "value", ""
+            )
+        elif member.repeated:
+            decoded.setdefault(member.name, []).append(_value(member, value))
+        else:
+            decoded[member.name] = _value(member, value)
+    return decoded
+
+
+def split_list(body: bytes) -> tuple[dict, list[bytes]]:
+    """The list metadata and the still encoded items of a protobuf list
+    response"""
+    if not body.startswith(MAGIC):
+        raise Exception("Response is not a Kubernetes protobuf message")
+    unknown = decode(memoryview(body)[len(MAGIC) :], UNKNOWN)
+    if unknown.get("contentEncoding"):
+        raise Exception(
+            f"Unsupported protobuf content encoding {unknown['contentEncoding']}"
+        )
+    metadata: dict = {}
+    items = []
+    for number, _, value in _fields(unknown.get("raw", b"")):
+        if number == 1:
+            metadata = decode(value, LIST_META)
+        elif number == 2:
+            items.append(bytes(value))
+    return metadata, items
+
+
+# Field numbers of k8s.io/api and k8s.io/apimachinery generated.proto, only
+# for the members the dump models read
+
+TIME = {1: Field("seconds", "int"), 2: Field("nanos", "int")}
+MAP_ENTRY = {1: Field("key"), 2: Field("value")}
+TYPE_META = {1: Field("apiVersion"), 2: Field("kind")}
+UNKNOWN = {
+    1: Field("typeMeta", "message", TYPE_META),
+    2: Field("raw", "bytes"),
+    3: Field("contentEncoding"),
+    4: Field("contentType"),
+}
+LIST_META = {2: Field("resourceVersion"), 3: Field("continue")}
+
+OWNER_REFERENCE = {
+    1: Field("kind"),
+    3: Field("name"),
+    4: Field("uid"),
+    5: Field("apiVersion"),
+    6: Field("controller", "bool"),
+}
+OBJECT_META = {
+    1: Field("name"),
+    3: Field("namespace"),
+    5: Field("uid"),
+    8: Field("creationTimestamp", "time"),
+    11: Field("labels", "map"),
+    13: Field("ownerReferences", "message", OWNER_REFERENCE, repeated=True),
+}
+
+SECURITY_CONTEXT = {
+    2: Field("privileged", "bool"),
+    7: Field("allowPrivilegeEscalation", "bool"),
+}
+VOLUME_MOUNT = {1: Field("name"), 3: Field("mountPath")}
+CONTAINER = {
+    1: Field("name"),
+    2: Field("image"),
+    9: Field("volumeMounts", "message", VOLUME_MOUNT, repeated=True),
+    15: Field("securityContext", "message", SECURITY_CONTEXT),
+}
+HOST_PATH = {1: Field("path")}
+VOLUME_SOURCE = {1: Field("hostPath", "message", HOST_PATH)}
+VOLUME = {1: Field("name"), 2: Field("volumeSource", "inline", VOLUME_SOURCE)}
+POD_SPEC = {
+    1: Field("volumes", "message", VOLUME, repeated=True),
+    2: Field("containers", "message", CONTAINER, repeated=True),
+    8: Field("serviceAccountName"),
+    10: Field("nodeName"),
+}
+POD = {
+    1: Field("metadata", "message", OBJECT_META),
+    2: Field("spec", "message", POD_SPEC),
+}
+POD_TEMPLATE_SPEC = {
+    1: Field("metadata", "message", OBJECT_META),
+    2: Field("spec", "message", POD_SPEC),
+}
+
+DAEMON_SET = {
+    1: Field("metadata", "message", OBJECT_META),
+    2: Field("spec", "message", {2: Field("template", "message", POD_TEMPLATE_SPEC)}),
+}
+# Deployments, ReplicaSets and StatefulSets share the replicas and template
+# field numbers
+REPLICATED_SPEC = {
+    1: Field("replicas", "int"),
+    3: Field("template", "message", POD_TEMPLATE_SPEC),
+}
+REPLICATED = {
+    1: Field("metadata", "message", OBJECT_META),
+    2: Field("spec", "message", REPLICATED_SPEC),
+}
+DEPLOYMENT = REPLICATED
+REPLICA_SET = REPLICATED
+STATEFUL_SET = REPLICATED
+
+POLICY_RULE = {
+    1: Field("verbs", repeated=True),
+    2: Field("apiGroups", repeated=True),
+    3: Field("resources", repeated=True),
+    4: Field("resourceNames", repeated=True),
+}
+ROLE = {
+    1: Field("metadata", "message", OBJECT_META),
+    2: Field("rules", "message", POLICY_RULE, repeated=True),
+}
+CLUSTER_ROLE = ROLE
+SUBJECT = {
+    1: Field("kind"),
+    2: Field("apiGroup"),
+    3: Field("name"),
+    4: Field("namespace"),
+}
+ROLE_REF = {1: Field("apiGroup"), 2: Field("kind"), 3: Field("name")}
+ROLE_BINDING = {
+    1: Field("metadata", "message", OBJECT_META),
+    2: Field("subjects", "message", SUBJECT, repeated=True),
+    3: Field("roleRef", "message", ROLE_REF),
+}
+CLUSTER_ROLE_BINDING = ROLE_BINDING
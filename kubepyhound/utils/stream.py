@@ -0,0 +1,186 @@
+import json
+import re
+from collections import defaultdict
+from typing import Iterable, Iterator
+
+CHUNK_SIZE = 64 * 1024
+
+# Brackets change the nesting depth; strings are matched as a whole so that
+# brackets inside them are skipped. A string without its closing quote (the
+# group, as an escaped quote can end the buffer too) is still matched, up to
+# the end of the buffer, and marks an incomplete read.
+_TOKEN = re.compile(rb'[\[\]{}]|"[^"\\]*(?:\\.[^"\\]*)*("?)')
+_KEY = re.compile(rb"\s*:")
+_COMMA = re.compile(rb"\s*,")
+_DECODER = json.JSONDecoder()
+
+_OPEN = b"{["
+_QUOTE = ord('"')
+_BRACKET = ord("[")
+
+
+def _value_end(buf: bytearray, start: int) -> int | None:
+    """End of the JSON value at ``start``, found by the C decoder instead of
+    tokenizing it. None when the value is not complete yet."""
+    try:
+        text = buf[start:].decode()
+        end = _DECODER.raw_decode(text)[1]
+    except ValueError:
+        return None
+    return start + len(text[:end].encode())
+
+
+def _cut(item: bytes, spans: list[tuple[int, int]]) -> bytes:
+    """Remove the ``spans`` (members, from their key to the end of their
+    value) from ``item`` together with the comma that separates them"""
+    pruned = bytearray()
+    kept_from = 0
+    for start, end in spans:
+        # Take the comma before the member, or the one after it when the
+        # member comes first or that comma was removed already
+        before = item[kept_from:start].rstrip()
+        if before.endswith(b","):
+            start = kept_from + len(before) - 1
+        elif comma := _COMMA.match(item, end):
+            end = comma.end()
+        pruned += item[kept_from:start]
+        kept_from = end
+    pruned += item[kept_from:]
+    return bytes(pruned)
+
+
+class ListItemStream:
+    """Split a Kubernetes list response into its items while it is read.
+
+    Iterating yields the raw JSON of every element of the top-level
+    ``items`` array as soon as it is complete, so only one item has to be
+    buffered at a time. Everything else (kind, apiVersion, metadata) is
+    collected into ``envelope``, a JSON document with an empty ``items``
+    array that can be parsed once iteration has finished.
+
+    ``prune`` lists members that are cut out of every item, either of the
+    item itself (``status``) or of one of its objects
+    (``metadata.managedFields``). Only object and array values are pruned;
+    they are skipped by the C JSON decoder, which is far cheaper than
+    tokenizing bulk such as managedFields only to throw it away later.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], prune: Iterable[str] = ()):
+        self._chunks = chunks
+        self._envelope = bytearray()
+        self._prune: defaultdict[bytes, set[bytes]] = defaultdict(set)
+        for path in prune:
+            parent, _, name = path.encode().rpartition(b".")
+            self._prune[parent].add(name)
+
+    @property
+    def envelope(self) -> bytes:
+        return bytes(self._envelope)
+
+    def __iter__(self) -> Iterator[bytes]:
+        buf = bytearray()
+        pos = 0
+        copied = 0
+        depth = 0
+        last_string = b""
+        in_items = False
+        item_start = -1
+        # Keys of the current member of the item and of its object value
+        keys: dict[int, tuple[bytes, int]] = {}
+        spans: list[tuple[int, int]] = []
+        resume_at = 0
+
+        chunks = iter(self._chunks)
+        done = False
+        while not done:
+            chunk = next(chunks, None)
+            if chunk is None:
+                done = True
+            else:
+                buf += chunk
+                if len(buf) < resume_at:
+                    # Waiting for the rest of a pruned value
+                    continue
+            resume_at = 0
+
+            scanning = True
+            while scanning:
+                scanning = False
+                for match in _TOKEN.finditer(buf, pos):
+                    token = match.group()
+                    if token[0] == _QUOTE:
+                        if not match.group(1):
+                            # The string continues in the next chunk
+                            break
+                        if depth == 1:
+                            last_string = token[1:-1]
+                        elif in_items and self._prune and depth in (3, 4):
+                            if match.end() == len(buf) and not done:
+                                # Whether it is a key depends on the next chunk
+                                break
+                            if _KEY.match(buf, match.end()):
+                                keys[depth] = (token[1:-1], match.start())
+                    elif token[0] in _OPEN:
+                        depth += 1
+                        if (
+                            depth == 2
+                            and token[0] == _BRACKET
+                            and last_string == b"items"
+                        ):
+                            in_items = True
+                            self._envelope += buf[copied : match.end()]
+                        elif in_items and depth == 3:
+                            item_start = match.start()
+                        elif in_items and depth in (4, 5) and self._prune:
+                            key = (
+                                keys.pop(depth - 1, None) if depth == 5 else keys.get(3)
+                            )
+                            keys.pop(4, None)
+                            parent = keys[3][0] if depth == 5 and 3 in keys else b""
+                            if key and key[0] in self._prune.get(parent, ()):
+                                end = _value_end(buf, match.start())
+                                depth -= 1
+                                if end is None:
+                                    # Decode it once more data has arrived
+                                    if depth == 4:
+                                        keys[4] = key
+                                    if not done:
+                                        resume_at = 2 * len(buf) - key[1]
+                                    break
+                                spans.append((key[1] - item_start, end - item_start))
+                                pos = end
+                                scanning = True
+                                break
+                    else:
+                        depth -= 1
+                        if in_items and depth == 2:
+                            item = bytes(buf[item_start : match.end()])
+                            yield _cut(item, spans) if spans else item
+                            item_start = -1
+                            keys.clear()
+                            spans = []
+                        elif in_items and depth == 1:
+                            in_items = False
+                            copied = match.start()
+                    pos = match.end()
+                else:
+                    pos = len(buf)
+
+            # Drop everything that has been yielded or copied to the envelope
+            keep_from = item_start if item_start >= 0 else pos
+            if not in_items:
+                self._envelope += buf[copied:keep_from]
+            del buf[:keep_from]
+            pos -= keep_from
+            if item_start >= 0:
+                item_start -= keep_from
+            keys = {
+                level: (key, key_start - keep_from)
+                for level, (key, key_start) in keys.items()
+            }
+            if resume_at:
+                resume_at -= keep_from
+            copied = 0
+
+        if not in_items:
+            self._envelope += buf[copied:]
@@ -0,0 +1,229 @@
+import glob
+import json
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from duckdb import DuckDBPyConnection
+
+TABLES_PATH = Path(__file__).parent.parent / "duckdb" / "tables"
+DATABASE = "k8s.duckdb"
+# DuckDB decompresses .gz and .zst files based on their extension
+SOURCE_EXTENSIONS = tuple(
+    f"{extension}{suffix}"
+    for extension in ("json", "ndjson")
+    for suffix in ("", ".gz", ".zst")
+)
+DEFAULT_BATCH_SIZE = 5000
+
+_TABLE_SQL = re.compile(
+    r"\s*CREATE OR REPLACE TABLE (?P<name>\w+) AS SELECT \* FROM read_json\(\s*"
+    r"(?P<sources>\[.*?\]|'[^']*')\s*,\s*columns\s*=\s*(?P<columns>\{.*\})\s*\)\s*;?\s*",
+    re.DOTALL,
+)
+_SOURCE = re.compile(r"'output/([^']+)\.json'")
+
+
+def _quote(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _quote_identifier(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+def _glob_regex(pattern: str) -> re.Pattern:
+    regex = ""
+    for part in re.split(r"(\*\*/|\*|\?)", pattern):
+        if part == "**/":
+            regex += "(?:.*/)?"
+        elif part == "*":
+            regex += "[^/]*"
+        elif part == "?":
+            regex += "[^/]"
+        else:
+            regex += re.escape(part)
+    return re.compile(regex)
+
+
+@dataclass
+class TableDefinition:
+    """A table from ``kubepyhound/duckdb/tables``, with its sources relative to
+    the dump directory so it can be loaded from any dump format"""
+
+    name: str
+    sources: list[str]
+    columns: str
+
+    @classmethod
+    def from_sql(cls, sql: str) -> "TableDefinition | None":
+        match = _TABLE_SQL.fullmatch(sql)
+        if not match:
+            return None
+        return cls(
+            name=match["name"],
+            sources=_SOURCE.findall(match["sources"]),
+            columns=match["columns"],
+        )
+
+    def matches(self, relative_path: str) -> bool:
+        """Whether an object stored at ``relative_path`` (relative to the dump
+        directory, without extension) is one of this table's sources"""
+        return any(
+            _glob_regex(source).fullmatch(relative_path) for source in self.sources
+        )
+
+    def column_types(self, con: DuckDBPyConnection) -> dict[str, str]:
+        return con.execute(f"SELECT {self.columns}").fetchone()[0]
+
+    def create_empty(self, con: DuckDBPyConnection) -> None:
+        columns = ", ".join(
+            f"{_quote_identifier(column)} {column_type}"
+            for column, column_type in self.column_types(con).items()
+        )
+        con.execute(f"CREATE OR REPLACE TABLE {self.name} ({columns})")
+
+    def source_files(self, input_dir: Path) -> list[str]:
+        patterns = []
+        for source in self.sources:
+            for extension in SOURCE_EXTENSIONS:
+                pattern = f"{input_dir}/{source}.{extension}"
+                if glob.glob(pattern, recursive=True):
+                    patterns.append(pattern)
+        return patterns
+
+    def load(
+        self, con: DuckDBPyConnection, input_dir: Path, use_parquet: bool = True
+    ) -> None:
+        parquet_file = input_dir / f"{self.name}.parquet"
+        if use_parquet and parquet_file.exists():
+            con.execute(
+                f"CREATE OR REPLACE TABLE {self.name} AS "
+                f"SELECT * FROM read_parquet({_quote(str(parquet_file))})"
+            )
+            return
+
+        patterns = self.source_files(input_dir)
+        if not patterns:
+            # Nothing was collected for this table, lookups simply find no rows
+            self.create_empty(con)
+            return
+
+        sources = ", ".join(_quote(pattern) for pattern in patterns)
+        con.execute(
+            f"CREATE OR REPLACE TABLE {self.name} AS "
+            f"SELECT * FROM read_json([{sources}], columns = {self.columns})"
+        )
+
+    def export_parquet(self, con: DuckDBPyConnection, input_dir: Path) -> Path:
+        self.load(con, input_dir, use_parquet=False)
+        parquet_file = input_dir / f"{self.name}.parquet"
+        con.execute(
+            f"COPY {self.name} TO {_quote(str(parquet_file))} "
+            "(FORMAT parquet, COMPRESSION zstd)"
+        )
+        return parquet_file
+
+
+def load_tables(
+    con: DuckDBPyConnection, input_dir: Path, queries_path: Path = TABLES_PATH
+) -> None:
+    """Builds every table from the dump in ``input_dir``. Tables that were
+    exported to ``<table>.parquet`` are read from there, others straight from
+    the JSON or NDJSON files. Queries that are not table definitions run as-is"""
+    for query in sorted(glob.glob(f"{queries_path}/*.sql")):
+        with open(query, "r") as query_file:
+            sql_content = query_file.read()
+        definition = TableDefinition.from_sql(sql_content)
+        if definition is None:
+            con.execute(sql_content)
+        else:
+            definition.load(con, Path(input_dir))
+
+
+def table_definitions(queries_path: Path = TABLES_PATH) -> list[TableDefinition]:
+    definitions = []
+    for query in sorted(glob.glob(f"{queries_path}/*.sql")):
+        with open(query, "r") as query_file:
+            definition = TableDefinition.from_sql(query_file.read())
+        if definition is not None:
+            definitions.append(definition)
+    return definitions
+
+
+def has_parquet_tables(input_dir: Path) -> bool:
+    return any(
+        (Path(input_dir) / f"{definition.name}.parquet").exists()
+        for definition in table_definitions()
+    )
+
+
+class TableWriter:
+    """Appends dumped objects to the matching DuckDB tables while collecting.
+
+    Tables start out with whatever was already dumped to ``input_dir``. Each
+    object is routed to every table whose sources include its path and is
+    inserted in batches of ``batch_size`` documents, which DuckDB converts
+    to the table columns the same way ``read_json`` does for the files.
+    """
+
+    def __init__(
+        self,
+        con: DuckDBPyConnection,
+        input_dir: Path,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        queries_path: Path = TABLES_PATH,
+    ):
+        self.con = con
+        self.input_dir = Path(input_dir)
+        self.batch_size = batch_size
+        self.definitions = table_definitions(queries_path)
+        load_tables(con, input_dir, queries_path)
+        # json_transform skips unknown keys and leaves missing ones NULL
+        self._structures = {
+            definition.name: json.dumps(definition.column_types(con))
+            for definition in self.definitions
+        }
+        self._routes: dict[str, list[str]] = {}
+        self._batches: defaultdict[str, list[str]] = defaultdict(list)
+
+    def append(self, relative_dir: str, name: str, document: str) -> None:
+        tables = self._routes.get(relative_dir)
+        if tables is None:
+            # Routing only depends on the directory, not on the object name
+            tables = self._routes[relative_dir] = [
+                definition.name
+                for definition in self.definitions
+                if definition.matches(f"{relative_dir}/{name}")
+            ]
+        for table in tables:
+            batch = self._batches[table]
+            batch.append(document)
+            if len(batch) >= self.batch_size:
+                self._flush_table(table)
+
+    def flush(self) -> None:
+        for table in list(self._batches):
+            self._flush_table(table)
+
+    def reload(self, relative_dir: str) -> None:
+        """Loads the tables that objects in ``relative_dir`` are appended to
+        again from ``input_dir``, after objects were taken out of its files.
+        Every object appended so far must be in the files"""
+        for definition in self.definitions:
+            if definition.matches(f"{relative_dir}/part-00000"):
+                # The batch is in the files, or was taken out of them
+                self._batches.pop(definition.name, None)
+                definition.load(self.con, self.input_dir, use_parquet=False)
+
+    def _flush_table(self, table: str) -> None:
+        batch = self._batches.pop(table, None)
+        if not batch:
+            return
+        # A single newline separated parameter binds far faster than a list
+        self.con.execute(
+            f"INSERT INTO {table} BY NAME "
+            "SELECT unnest(json_transform(document, ?)) "
+            "FROM (SELECT unnest(string_split(?, chr(10))) AS document)",
+            [self._structures[table], "\n".join(batch)],
+        )
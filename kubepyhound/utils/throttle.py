@@ -0,0 +1,136 @@
+import random
+import socket
+import threading
+import time
+from kubernetes import client
+from kubernetes.client.exceptions import ApiException
+from urllib3.connection import HTTPConnection
+
+DEFAULT_QPS = 50.0
+DEFAULT_BURST = 100
+DEFAULT_RETRIES = 5
+DEFAULT_POOL_SIZE = 32
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_METHODS = ("GET", "HEAD")
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+# Sent by API Priority and Fairness with every response it handled
+PRIORITY_LEVEL_HEADER = "X-Kubernetes-PF-PriorityLevel-UID"
+
+
+class RateLimiter:
+    """Token bucket shared by every API request of the process.
+
+    At most ``qps`` requests start per second after an initial ``burst``,
+    ``qps`` 0 disables the bucket. The number of requests waiting for a
+    response is capped as well: the cap halves whenever API Priority and
+    Fairness rejects a request and grows back by one per round of successful
+    requests, so concurrent collectors back off together.
+    """
+
+    def __init__(self, qps: float = DEFAULT_QPS, burst: int = DEFAULT_BURST):
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self.configure(qps, burst)
+
+    def configure(self, qps: float, burst: int) -> None:
+        with self._condition:
+            self.qps = qps
+            self.burst = max(burst, 1)
+            self._tokens = float(self.burst)
+            self._updated = time.monotonic()
+            self._limit = float(self.burst)
+            self._condition.notify_all()
+
+    def acquire(self) -> None:
+        with self._condition:
+            while True:
+                wait = None
+                if self._in_flight < int(self._limit):
+                    if self.qps <= 0:
+                        break
+                    now = time.monotonic()
+                    self._tokens = min(
+                        self.burst, self._tokens + (now - self._updated) * self.qps
+                    )
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    wait = (1 - self._tokens) / self.qps
+                self._condition.wait(wait)
+            self._in_flight += 1
+
+    def release(self, rejected: bool = False) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            if rejected:
+                self._limit = max(1.0, self._limit / 2)
+            else:
+                self._limit = min(float(self.burst), self._limit + 1 / self._limit)
+            self._condition.notify_all()
+
+
+def retry_delay(e: ApiException, attempt: int) -> float:
+    """The delay the API server asked for with Retry-After, or an exponential
+    backoff with jitter"""
+    retry_after = (e.headers or {}).get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), BACKOFF_MAX)
+    delay = min(BACKOFF_BASE * 2**attempt, BACKOFF_MAX)
+    return delay + random.uniform(0, delay / 2)
+
+
+class ThrottledApiClient(client.ApiClient):
+    """ApiClient that passes every request through ``limiter`` and retries
+    reads that were throttled (429) or failed on the server side (5xx).
+
+    Up to ``pool_size`` connections to the API server are kept alive for
+    concurrent requests, and with ``gzip`` responses are requested
+    compressed; urllib3 decompresses them, streamed responses included.
+    """
+
+    def __init__(
+        self,
+        limiter: RateLimiter,
+        retries: int = DEFAULT_RETRIES,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        gzip: bool = True,
+    ):
+        configuration = client.Configuration.get_default_copy()
+        configuration.connection_pool_maxsize = pool_size
+        super().__init__(configuration)
+        self.limiter = limiter
+        self.retries = retries
+        # Idle connections are probed rather than silently dropped by NATs
+        self.rest_client.pool_manager.connection_pool_kw["socket_options"] = [
+            *HTTPConnection.default_socket_options,
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        ]
+        if gzip:
+            self.set_default_header("Accept-Encoding", "gzip")
+
+    def request(self, method, url, *args, **kwargs):
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            rejected = False
+            try:
+                return super().request(method, url, *args, **kwargs)
+            except ApiException as e:
+                # A 429 from API Priority and Fairness means the priority
+                # level is saturated, not just that this request was unlucky
+                rejected = e.status == 429 and PRIORITY_LEVEL_HEADER in (
+                    e.headers or {}
+                )
+                if (
+                    attempt == self.retries
+                    or method not in RETRY_METHODS
+                    or e.status not in RETRY_STATUSES
+                ):
+                    raise
+                delay = retry_delay(e, attempt)
+            finally:
+                self.limiter.release(rejected)
+            time.sleep(delay)
+            attempt += 1
@@ -0,0 +1,136 @@
+import json
+from typing import Any
+
+import pytest
+
+
+class ListResponse:
+    """The response of a list call made with ``_preload_content=False``"""
+
+    def __init__(self, document: Any, content_type: str = "application/json"):
+        self.data = json.dumps(document).encode()
+        self.headers = {"Content-Type": content_type}
+        self.released = False
+
+    def stream(self, amt=None, decode_content=True):
+        yield self.data
+
+    def release_conn(self):
+        self.released = True
+
+
+def matches_fields(item: dict, field_selector: str | None) -> bool:
+    for requirement in (field_selector or "").split(","):
+        if not requirement:
+            continue
+        negated = "!=" in requirement
+        path, value = requirement.replace("!=", "=").replace("==", "=").split("=")
+        member = item
+        for key in path.split("."):
+            member = (member or {}).get(key)
+        if (str(member) == value) == negated:
+            return False
+    return True
+
+
+class FakeList:
+    """A list call of the API server over ``items``, returning ``limit`` items
+    per page with the offset of the next page as continue token. Namespaces
+    and field selectors are applied; a request whose number is in
+    ``failures`` raises that exception instead"""
+
+    def __init__(self, items: list[dict], resource_version: str = "10"):
+        self.items = items
+        self.resource_version = resource_version
+        self.failures: dict[int, Exception] = {}
+        self.calls: list[dict] = []
+
+    def __call__(self, limit=None, _continue=None, _preload_content=True, **kwargs):
+        self.calls.append({"limit": limit, "_continue": _continue, **kwargs})
+        if len(self.calls) in self.failures:
+            raise self.failures[len(self.calls)]
+        items = [
+            item
+            for item in self.items
+            if kwargs.get("namespace") in (None, item["metadata"].get("namespace"))
+            and matches_fields(item, kwargs.get("field_selector"))
+        ]
+        start = int(_continue or 0)
+        end = start + limit if limit else len(items)
+        metadata = {"resourceVersion": self.resource_version}
+        if end < len(items):
+            metadata["continue"] = str(end)
+        return ListResponse(
+            {
+                "kind": "List",
+                "apiVersion": "v1",
+                "metadata": metadata,
+                "items": items[start:end],
+            }
+        )
+
+
+@pytest.fixture
+def fake_list():
+    return FakeList
+
+
+@pytest.fixture
+def list_response():
+    return ListResponse
+
+
+class FakeApiClient:
+    """Answers ``call_api`` with the route of the requested path, called with
+    the query parameters and headers of the request"""
+
+    def __init__(self, routes: dict[str, Any]):
+        self.routes = routes
+        self.calls: list[tuple[str, dict, dict]] = []
+
+    def call_api(self, path, method, query_params=None, header_params=None, **kwargs):
+        query = dict(query_params or [])
+        self.calls.append((path, query, header_params or {}))
+        return self.routes[path](query, header_params or {})
+
+
+@pytest.fixture
+def fake_api_client():
+    return FakeApiClient
+
+
+def role_object(name: str, namespace: str | None = "default") -> dict:
+    metadata = {
+        "name": name,
+        "uid": name,
+        "creationTimestamp": "2024-01-01T00:00:00Z",
+    }
+    if namespace:
+        metadata["namespace"] = namespace
+    return {
+        "metadata": metadata,
+        "rules": [{"apiGroups": [""], "resources": ["pods"], "verbs": ["get"]}],
+    }
+
+
+@pytest.fixture
+def roles():
+    """Role objects as the API server lists them"""
+    return role_object
+
+
+@pytest.fixture
+def run_dump(monkeypatch):
+    """Invokes the dump app with ``args`` without a cluster: no kubeconfig is
+    loaded and the shared API client is left alone"""
+    from typer.testing import CliRunner
+
+    from kubepyhound import dump
+
+    monkeypatch.setattr(dump.config, "load_kube_config", lambda context=None: None)
+    monkeypatch.setattr(dump, "configure_client", lambda *args: None)
+
+    def run(*args: str):
+        return CliRunner().invoke(dump.dump_app, list(args), standalone_mode=False)
+
+    return run
@@ -0,0 +1,21 @@
+from kubepyhound.utils.checkpoint import Checkpoint
+
+
+def test_before_save_runs_with_every_save(tmp_path):
+    saved = []
+
+    def before_save(state):
+        saved.append(dict(state))
+        state["flushed"] = len(saved)
+
+    checkpoint = Checkpoint(tmp_path / "checkpoint.json", before_save=before_save)
+    assert not checkpoint.restored
+    checkpoint.update("a", 1)
+    # Within the save interval
+    checkpoint.update("b", 2)
+    checkpoint.save()
+
+    assert saved == [{"a": 1}, {"a": 1, "b": 2, "flushed": 1}]
+    restored = Checkpoint(tmp_path / "checkpoint.json")
+    assert restored.restored
+    assert restored.state == {"a": 1, "b": 2, "flushed": 2}
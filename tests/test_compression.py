@@ -0,0 +1,62 @@
+import pytest
+
+from kubepyhound.models.k8s.role import Role
+from kubepyhound.utils import helpers
+from kubepyhound.utils.helpers import (
+    DumpClient,
+    dump_files,
+    load_objects,
+    open_dump_file,
+)
+
+
+def role(name: str) -> Role:
+    return Role.model_validate(
+        {
+            "metadata": {
+                "name": name,
+                "namespace": "default",
+                "uid": name,
+                "creationTimestamp": "2024-01-01T00:00:00Z",
+            },
+            "rules": [{"apiGroups": [""], "resources": ["pods"], "verbs": ["get"]}],
+        }
+    )
+
+
+def names(pattern: str) -> list[str]:
+    return sorted(
+        resource_object["metadata"]["name"]
+        for path in dump_files(pattern)
+        for resource_object in load_objects(path)
+    )
+
+
+@pytest.mark.parametrize("compression, suffix", [("gzip", ".gz"), ("zstd", ".zst")])
+@pytest.mark.parametrize("mode", ["simple", "ndjson"])
+def test_compressed_dumps_read_like_plain_ones(tmp_path, mode, compression, suffix):
+    # Two runs append to the same segments
+    for names_written in (["a", "b"], ["c"]):
+        dump_client = DumpClient(tmp_path, mode, compression=compression)
+        for name in names_written:
+            dump_client.write(role(name), name=name, resource="roles", namespace="x")
+        dump_client.close()
+
+    directory = tmp_path / "namespaces" / "x" / "roles"
+    assert all(path.name.endswith(suffix) for path in directory.iterdir())
+    assert names(f"{tmp_path}/namespaces/**/roles/*") == ["a", "b", "c"]
+
+
+def test_plain_files(tmp_path):
+    path = tmp_path / "plain.ndjson"
+    with open_dump_file(path, "wb") as plain:
+        plain.write(b'{"metadata": {"name": "a"}}\n')
+
+    assert [o["metadata"]["name"] for o in load_objects(str(path))] == ["a"]
+
+
+def test_zstd_without_zstandard(tmp_path, monkeypatch):
+    monkeypatch.setattr(helpers, "zstandard", None)
+
+    with pytest.raises(Exception, match="requires the zstandard package"):
+        open_dump_file(tmp_path / "part-00000.ndjson.zst", "wb")
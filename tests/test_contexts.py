@@ -0,0 +1,70 @@
+from pathlib import Path
+
+import pytest
+import typer
+
+from kubepyhound import dump
+from kubepyhound.dump import CLUSTER_LOG, collect_context
+
+
+@pytest.fixture
+def dump_calls(tmp_path, monkeypatch):
+    """Replaces the dump app with one that records the calls of its callback
+    and of `dump all`, which fails with the given --error"""
+    # collect_context changes the working directory of its worker process
+    monkeypatch.chdir(tmp_path)
+    calls = []
+    app = typer.Typer()
+
+    @app.callback()
+    def callback(
+        ctx: typer.Context,
+        output_dir: Path = Path("output"),
+        context: str | None = None,
+        page_size: int = 500,
+    ):
+        ctx.obj = {"output_dir": output_dir, "context": context}
+        calls.append(("dump", page_size))
+        print("configured")
+
+    @app.command("all")
+    def collect_all(ctx: typer.Context, error: str | None = None):
+        calls.append(("all", ctx.obj, Path.cwd()))
+        if error:
+            raise Exception(error)
+        return 42
+
+    monkeypatch.setattr(dump, "dump_app", app)
+    return calls
+
+
+def test_collect_context(tmp_path, dump_calls):
+    output_dir = tmp_path / "prod"
+
+    resource_count, elapsed, error = collect_context(
+        "prod-eu",
+        output_dir,
+        {"output_dir": tmp_path, "context": None, "page_size": 5},
+        {"error": None},
+    )
+
+    assert (resource_count, error) == (42, None)
+    assert elapsed >= 0
+    assert dump_calls == [
+        ("dump", 5),
+        ("all", {"output_dir": output_dir, "context": "prod-eu"}, output_dir),
+    ]
+    assert Path.cwd() == output_dir
+    assert (output_dir / CLUSTER_LOG).read_text() == "configured\n"
+
+
+def test_collect_context_reports_failures(tmp_path, dump_calls):
+    output_dir = tmp_path / "prod"
+
+    resource_count, _, error = collect_context(
+        "prod-eu", output_dir, {"output_dir": tmp_path}, {"error": "token expired"}
+    )
+
+    assert (resource_count, error) == (0, "token expired")
+    log = (output_dir / CLUSTER_LOG).read_text()
+    assert "Traceback" in log and "token expired" in log
@@ -0,0 +1,160 @@
+import pytest
+from kubernetes.client.exceptions import ApiException
+
+from kubepyhound.utils.discovery import DISCOVERY_ACCEPT, DiscoveryCatalog
+
+AGGREGATED = "application/json;g=apidiscovery.k8s.io;v=v2;as=APIGroupDiscoveryList"
+
+
+@pytest.fixture
+def aggregated_route(list_response):
+    return lambda document: lambda query, headers: list_response(document, AGGREGATED)
+
+
+@pytest.fixture
+def legacy_route(list_response):
+    return lambda document: lambda query, headers: list_response(document)
+
+
+def pod_resources() -> dict:
+    return {
+        "resource": "pods",
+        "responseKind": {"version": "v1", "kind": "Pod"},
+        "scope": "Namespaced",
+        "singularResource": "pod",
+        "verbs": ["get", "list", "watch"],
+        "subresources": [
+            {
+                "subresource": "status",
+                "responseKind": {"version": "v1", "kind": "Pod"},
+                "verbs": ["get"],
+            }
+        ],
+    }
+
+
+def test_fetch_aggregated_discovery(fake_api_client, aggregated_route):
+    core = {
+        "items": [{"versions": [{"version": "v1", "resources": [pod_resources()]}]}]
+    }
+    groups = {
+        "items": [
+            {
+                "metadata": {"name": "rbac.authorization.k8s.io"},
+                "versions": [
+                    {
+                        "version": "v1",
+                        "resources": [
+                            {
+                                "resource": "roles",
+                                "responseKind": {"kind": "Role"},
+                                "scope": "Namespaced",
+                                "verbs": ["list"],
+                            }
+                        ],
+                    },
+                    {"version": "v1beta1"},
+                ],
+            }
+        ]
+    }
+    api_client = fake_api_client(
+        {"/api": aggregated_route(core), "/apis": aggregated_route(groups)}
+    )
+
+    catalog = DiscoveryCatalog.fetch(api_client)
+
+    # Both root documents hold every resource, no group version is requested
+    assert [path for path, _, _ in api_client.calls] == ["/api", "/apis"]
+    assert all(
+        headers["Accept"] == DISCOVERY_ACCEPT for _, _, headers in api_client.calls
+    )
+    assert [(r.group_version, r.definition.name) for r in catalog.all_resources()] == [
+        ("v1", "pods"),
+        ("v1", "pods/status"),
+        ("rbac.authorization.k8s.io/v1", "roles"),
+    ]
+    pods, status, roles = catalog.all_resources()
+    assert (pods.definition.kind, pods.definition.namespaced) == ("Pod", True)
+    assert status.is_subresource
+    assert roles.path("default") == (
+        "/apis/rbac.authorization.k8s.io/v1/namespaces/default/roles"
+    )
+    [rbac] = catalog.groups
+    assert rbac.preferred_version.group_version == "rbac.authorization.k8s.io/v1"
+    assert [version.version for version in rbac.versions] == ["v1", "v1beta1"]
+
+
+def test_fetch_falls_back_to_legacy_discovery(fake_api_client, legacy_route):
+    group_version = {
+        "groupVersion": "rbac.authorization.k8s.io/v1",
+        "version": "v1",
+    }
+    api_client = fake_api_client(
+        {
+            "/api": legacy_route({"versions": ["v1"]}),
+            "/api/v1": legacy_route(
+                {
+                    "resources": [
+                        {
+                            "name": "pods",
+                            "kind": "Pod",
+                            "singularName": "pod",
+                            "namespaced": True,
+                            "verbs": ["list"],
+                        }
+                    ]
+                }
+            ),
+            "/apis": legacy_route(
+                {
+                    "groups": [
+                        {
+                            "name": "rbac.authorization.k8s.io",
+                            "versions": [group_version],
+                            "preferredVersion": group_version,
+                        }
+                    ]
+                }
+            ),
+            "/apis/rbac.authorization.k8s.io/v1": legacy_route(
+                {
+                    "resources": [
+                        {
+                            "name": "roles",
+                            "kind": "Role",
+                            "singularName": "role",
+                            "namespaced": True,
+                            "verbs": ["list"],
+                        }
+                    ]
+                }
+            ),
+        }
+    )
+
+    catalog = DiscoveryCatalog.fetch(api_client)
+
+    assert [path for path, _, _ in api_client.calls] == [
+        "/api",
+        "/api/v1",
+        "/apis",
+        "/apis/rbac.authorization.k8s.io/v1",
+    ]
+    assert [(r.group_version, r.definition.kind) for r in catalog.all_resources()] == [
+        ("v1", "Pod"),
+        ("rbac.authorization.k8s.io/v1", "Role"),
+    ]
+    assert [group.name for group in catalog.groups] == ["rbac.authorization.k8s.io"]
+    assert set(catalog.documents) == set(api_client.routes)
+
+
+def test_fetch_raises_api_errors(fake_api_client):
+    def forbidden(query, headers):
+        raise ApiException(status=403, reason="Forbidden")
+
+    api_client = fake_api_client({"/api": forbidden})
+
+    with pytest.raises(ApiException) as excinfo:
+        DiscoveryCatalog.fetch(api_client)
+    assert excinfo.value.status == 403
@@ -0,0 +1,84 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from kubepyhound import dump
+
+COLLECTORS = [
+    "cluster",
+    "namespaces",
+    "nodes",
+    "pods",
+    "roles",
+    "role_bindings",
+    "cluster_roles",
+    "cluster_role_bindings",
+    "service_accounts",
+    "statefulsets",
+    "replicasets",
+    "daemonsets",
+    "deployments",
+    "services",
+    "resource_definitions",
+    "custom_resource_definitions",
+    "generic",
+]
+
+
+@pytest.fixture
+def collectors(monkeypatch):
+    """Replaces the collectors of `dump all` and bootstrap with stubs that
+    record the order they finished in. Collectors wait for each other on
+    ``barrier`` when it is set, and the ``failing`` one raises"""
+    state = SimpleNamespace(finished=[], barrier=None, failing=None)
+    lock = threading.Lock()
+
+    def stub(name):
+        @dump.progress_handler(name)
+        def collector(ctx):
+            if state.barrier:
+                state.barrier.wait()
+            if name == state.failing:
+                raise Exception(f"Listing {name} failed")
+            with lock:
+                state.finished.append(name)
+            return 2
+
+        return collector
+
+    for name in COLLECTORS:
+        monkeypatch.setattr(dump, name, stub(name))
+    monkeypatch.setattr(dump, "bootstrap", lambda ctx: state.finished.append("db"))
+    return state
+
+
+def test_collectors_run_one_after_another(tmp_path, run_dump, collectors):
+    result = run_dump(str(tmp_path), "all")
+
+    assert result.exit_code == 0, result.output
+    assert result.return_value == 2 * len(COLLECTORS)
+    assert collectors.finished == [*COLLECTORS, "db"]
+
+
+def test_workers_run_collectors_concurrently(tmp_path, run_dump, collectors):
+    # Only passed once every collector is running at the same time
+    collectors.barrier = threading.Barrier(len(COLLECTORS), timeout=10)
+
+    result = run_dump(str(tmp_path), "all", "--workers", str(len(COLLECTORS)))
+
+    assert result.exit_code == 0, result.output
+    assert result.return_value == 2 * len(COLLECTORS)
+    # The database is built once every collector has finished writing
+    assert sorted(collectors.finished[:-1]) == sorted(COLLECTORS)
+    assert collectors.finished[-1] == "db"
+
+
+def test_failed_collector_fails_the_dump(tmp_path, run_dump, collectors):
+    collectors.failing = "pods"
+
+    result = run_dump(str(tmp_path), "all", "--workers", "4")
+
+    assert str(result.exception) == "Listing pods failed"
+    assert "pods" not in collectors.finished
+    assert "db" not in collectors.finished
@@ -0,0 +1,145 @@
+import threading
+from types import SimpleNamespace
+
+from kubernetes.client.exceptions import ApiException
+
+from kubepyhound import dump
+from kubepyhound.dump import METADATA_ONLY, Selection, list_unmapped
+from kubepyhound.models.k8s.resource import Resource
+from kubepyhound.utils.discovery import APIResource
+from kubepyhound.utils.helpers import DumpClient, load_objects
+
+WIDGETS = "/apis/example.com/v1/widgets"
+
+
+def api_resource(name: str, kind: str, verbs=("get", "list")) -> APIResource:
+    return APIResource(
+        "example.com",
+        "v1",
+        Resource(
+            name=name,
+            kind=kind,
+            singular_name=kind.lower(),
+            namespaced=True,
+            verbs=list(verbs),
+        ),
+    )
+
+
+def widget(name: str) -> dict:
+    return {
+        "kind": "PartialObjectMetadata",
+        "metadata": {"name": name, "namespace": "shop", "uid": name},
+    }
+
+
+def listing(list_func):
+    """A route answering with the pages of ``list_func``"""
+    return lambda query, headers: list_func(
+        limit=int(query["limit"]), _continue=query.get("continue")
+    )
+
+
+def test_list_unmapped_writes_metadata(tmp_path, fake_list, fake_api_client):
+    widgets = fake_list([widget(name) for name in ("a", "b", "c")])
+    api_client = fake_api_client({WIDGETS: listing(widgets)})
+    dump_client = DumpClient(tmp_path, "ndjson")
+
+    result = list_unmapped(
+        dump_client, api_client, api_resource("widgets", "Widget"), Selection(), 2, 10
+    )
+    dump_client.close()
+
+    assert (result.kind, result.api_version, result.count) == (
+        "Widget",
+        "example.com/v1",
+        3,
+    )
+    assert result.error is None
+    assert all(headers["Accept"] == METADATA_ONLY for _, _, headers in api_client.calls)
+    segment = (
+        tmp_path / "namespaces" / "shop" / "unmapped" / "Widget" / "part-00000.ndjson"
+    )
+    assert [o["kind"] for o in load_objects(str(segment))] == ["Widget"] * 3
+
+
+def test_list_unmapped_records_failures(tmp_path, fake_api_client):
+    def forbidden(query, headers):
+        raise ApiException(status=403, reason="Forbidden")
+
+    result = list_unmapped(
+        DumpClient(tmp_path, "ndjson"),
+        fake_api_client({WIDGETS: forbidden}),
+        api_resource("widgets", "Widget"),
+        Selection(),
+        2,
+        10,
+    )
+
+    assert (result.count, result.error) == (0, "403 Forbidden")
+
+
+def test_list_unmapped_gives_up_after_the_timeout(
+    tmp_path, monkeypatch, fake_list, fake_api_client
+):
+    widgets = fake_list([widget(name) for name in "abcde"])
+    # Every reading of the clock is a second later
+    clock = iter(range(100))
+    monkeypatch.setattr(dump, "time", SimpleNamespace(monotonic=lambda: next(clock)))
+
+    result = list_unmapped(
+        DumpClient(tmp_path, "ndjson"),
+        fake_api_client({WIDGETS: listing(widgets)}),
+        api_resource("widgets", "Widget"),
+        Selection(),
+        2,
+        1,
+    )
+
+    # The second page is already past the deadline, the third never requested
+    assert (result.count, result.error) == (4, "gave up after 1s")
+
+
+def test_generic_lists_kinds_concurrently(
+    tmp_path, monkeypatch, run_dump, fake_list, fake_api_client
+):
+    kinds = ["Widget", "Gadget", "Gizmo", "Doohickey"]
+    # Only passed by two kinds that are listed at the same time
+    barrier = threading.Barrier(2, timeout=10)
+    lock = threading.Lock()
+    in_flight = [0, 0]
+
+    def route(query, headers):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+        barrier.wait()
+        with lock:
+            in_flight[0] -= 1
+        return fake_list([widget("a")])(limit=int(query["limit"]))
+
+    resources = [api_resource(kind.lower() + "s", kind) for kind in kinds] + [
+        # Mapped, a subresource and not listable
+        api_resource("pods", "Pod"),
+        api_resource("widgets/status", "Widget"),
+        api_resource("sprockets", "Sprocket", verbs=("get",)),
+    ]
+    api_client = fake_api_client(
+        {f"/apis/example.com/v1/{kind.lower()}s": route for kind in kinds}
+    )
+    monkeypatch.setattr(dump, "kube_client", lambda: api_client)
+    monkeypatch.setattr(
+        dump,
+        "discovery_catalog",
+        lambda options: SimpleNamespace(all_resources=lambda: resources),
+    )
+
+    result = run_dump(
+        "--format", "ndjson", str(tmp_path), "generic", "--concurrency", "2"
+    )
+
+    assert result.exit_code == 0, result.output
+    assert result.return_value == len(kinds)
+    assert in_flight[1] == 2
+    assert sorted(path for path, _, _ in api_client.calls) == sorted(api_client.routes)
+    assert "failed" not in result.output
@@ -0,0 +1,94 @@
+import duckdb
+import pytest
+
+from kubepyhound.models.k8s.role import Role
+from kubepyhound.utils.helpers import DumpClient
+from kubepyhound.utils.tables import DATABASE
+
+
+def role(name: str, namespace: str = "default") -> Role:
+    return Role.model_validate(
+        {
+            "metadata": {
+                "name": name,
+                "namespace": namespace,
+                "uid": name,
+                "creationTimestamp": "2024-01-01T00:00:00Z",
+            },
+            "rules": [{"apiGroups": [""], "resources": ["pods"], "verbs": ["get"]}],
+        }
+    )
+
+
+@pytest.fixture
+def cwd(tmp_path, monkeypatch):
+    # The database is opened relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_duckdb_client_without_objects_leaves_no_database(cwd):
+    dump_client = DumpClient(cwd / "output", "duckdb")
+    dump_client.close()
+
+    assert not (cwd / DATABASE).exists()
+    assert not dump_client.filled_tables
+
+
+def test_duckdb_client_fills_tables_once(cwd):
+    dump_client = DumpClient(cwd / "output", "duckdb")
+    for name in ("a", "b"):
+        dump_client.write(role(name), name=name, resource="roles", namespace="default")
+    dump_client.close()
+
+    con = duckdb.connect(DATABASE, read_only=True)
+    assert con.execute("SELECT metadata.name FROM roles ORDER BY 1").fetchall() == [
+        ("a",),
+        ("b",),
+    ]
+    con.close()
+
+
+def test_only_derived_objects_are_deduplicated(tmp_path):
+    dump_client = DumpClient(tmp_path, "ndjson")
+    for _ in range(2):
+        dump_client.write(role("a"), name="a", resource="roles", namespace="default")
+        dump_client.write(role("a"), name="a", resource="user")
+    dump_client.close()
+
+    assert dump_client.suppressed == {"user": 1}
+    assert len(dump_client._written) == 1
+    roles = tmp_path / "namespaces" / "default" / "roles" / "part-00000.ndjson"
+    assert len(roles.read_text().splitlines()) == 2
+    assert len((tmp_path / "user" / "part-00000.ndjson").read_text().splitlines()) == 1
+
+
+def test_every_resource_is_deduplicated_when_watching(tmp_path):
+    dump_client = DumpClient(tmp_path, "simple")
+    dump_client.deduplicated = None
+    for _ in range(2):
+        dump_client.write(role("a"), name="a", resource="roles", namespace="default")
+
+    assert dump_client.suppressed == {"roles": 1}
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_roll_back_to_flushed_segments(tmp_path, compression):
+    dump_client = DumpClient(tmp_path, "ndjson", compression=compression)
+    dump_client.write(role("a"), name="a", resource="roles", namespace="default")
+    dump_client.write(role("a"), name="a", resource="user")
+    ends = dump_client.flush()
+    # Written after the checkpoint was saved
+    dump_client.write(role("b"), name="b", resource="roles", namespace="default")
+    dump_client.write(role("c"), name="c", resource="roles", namespace="other")
+    dump_client.close()
+
+    resumed = DumpClient(tmp_path, "ndjson", compression=compression)
+    resumed.roll_back(ends)
+
+    assert resumed.segment_ends() == ends
+    assert resumed.written_objects("roles") == {("default", "a")}
+    assert not list((tmp_path / "namespaces" / "other" / "roles").iterdir())
+    # Derived objects that were kept are not written again
+    resumed.write(role("a"), name="a", resource="user")
+    assert resumed.suppressed == {"user": 1}
@@ -0,0 +1,91 @@
+from dataclasses import replace
+from types import SimpleNamespace
+
+import pytest
+
+from kubepyhound.dump import (
+    COLLECTIONS,
+    METADATA_ONLY,
+    Options,
+    Selection,
+    count_inactive,
+)
+from kubepyhound.models.k8s.skipped import SkippedObjects
+from kubepyhound.utils.helpers import DumpClient
+
+
+def pod(name: str, namespace: str, phase: str, node: str = "node-1") -> dict:
+    return {
+        "metadata": {"name": name, "namespace": namespace, "uid": name},
+        "spec": {"nodeName": node},
+        "status": {"phase": phase},
+    }
+
+
+PODS = [
+    pod("web", "shop", "Running"),
+    pod("job-1", "shop", "Succeeded"),
+    pod("job-2", "shop", "Failed"),
+    pod("job-3", "shop", "Succeeded", node="node-2"),
+    pod("build", "ci", "Failed"),
+]
+
+
+@pytest.fixture
+def pods(fake_list):
+    """The pods collection, counting inactive pods from a list over PODS"""
+    list_func = fake_list(PODS)
+    collection = COLLECTIONS["pods"]()
+    collection.inactive = replace(
+        collection.inactive,
+        counted_resource=SimpleNamespace(list_func=lambda api_client: list_func),
+    )
+    return collection, list_func
+
+
+def count(tmp_path, collection, field_selector=None) -> SkippedObjects:
+    options = Options(
+        client=DumpClient(tmp_path, "ndjson"),
+        page_size=1,
+        selection=Selection(field_selector=field_selector),
+        active_only=True,
+    )
+    skipped = SkippedObjects(resource="pods", reason=collection.inactive.reason)
+    count_inactive(options, collection, skipped)
+    return skipped
+
+
+def test_count_inactive_joins_the_field_selector(tmp_path, pods):
+    collection, list_func = pods
+
+    skipped = count(tmp_path, collection, "spec.nodeName=node-1")
+
+    assert skipped.count == 3
+    assert skipped.namespaces == {"shop": 2, "ci": 1}
+    assert {call["field_selector"] for call in list_func.calls} == {
+        "spec.nodeName=node-1,status.phase=Succeeded",
+        "spec.nodeName=node-1,status.phase=Failed",
+    }
+    # Metadata only, a page at a time
+    assert all(
+        call["header_params"] == {"Accept": METADATA_ONLY} and call["limit"] == 1
+        for call in list_func.calls
+    )
+
+
+def test_count_inactive_leaves_out_unsupported_field_selectors(tmp_path, pods):
+    collection, list_func = pods
+
+    skipped = count(tmp_path, collection, "spec.unschedulable=true")
+
+    assert skipped.namespaces == {"shop": 3, "ci": 1}
+    assert {call["field_selector"] for call in list_func.calls} == {
+        "status.phase=Succeeded",
+        "status.phase=Failed",
+    }
+
+
+def test_collections_without_counted_objects_are_left_alone(tmp_path):
+    collection = COLLECTIONS["replicasets"]()
+
+    assert count(tmp_path, collection).count == 0
@@ -0,0 +1,97 @@
+from kubepyhound.dump import METADATA_ONLY, Selection, list_unmapped
+from kubepyhound.models.k8s.resource import Resource
+from kubepyhound.utils.discovery import APIResource
+from kubepyhound.utils.helpers import DumpClient, load_objects
+
+SECRETS = "/apis/example.com/v1/vaultsecrets"
+RESOURCE = APIResource(
+    "example.com",
+    "v1",
+    Resource(
+        name="vaultsecrets",
+        kind="VaultSecret",
+        singular_name="vaultsecret",
+        namespaced=True,
+        verbs=["list"],
+    ),
+)
+
+
+def vault_secret(name: str) -> dict:
+    return {
+        "apiVersion": "example.com/v1",
+        "kind": "VaultSecret",
+        "metadata": {"name": name, "namespace": "shop", "uid": name},
+        "spec": {"data": "hunter2"},
+    }
+
+
+def partial_object_metadata(item: dict) -> dict:
+    return {
+        "apiVersion": "meta.k8s.io/v1",
+        "kind": "PartialObjectMetadata",
+        "metadata": item["metadata"],
+    }
+
+
+def collect(tmp_path, api_client) -> list[dict]:
+    dump_client = DumpClient(tmp_path, "ndjson")
+    result = list_unmapped(dump_client, api_client, RESOURCE, Selection(), 500, 10)
+    dump_client.close()
+    assert (result.count, result.error) == (2, None)
+    return load_objects(
+        str(tmp_path / "namespaces/shop/unmapped/VaultSecret/part-00000.ndjson")
+    )
+
+
+def test_unmapped_kinds_are_listed_as_metadata(
+    tmp_path, fake_api_client, list_response
+):
+    items = [vault_secret("db"), vault_secret("cache")]
+
+    def route(query, headers):
+        if headers["Accept"].startswith(
+            "application/json;as=PartialObjectMetadataList"
+        ):
+            return list_response(
+                {
+                    "kind": "PartialObjectMetadataList",
+                    "metadata": {"resourceVersion": "10"},
+                    "items": [partial_object_metadata(item) for item in items],
+                }
+            )
+        return list_response({"metadata": {"resourceVersion": "10"}, "items": items})
+
+    api_client = fake_api_client({SECRETS: route})
+
+    objects = collect(tmp_path, api_client)
+
+    [(_, _, headers)] = api_client.calls
+    assert headers["Accept"] == METADATA_ONLY
+    # The kind comes from discovery, not from PartialObjectMetadata
+    assert [(o["kind"], o["metadata"]["name"]) for o in objects] == [
+        ("VaultSecret", "db"),
+        ("VaultSecret", "cache"),
+    ]
+    assert all("spec" not in o for o in objects)
+
+
+def test_full_objects_are_stored_when_the_conversion_is_unsupported(
+    tmp_path, fake_api_client, list_response
+):
+    items = [vault_secret("db"), vault_secret("cache")]
+    # An API server that ignores the requested conversion
+    api_client = fake_api_client(
+        {
+            SECRETS: lambda query, headers: list_response(
+                {"metadata": {"resourceVersion": "10"}, "items": items}
+            )
+        }
+    )
+
+    objects = collect(tmp_path, api_client)
+
+    assert [(o["kind"], o["metadata"]["name"]) for o in objects] == [
+        ("VaultSecret", "db"),
+        ("VaultSecret", "cache"),
+    ]
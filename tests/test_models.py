@@ -0,0 +1,82 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from kubepyhound.models.k8s.pod import Pod
+from kubepyhound.models.k8s.resource_list import ResourceList
+
+POD = {
+    "metadata": {
+        "name": "web",
+        "namespace": "shop",
+        "uid": "1",
+        "creationTimestamp": "2024-01-01T00:00:00Z",
+        "ownerReferences": [
+            {
+                "apiVersion": "apps/v1",
+                "controller": True,
+                "kind": "ReplicaSet",
+                "name": "web-1",
+                "uid": "2",
+            }
+        ],
+    },
+    "spec": {
+        "nodeName": "node-1",
+        "serviceAccountName": "web",
+        "containers": [
+            {
+                "image": "nginx",
+                "securityContext": {"privileged": True},
+                "volumeMounts": [{"name": "logs", "mountPath": "/var/log"}],
+            },
+            {"image": "envoy", "securityContext": None},
+        ],
+        "volumes": [{"name": "logs", "hostPath": {"path": "/var/log"}}],
+    },
+}
+
+
+def test_api_json_validates_into_models():
+    pod = Pod.model_validate_json(json.dumps(POD))
+
+    assert pod.metadata.owner_references[0].api_version == "apps/v1"
+    assert pod.spec.node_name == "node-1"
+    assert pod.spec.containers[0].security_context.privileged
+    assert pod.spec.containers[0].volume_mounts[0].mount_path == "/var/log"
+    # Explicit nulls fall back to the defaults
+    assert not pod.spec.containers[1].security_context.privileged
+    assert pod.spec.volumes[0].host_path.path == "/var/log"
+
+
+def test_dumps_keep_snake_case_and_validate_again():
+    pod = Pod.model_validate_json(json.dumps(POD))
+
+    document = pod.model_dump_json()
+
+    assert '"node_name":"node-1"' in document and "nodeName" not in document
+    assert Pod.model_validate_json(document) == pod
+
+
+def test_list_envelope():
+    document = json.dumps(
+        {
+            "kind": "PodList",
+            "metadata": {"resourceVersion": "10", "continue": "token"},
+            "items": [POD],
+        }
+    )
+
+    pods = ResourceList[Pod].model_validate_json(document)
+
+    assert pods.metadata.resource_version == "10"
+    assert pods.metadata.continue_ == "token"
+    assert pods.items[0].metadata.name == "web"
+
+
+def test_objects_without_required_fields_are_rejected():
+    pod = {**POD, "spec": {"nodeName": "node-1"}}
+
+    with pytest.raises(ValidationError, match="containers"):
+        Pod.model_validate_json(json.dumps(pod))
@@ -0,0 +1,80 @@
+from dataclasses import replace
+
+import pytest
+
+from kubepyhound.dump import COLLECTIONS, Options, list_collection
+from kubepyhound.models.k8s.role import Role
+from kubepyhound.utils.helpers import DumpClient, load_objects
+from kubepyhound.utils.pager import paginate
+
+NAMES = [f"role-{index}" for index in range(5)]
+
+
+@pytest.fixture
+def list_roles(fake_list, roles):
+    return fake_list([roles(name) for name in NAMES])
+
+
+def test_pages(list_roles):
+    pages = []
+    for page in paginate(list_roles, Role, page_size=2):
+        names = [role.metadata.name for role in page.items]
+        assert page.count == len(names)
+        pages.append((page, names))
+
+    # The snapshot of the first page is only known once it has been read
+    assert [
+        (page.number, page.continue_token, page.resource_version, names)
+        for page, names in pages
+    ] == [
+        (1, None, "10", NAMES[:2]),
+        (2, "2", "10", NAMES[2:4]),
+        (3, "4", "10", NAMES[4:]),
+    ]
+    assert [(call["limit"], call["_continue"]) for call in list_roles.calls] == [
+        (2, None),
+        (2, "2"),
+        (2, "4"),
+    ]
+
+
+def test_resume_from_a_page(list_roles):
+    pages = list(paginate(list_roles, Role, 2, continue_token="2", pinned_version="10"))
+
+    assert [page.number for page in pages] == [1, 2]
+    assert [page.resource_version for page in pages] == ["10", "10"]
+    assert list_roles.calls[0]["_continue"] == "2"
+
+
+def test_unconsumed_items_are_drained(list_roles):
+    pages = list(paginate(list_roles, Role, 2))
+
+    # The continue token is read from the end of the response
+    assert len(pages) == 3
+    assert [page.count for page in pages] == [2, 2, 1]
+
+
+def test_snapshot_that_moved_is_an_error(list_roles):
+    pages = paginate(list_roles, Role, 2)
+    next(pages)
+    # The API server answers the next pages from another snapshot
+    list_roles.resource_version = "11"
+
+    with pytest.raises(Exception, match="from resourceVersion 10 to 11"):
+        list(pages)
+    assert len(list_roles.calls) == 2
+
+
+def test_collectors_write_every_page(tmp_path, list_roles):
+    collection = replace(COLLECTIONS["roles"](), list_func=list_roles)
+    dump_client = DumpClient(tmp_path, "ndjson")
+
+    resource_count, resource_version = list_collection(
+        Options(client=dump_client, page_size=2), collection
+    )
+    dump_client.close()
+
+    assert (resource_count, resource_version) == (5, "10")
+    assert len(list_roles.calls) == 3
+    segment = tmp_path / "namespaces" / "default" / "roles" / "part-00000.ndjson"
+    assert [role["metadata"]["name"] for role in load_objects(str(segment))] == NAMES
@@ -0,0 +1,111 @@
+import threading
+
+import pytest
+
+from kubepyhound.utils.pipeline import Pipeline, Run
+
+
+def test_when_written_waits_for_every_earlier_batch():
+    run = Run()
+    called = []
+    first, second = run.start(), run.start()
+    run.when_written(lambda: called.append("both"))
+    third = run.start()
+    run.when_written(lambda: called.append("all"))
+
+    run.done(second)
+    assert called == []
+    run.done(first)
+    assert called == ["both"]
+    run.done(third)
+    assert called == ["both", "all"]
+
+
+def test_when_written_without_pending_batches_calls_at_once():
+    run = Run()
+    called = []
+
+    run.when_written(lambda: called.append(1))
+    run.done(run.start())
+    run.when_written(lambda: called.append(2))
+
+    assert called == [1, 2]
+
+
+def test_when_written_is_never_called_after_an_error():
+    run = Run()
+    called = []
+    first, second = run.start(), run.start()
+    run.when_written(lambda: called.append("before"))
+
+    run.done(first, ValueError("broken"))
+    run.done(second)
+    run.when_written(lambda: called.append("after"))
+
+    assert called == []
+    assert isinstance(run.error, ValueError)
+
+
+def test_wait_returns_once_failed_batches_are_done():
+    run = Run()
+    batch = run.start()
+    threading.Timer(0.05, run.done, (batch, ValueError("broken"))).start()
+
+    run.wait()
+
+    assert isinstance(run.error, ValueError)
+
+
+@pytest.fixture
+def pipeline():
+    pipeline = Pipeline(parse_workers=3, queue_size=2)
+    yield pipeline
+    pipeline.close()
+
+
+def test_pipeline_writes_in_one_thread_and_reports_written(pipeline):
+    run = Run()
+    written: list[int] = []
+    writers: set[str] = set()
+    checkpoints: list[int] = []
+
+    def write(items):
+        writers.add(threading.current_thread().name)
+        written.extend(items)
+
+    for page in range(20):
+        items = list(range(page * 10, page * 10 + 10))
+        pipeline.submit(run, items, lambda items: [item * 2 for item in items], write)
+        # What a resumed dump would start from: only once the page is written
+        run.when_written(lambda page=page: checkpoints.append(len(written) // 10))
+    run.wait()
+
+    assert run.error is None
+    assert sorted(written) == [item * 2 for item in range(200)]
+    assert writers == {"write-0"}
+    assert checkpoints == sorted(checkpoints)
+    for page, pages_written in enumerate(checkpoints):
+        assert pages_written >= page + 1
+    _, stats = pipeline.stats()
+    assert [(stage.name, stage.items) for stage in stats[1:]] == [
+        ("parse", 200),
+        ("write", 200),
+    ]
+
+
+def test_pipeline_failures_reach_the_run(pipeline):
+    run = Run()
+    called = []
+
+    def parse(items):
+        if 3 in items:
+            raise ValueError("unparsable")
+        return items
+
+    pipeline.submit(run, [1, 2], parse, lambda items: None)
+    pipeline.submit(run, [3], parse, lambda items: None)
+    run.when_written(lambda: called.append(True))
+    run.wait()
+
+    assert isinstance(run.error, ValueError)
+    assert called == []
@@ -0,0 +1,115 @@
+import json
+
+import pytest
+
+from kubepyhound.dump import COLLECTIONS, Options
+from kubepyhound.utils.helpers import DumpClient
+from kubepyhound.utils.stream import ListItemStream
+
+METADATA = {
+    "name": "web",
+    "namespace": "default",
+    "uid": "1",
+    "creationTimestamp": "2024-01-01T00:00:00Z",
+    "labels": {"app": "web"},
+    "annotations": {"kubectl.kubernetes.io/last-applied-configuration": "{}"},
+    "managedFields": [{"manager": "kubectl", "fieldsV1": {"f:spec": {}}}],
+    "ownerReferences": [
+        {
+            "apiVersion": "apps/v1",
+            "controller": True,
+            "kind": "ReplicaSet",
+            "name": "web-1",
+            "uid": "2",
+        }
+    ],
+}
+POD_SPEC = {
+    "nodeName": "node-1",
+    "serviceAccountName": "web",
+    "containers": [
+        {
+            "name": "web",
+            "image": "nginx",
+            "securityContext": {"privileged": True},
+            "volumeMounts": [{"name": "logs", "mountPath": "/var/log"}],
+        }
+    ],
+    "initContainers": [{"name": "init", "image": "busybox"}],
+    "volumes": [{"name": "logs", "hostPath": {"path": "/var/log"}}],
+    "tolerations": [{"operator": "Exists"}],
+    "affinity": {"nodeAffinity": {}},
+    "securityContext": {"runAsUser": 1000},
+    "nodeSelector": {"disk": "ssd"},
+}
+TEMPLATE = {"metadata": {"labels": {"app": "web"}}, "spec": POD_SPEC}
+WORKLOAD_SPEC = {
+    "replicas": 2,
+    "selector": {"matchLabels": {"app": "web"}},
+    "strategy": {"type": "RollingUpdate"},
+    "template": TEMPLATE,
+}
+OBJECTS = {
+    "namespaces": {"metadata": METADATA, "spec": {"finalizers": ["kubernetes"]}},
+    "nodes": {
+        "metadata": METADATA,
+        "spec": {"podCIDR": "10.0.0.0/24"},
+        "status": {"images": [{"names": ["nginx"]}]},
+    },
+    "pods": {"metadata": METADATA, "spec": POD_SPEC, "status": {"phase": "Running"}},
+    "daemonsets": {"metadata": METADATA, "spec": WORKLOAD_SPEC, "status": {}},
+    "statefulsets": {
+        "metadata": METADATA,
+        "spec": {**WORKLOAD_SPEC, "volumeClaimTemplates": [{"metadata": {}}]},
+    },
+    "replicasets": {"metadata": METADATA, "spec": WORKLOAD_SPEC, "status": {}},
+    "deployments": {"metadata": METADATA, "spec": WORKLOAD_SPEC, "status": {}},
+    "roles": {
+        "metadata": METADATA,
+        "rules": [{"apiGroups": [""], "resources": ["pods"], "verbs": ["get"]}],
+    },
+    "cluster_roles": {
+        "metadata": METADATA,
+        "rules": [{"apiGroups": ["*"], "resources": ["*"], "verbs": ["*"]}],
+        "aggregationRule": {"clusterRoleSelectors": [{"matchLabels": {"a": "b"}}]},
+    },
+    "service_accounts": {
+        "metadata": METADATA,
+        "secrets": [
+            {"name": "token", "namespace": "default", "uid": "3", "fieldPath": ""}
+        ],
+        "imagePullSecrets": [{"name": "registry"}],
+    },
+    "services": {
+        "metadata": METADATA,
+        "spec": {
+            "type": "ClusterIP",
+            "selector": {"app": "web"},
+            "ports": [{"port": 80}],
+            "clusterIPs": ["10.0.0.1"],
+        },
+        "status": {"loadBalancer": {}},
+    },
+}
+
+
+@pytest.mark.parametrize("name", sorted(OBJECTS))
+def test_default_projection_keeps_model_fields(name):
+    collection = COLLECTIONS[name]()
+    document = json.dumps({"metadata": {}, "items": [OBJECTS[name]]}).encode()
+
+    (item,) = ListItemStream([document], collection.prune)
+
+    assert len(item) < len(json.dumps(OBJECTS[name]))
+    expected = collection.model.model_validate(OBJECTS[name])
+    assert collection.model.model_validate_json(item) == expected
+
+
+def test_raw_objects_are_only_pruned_with_prune(tmp_path):
+    collection = COLLECTIONS["pods"]()
+    client = DumpClient(tmp_path, "ndjson")
+
+    assert collection.projection(Options(client=client)) == collection.prune
+    assert collection.projection(Options(client=client, raw=True)) == ()
+    pruned = Options(client=client, raw=True, prune={"pods": ("status",)})
+    assert collection.projection(pruned) == ("status",)
@@ -0,0 +1,42 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from kubepyhound.dump import COLLECTIONS
+from kubepyhound.utils import protobuf
+from kubepyhound.utils.stream import ListItemStream
+
+FIXTURES = Path(__file__).parent / "fixtures" / "protobuf"
+RESOURCES = [
+    "pods",
+    "replicasets",
+    "roles",
+    "role_bindings",
+    "cluster_roles",
+    "cluster_role_bindings",
+]
+
+
+@pytest.mark.parametrize("name", RESOURCES)
+def test_protobuf_list_validates_like_json(name):
+    collection = COLLECTIONS[name]()
+    document = (FIXTURES / f"{name}.json").read_bytes()
+    stream = ListItemStream([document], collection.prune)
+    from_json = [collection.model.model_validate_json(item) for item in stream]
+
+    metadata, items = protobuf.split_list((FIXTURES / f"{name}.pb").read_bytes())
+    from_protobuf = [
+        collection.model.model_validate(
+            protobuf.decode(item, collection.protobuf_resource.message)
+        )
+        for item in items
+    ]
+
+    assert from_json and from_protobuf == from_json
+    assert metadata == json.loads(document)["metadata"]
+
+
+def test_split_list_rejects_other_encodings():
+    with pytest.raises(Exception):
+        protobuf.split_list((FIXTURES / "pods.json").read_bytes())
@@ -0,0 +1,57 @@
+from dataclasses import replace
+
+import pytest
+import typer
+
+from kubepyhound import dump
+from kubepyhound.utils.helpers import load_objects
+
+
+@pytest.mark.parametrize("option", ["--protobuf", "--active-only"])
+def test_raw_rejects_options_that_need_validated_objects(tmp_path, run_dump, option):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+
+    result = run_dump("--raw", option, str(output_dir), "roles")
+
+    assert result.exit_code != 0
+    assert isinstance(result.exception, typer.BadParameter)
+    assert option in str(result.exception)
+    # Rejected before anything was collected
+    assert list(output_dir.iterdir()) == []
+
+
+def test_raw_roles_are_validated_by_bootstrap(
+    tmp_path, monkeypatch, run_dump, fake_list, roles
+):
+    list_func = fake_list([roles("reader"), roles("writer", "shop")])
+    get_collection = dump.COLLECTIONS["roles"]
+    monkeypatch.setitem(
+        dump.COLLECTIONS,
+        "roles",
+        lambda: replace(get_collection(), list_func=list_func),
+    )
+    monkeypatch.chdir(tmp_path)
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+
+    result = run_dump("--raw", "--format", "ndjson", str(output_dir), "roles")
+
+    assert result.exit_code == 0, result.output
+    raw_objects = [
+        raw_object
+        for segment in sorted((output_dir / "raw" / "roles").glob("part-*"))
+        for raw_object in load_objects(str(segment))
+    ]
+    assert sorted(o["metadata"]["name"] for o in raw_objects) == ["reader", "writer"]
+
+    result = run_dump("--format", "ndjson", str(output_dir), "bootstrap")
+
+    assert result.exit_code == 0, result.output
+    assert "Validated 2 raw roles" in result.output
+    assert not (output_dir / "raw").exists()
+    assert sorted(
+        o["metadata"]["name"]
+        for segment in output_dir.glob("namespaces/*/roles/part-*")
+        for o in load_objects(str(segment))
+    ) == ["reader", "writer"]
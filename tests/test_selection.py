@@ -0,0 +1,20 @@
+from kubepyhound.dump import Selection, selector_fields
+
+
+def test_selector_fields():
+    assert selector_fields(None) == set()
+    assert selector_fields("status.phase!=Failed,spec.nodeName==a,metadata.name=b") == {
+        "status.phase",
+        "spec.nodeName",
+        "metadata.name",
+    }
+
+
+def test_field_selector_only_applies_where_supported():
+    selection = Selection(field_selector="status.phase=Running", label_selector="a=b")
+
+    assert selection.supporting(("status.phase",)) is selection
+    unsupported = selection.supporting(())
+    assert unsupported.field_selector is None
+    assert unsupported.label_selector == "a=b"
+    assert Selection(field_selector="metadata.name=x").supporting(()).field_selector
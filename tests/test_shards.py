@@ -0,0 +1,98 @@
+from dataclasses import replace
+
+import duckdb
+import pytest
+from kubernetes.client.exceptions import ApiException
+
+from kubepyhound import dump
+from kubepyhound.dump import Options, collect_shard
+from kubepyhound.utils.checkpoint import Checkpoint
+from kubepyhound.utils.helpers import DumpClient, load_objects
+from kubepyhound.utils.tables import DATABASE
+
+NAMES = [f"role-{index}" for index in range(7)]
+
+
+@pytest.fixture
+def listed_roles(monkeypatch, fake_list, roles):
+    """The namespaced role list of the roles collection, over the roles in
+    NAMES in the shop namespace and one in another namespace"""
+    list_func = fake_list([roles(name, "shop") for name in NAMES] + [roles("x")])
+    get_collection = dump.COLLECTIONS["roles"]
+    monkeypatch.setitem(
+        dump.COLLECTIONS,
+        "roles",
+        lambda: replace(get_collection(), namespaced_list_func=list_func),
+    )
+    monkeypatch.setattr(dump, "SHARD_RETRY_DELAY", 0)
+    return list_func
+
+
+def stored_names(path) -> list[str]:
+    return sorted(
+        resource_object["metadata"]["name"]
+        for segment in sorted(path.glob("part-*"))
+        for resource_object in load_objects(str(segment))
+    )
+
+
+@pytest.mark.parametrize("mode", ["ndjson", "duckdb"])
+@pytest.mark.parametrize("with_checkpoint", [False, True])
+def test_failed_shard_is_rolled_back_before_retrying(
+    tmp_path, monkeypatch, listed_roles, mode, with_checkpoint
+):
+    monkeypatch.chdir(tmp_path)
+    # Pages one and two are written, the third fails
+    listed_roles.failures[3] = ApiException(status=503)
+    dump_client = DumpClient(tmp_path / "output", mode)
+    checkpoint = (
+        Checkpoint(tmp_path / "checkpoint.json", save_interval=0)
+        if with_checkpoint
+        else None
+    )
+    options = Options(client=dump_client, page_size=3, checkpoint=checkpoint)
+
+    resource_count, _ = collect_shard(options, "roles", "shop")
+    dump_client.close()
+
+    assert resource_count == len(NAMES)
+    # The retry starts over with the first page
+    assert [call["_continue"] for call in listed_roles.calls] == [
+        None,
+        "3",
+        "6",
+        None,
+        "3",
+        "6",
+    ]
+    assert stored_names(tmp_path / "output" / "namespaces" / "shop" / "roles") == NAMES
+    if mode == "duckdb":
+        con = duckdb.connect(DATABASE, read_only=True)
+        rows = con.execute("SELECT metadata.name FROM roles ORDER BY 1").fetchall()
+        con.close()
+        assert rows == [(name,) for name in NAMES]
+
+
+def test_raw_shard_skips_what_the_failed_attempt_wrote(tmp_path, listed_roles):
+    listed_roles.failures[2] = ApiException(status=503)
+    dump_client = DumpClient(tmp_path, "ndjson")
+    # Another namespace, written by a shard of its own
+    dump_client.write_raw(
+        [b'{"metadata": {"name": "x", "namespace": "default"}}\n'], "roles"
+    )
+    options = Options(client=dump_client, page_size=3, raw=True)
+
+    resource_count, _ = collect_shard(options, "roles", "shop")
+    dump_client.close()
+
+    assert resource_count == len(NAMES)
+    assert stored_names(tmp_path / "raw" / "roles") == sorted([*NAMES, "x"])
+
+
+def test_shard_gives_up_on_other_errors(tmp_path, listed_roles):
+    listed_roles.failures[2] = ApiException(status=403)
+    options = Options(client=DumpClient(tmp_path, "ndjson"), page_size=3)
+
+    with pytest.raises(ApiException):
+        collect_shard(options, "roles", "shop")
+    assert len(listed_roles.calls) == 2
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from kubepyhound.utils.stream import ListItemStream
+
+ITEMS = [
+    {
+        "metadata": {
+            "name": 'tricky "quoted" } ] name',
+            "annotations": {"a": '{[\\"}'},
+            "managedFields": [{"manager": "kubectl", "fieldsV1": {"f:spec": {}}}],
+            "labels": {"app": "x\\y"},
+        },
+        "spec": {"containers": [{"image": "nginx", "args": ["[", "{", "\\"]}]},
+        "status": {"phase": "Running", "conditions": [{"type": "Ready"}]},
+    },
+    {"metadata": {"name": "unicode é中", "uid": "2"}, "spec": {}},
+]
+PRUNE = ("metadata.managedFields", "metadata.annotations", "status")
+
+
+def chunked(document: bytes, size: int) -> list[bytes]:
+    return [document[start : start + size] for start in range(0, len(document), size)]
+
+
+def list_document(items: list, **kwargs) -> bytes:
+    return json.dumps(
+        {
+            "kind": "PodList",
+            "apiVersion": "v1",
+            "metadata": {"resourceVersion": "10", "continue": "token"},
+            "items": items,
+        },
+        **kwargs,
+    ).encode()
+
+
+def pruned(item: dict) -> dict:
+    item = json.loads(json.dumps(item))
+    item.pop("status", None)
+    item["metadata"].pop("managedFields", None)
+    item["metadata"].pop("annotations", None)
+    return item
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 64, 1 << 16])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_chunk_boundaries(size, indent):
+    document = list_document(ITEMS, indent=indent)
+    stream = ListItemStream(chunked(document, size))
+
+    assert [json.loads(item) for item in stream] == ITEMS
+    envelope = json.loads(stream.envelope)
+    assert envelope["items"] == []
+    assert envelope["metadata"] == {"resourceVersion": "10", "continue": "token"}
+
+
+@pytest.mark.parametrize("size", [1, 3, 4, 11, 1 << 16])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_nested_pruning(size, indent):
+    document = list_document(ITEMS, indent=indent)
+    stream = ListItemStream(chunked(document, size), PRUNE)
+
+    assert [json.loads(item) for item in stream] == [pruned(item) for item in ITEMS]
+    assert json.loads(stream.envelope)["metadata"]["continue"] == "token"
+
+
+def test_pruned_member_first_and_last():
+    items = [{"status": {"a": [1]}, "metadata": {"managedFields": [], "name": "n"}}]
+    document = list_document(items)
+
+    (item,) = ListItemStream(chunked(document, 5), PRUNE)
+
+    assert json.loads(item) == {"metadata": {"name": "n"}}
+
+
+def test_scalar_members_are_not_pruned():
+    items = [{"metadata": {"name": "n", "annotations": None}, "status": "x"}]
+
+    (item,) = ListItemStream([list_document(items)], PRUNE)
+
+    assert json.loads(item) == items[0]
+
+
+@pytest.mark.parametrize("size", [1, 4, 1 << 16])
+def test_empty_items(size):
+    stream = ListItemStream(chunked(list_document([]), size), PRUNE)
+
+    assert list(stream) == []
+    assert json.loads(stream.envelope)["metadata"]["resourceVersion"] == "10"
+
+
+def test_items_before_metadata():
+    document = b'{"items": [{"a": "]"}], "metadata": {"continue": "c"}}'
+
+    stream = ListItemStream(chunked(document, 3))
+
+    assert [json.loads(item) for item in stream] == [{"a": "]"}]
+    assert json.loads(stream.envelope) == {"items": [], "metadata": {"continue": "c"}}
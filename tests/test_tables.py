@@ -0,0 +1,145 @@
+import gzip
+import json
+
+import duckdb
+import pytest
+
+from kubepyhound.utils.tables import TableDefinition, TableWriter, load_tables
+
+ROLES_SQL = """CREATE OR REPLACE TABLE roles AS SELECT * FROM read_json(
+  'output/namespaces/**/roles/*.json',
+  columns = {
+    metadata: 'STRUCT(name VARCHAR, namespace VARCHAR)',
+    rules: 'STRUCT(verbs VARCHAR[])[]'
+  }
+);"""
+GROUPS_SQL = """CREATE OR REPLACE TABLE groups AS SELECT * FROM read_json(
+  ['output/group/*.json', 'output/namespaces/**/group/*.json'],
+  columns = {name: 'VARCHAR'}
+);"""
+
+
+def role(name: str, namespace: str) -> dict:
+    return {
+        "metadata": {"name": name, "namespace": namespace, "uid": "ignored"},
+        "rules": [{"verbs": ["get"]}],
+    }
+
+
+@pytest.fixture
+def queries(tmp_path):
+    queries_path = tmp_path / "tables"
+    queries_path.mkdir()
+    (queries_path / "roles.sql").write_text(ROLES_SQL)
+    (queries_path / "groups.sql").write_text(GROUPS_SQL)
+    (queries_path / "zz_view.sql").write_text(
+        "CREATE OR REPLACE VIEW role_names AS SELECT metadata.name FROM roles;"
+    )
+    return queries_path
+
+
+@pytest.fixture
+def con():
+    connection = duckdb.connect()
+    yield connection
+    connection.close()
+
+
+def test_from_sql():
+    definition = TableDefinition.from_sql(ROLES_SQL)
+
+    assert definition.name == "roles"
+    assert definition.sources == ["namespaces/**/roles/*"]
+    assert "metadata:" in definition.columns
+
+    groups = TableDefinition.from_sql(GROUPS_SQL)
+    assert groups.sources == ["group/*", "namespaces/**/group/*"]
+
+
+def test_from_sql_ignores_other_statements():
+    assert TableDefinition.from_sql("CREATE VIEW x AS SELECT 1;") is None
+
+
+def test_matches():
+    definition = TableDefinition.from_sql(ROLES_SQL)
+
+    assert definition.matches("namespaces/default/roles/admin")
+    assert definition.matches("namespaces/default/roles/part-00000")
+    assert not definition.matches("namespaces/default/rolebindings/admin")
+    assert not definition.matches("roles/admin")
+
+
+def test_load_json_ndjson_and_compressed(tmp_path, con):
+    simple = tmp_path / "namespaces" / "default" / "roles"
+    simple.mkdir(parents=True)
+    (simple / "a.json").write_text(json.dumps(role("a", "default"), indent=2))
+    segments = tmp_path / "namespaces" / "other" / "roles"
+    segments.mkdir(parents=True)
+    (segments / "part-00000.ndjson").write_text(
+        "\n".join(json.dumps(role(name, "other")) for name in ("b", "c")) + "\n"
+    )
+    with gzip.open(segments / "part-00001.ndjson.gz", "wt") as segment:
+        segment.write(json.dumps(role("d", "other")) + "\n")
+
+    TableDefinition.from_sql(ROLES_SQL).load(con, tmp_path)
+
+    rows = con.execute(
+        "SELECT metadata.name, metadata.namespace, rules[1].verbs FROM roles "
+        "ORDER BY 1"
+    ).fetchall()
+    assert rows == [
+        ("a", "default", ["get"]),
+        ("b", "other", ["get"]),
+        ("c", "other", ["get"]),
+        ("d", "other", ["get"]),
+    ]
+
+
+def test_load_without_sources_creates_empty_table(tmp_path, con):
+    definition = TableDefinition.from_sql(ROLES_SQL)
+
+    definition.load(con, tmp_path)
+
+    assert con.execute("SELECT count(*) FROM roles").fetchone() == (0,)
+    assert definition.column_types(con) == {
+        "metadata": "STRUCT(name VARCHAR, namespace VARCHAR)",
+        "rules": "STRUCT(verbs VARCHAR[])[]",
+    }
+
+
+def test_parquet_export_is_preferred(tmp_path, con):
+    directory = tmp_path / "namespaces" / "default" / "roles"
+    directory.mkdir(parents=True)
+    (directory / "a.json").write_text(json.dumps(role("a", "default")))
+    definition = TableDefinition.from_sql(ROLES_SQL)
+
+    parquet_file = definition.export_parquet(con, tmp_path)
+    (directory / "a.json").unlink()
+    definition.load(con, tmp_path)
+
+    assert parquet_file == tmp_path / "roles.parquet"
+    assert con.execute("SELECT metadata.name FROM roles").fetchall() == [("a",)]
+
+
+def test_load_tables_runs_other_queries(tmp_path, con, queries):
+    directory = tmp_path / "namespaces" / "default" / "roles"
+    directory.mkdir(parents=True)
+    (directory / "a.json").write_text(json.dumps(role("a", "default")))
+
+    load_tables(con, tmp_path, queries)
+
+    assert con.execute("SELECT name FROM role_names").fetchall() == [("a",)]
+    assert con.execute("SELECT count(*) FROM groups").fetchone() == (0,)
+
+
+def test_table_writer_routes_and_batches(tmp_path, con, queries):
+    writer = TableWriter(con, tmp_path, batch_size=2, queries_path=queries)
+
+    writer.append("namespaces/default/roles", "a", json.dumps(role("a", "default")))
+    assert con.execute("SELECT count(*) FROM roles").fetchone() == (0,)
+    writer.append("namespaces/default/roles", "b", json.dumps(role("b", "default")))
+    writer.append("group", "admins", json.dumps({"name": "admins", "extra": 1}))
+    assert con.execute("SELECT count(*) FROM roles").fetchone() == (2,)
+    writer.flush()
+
+    assert con.execute("SELECT name FROM groups").fetchall() == [("admins",)]
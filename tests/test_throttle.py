@@ -0,0 +1,257 @@
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from kubernetes import client
+from kubernetes.client.exceptions import ApiException
+
+from kubepyhound import dump
+from kubepyhound.utils import throttle
+from kubepyhound.utils.pager import _iter_lines
+from kubepyhound.utils.throttle import (
+    BACKOFF_MAX,
+    PRIORITY_LEVEL_HEADER,
+    RateLimiter,
+    ThrottledApiClient,
+    retry_delay,
+)
+
+
+def api_exception(status: int, headers: dict | None = None) -> ApiException:
+    e = ApiException(status=status)
+    e.headers = headers
+    return e
+
+
+def acquire_in_thread(limiter: RateLimiter) -> threading.Event:
+    """Calls acquire() in a thread, the event is set once it returned"""
+    acquired = threading.Event()
+
+    def acquire():
+        limiter.acquire()
+        acquired.set()
+
+    threading.Thread(target=acquire, daemon=True).start()
+    return acquired
+
+
+def test_burst_then_qps():
+    limiter = RateLimiter(qps=20, burst=3)
+
+    started = time.monotonic()
+    for _ in range(3):
+        limiter.acquire()
+        limiter.release()
+    assert time.monotonic() - started < 0.04
+
+    for _ in range(2):
+        limiter.acquire()
+        limiter.release()
+    # Two more tokens take 1/20 s each to refill
+    assert 0.09 <= time.monotonic() - started < 0.5
+
+
+def test_zero_qps_disables_the_bucket():
+    limiter = RateLimiter(qps=0, burst=1000)
+
+    started = time.monotonic()
+    for _ in range(2000):
+        limiter.acquire()
+        limiter.release()
+
+    assert time.monotonic() - started < 0.5
+
+
+def test_in_flight_requests_are_capped_by_burst():
+    limiter = RateLimiter(qps=0, burst=2)
+    limiter.acquire()
+    limiter.acquire()
+
+    waiting = acquire_in_thread(limiter)
+    assert not waiting.wait(0.05)
+    limiter.release()
+    assert waiting.wait(1)
+
+
+def test_rejection_halves_the_cap_and_successes_grow_it_back():
+    limiter = RateLimiter(qps=0, burst=4)
+    for _ in range(4):
+        limiter.acquire()
+
+    limiter.release(rejected=True)
+    assert limiter._limit == 2
+    # Three requests are in flight, two after the next release: still too many
+    limiter.release()
+    waiting = acquire_in_thread(limiter)
+    assert not waiting.wait(0.05)
+    limiter.release()
+    assert waiting.wait(1)
+    limiter.release()
+
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release()
+    assert limiter._limit == 4
+
+
+def test_retry_delay_honours_retry_after():
+    assert retry_delay(api_exception(429, {"Retry-After": "3"}), 0) == 3
+    assert retry_delay(api_exception(429, {"Retry-After": "3600"}), 0) == BACKOFF_MAX
+
+
+@pytest.mark.parametrize("attempt", [0, 1, 4, 20])
+def test_retry_delay_backs_off_exponentially(attempt):
+    delay = min(throttle.BACKOFF_BASE * 2**attempt, BACKOFF_MAX)
+
+    for headers in (None, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}):
+        assert delay <= retry_delay(api_exception(503, headers), attempt) <= delay * 1.5
+
+
+@pytest.fixture
+def responses(monkeypatch):
+    """Makes the requests of a ThrottledApiClient answer with the queued
+    exceptions, then with "ok"; records the delays slept"""
+    queued: list[ApiException] = []
+    sleeps: list[float] = []
+
+    def request(self, method, url, *args, **kwargs):
+        if queued:
+            raise queued.pop(0)
+        return "ok"
+
+    monkeypatch.setattr(client.ApiClient, "request", request)
+    monkeypatch.setattr(throttle.time, "sleep", sleeps.append)
+    return queued, sleeps
+
+
+def test_client_retries_throttled_reads(responses):
+    queued, sleeps = responses
+    queued.extend([api_exception(429, {"Retry-After": "2"}), api_exception(503)])
+    api_client = ThrottledApiClient(RateLimiter(qps=0, burst=1))
+
+    assert api_client.request("GET", "/api/v1/pods") == "ok"
+    assert len(sleeps) == 2 and sleeps[0] == 2
+    # Every attempt gave its slot back
+    assert api_client.limiter._in_flight == 0
+
+
+def test_client_does_not_retry_writes_or_client_errors(responses):
+    queued, sleeps = responses
+    api_client = ThrottledApiClient(RateLimiter(qps=0, burst=1))
+
+    queued.append(api_exception(503))
+    with pytest.raises(ApiException):
+        api_client.request("POST", "/api/v1/pods")
+    queued.append(api_exception(404))
+    with pytest.raises(ApiException):
+        api_client.request("GET", "/api/v1/pods/x")
+    assert sleeps == []
+
+
+def test_client_gives_up_after_retries(responses):
+    queued, sleeps = responses
+    queued.extend(api_exception(500) for _ in range(3))
+    api_client = ThrottledApiClient(RateLimiter(qps=0, burst=1), retries=2)
+
+    with pytest.raises(ApiException):
+        api_client.request("GET", "/api/v1/pods")
+    assert len(sleeps) == 2
+
+
+def test_priority_and_fairness_rejection_lowers_the_cap(responses):
+    queued, _ = responses
+    queued.append(api_exception(429, {PRIORITY_LEVEL_HEADER: "uid"}))
+    limiter = RateLimiter(qps=0, burst=8)
+    api_client = ThrottledApiClient(limiter)
+
+    api_client.request("GET", "/api/v1/pods")
+
+    # Halved to 4, then one success grows it by a quarter
+    assert limiter._limit == pytest.approx(4.25)
+
+
+@pytest.fixture
+def api_server(monkeypatch):
+    """A local API server answering every GET with the lines of a watch,
+    gzip encoded when the request accepts it; records the request headers"""
+    lines = b"".join(b'{"type": "ADDED", "n": %d}\n' % n for n in range(1000))
+    requests: list[dict] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests.append(dict(self.headers))
+            body = lines
+            self.send_response(200)
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = gzip.compress(lines)
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    configuration = client.Configuration()
+    configuration.host = f"http://127.0.0.1:{server.server_port}"
+    monkeypatch.setattr(client.Configuration, "_default", configuration)
+    yield lines, requests
+    server.shutdown()
+    server.server_close()
+
+
+def get(api_client: ThrottledApiClient):
+    return api_client.call_api(
+        "/api/v1/pods",
+        "GET",
+        _preload_content=False,
+        _return_http_data_only=True,
+    )
+
+
+@pytest.mark.parametrize("compressed", [True, False])
+def test_client_requests_gzip_and_decodes_streams(api_server, compressed):
+    lines, requests = api_server
+    api_client = ThrottledApiClient(RateLimiter(qps=0, burst=1), gzip=compressed)
+
+    response = get(api_client)
+    received = [line + b"\n" for line in _iter_lines(response)]
+    response.release_conn()
+
+    assert (requests[0].get("Accept-Encoding") == "gzip") is compressed
+    assert (response.headers.get("Content-Encoding") == "gzip") is compressed
+    assert b"".join(received) == lines
+
+
+def test_client_pools_connections(api_server):
+    _, requests = api_server
+    api_client = ThrottledApiClient(RateLimiter(qps=0, burst=1), pool_size=4)
+
+    for _ in range(3):
+        get(api_client).release_conn()
+
+    pool = api_client.rest_client.pool_manager.connection_from_url(
+        api_client.configuration.host
+    )
+    assert pool.pool.maxsize == 4
+    # All requests went over the one connection kept alive
+    assert pool.num_connections == 1
+    assert len(requests) == 3
+
+
+def test_configure_client_replaces_the_shared_client(monkeypatch):
+    monkeypatch.setattr(dump, "shared_client", None)
+    monkeypatch.setattr(dump, "rate_limiter", RateLimiter())
+
+    dump.configure_client(qps=5, burst=2, pool_size=8, gzip=False)
+
+    api_client = dump.kube_client()
+    assert api_client is dump.kube_client()
+    assert api_client.limiter is dump.rate_limiter
+    assert api_client.configuration.connection_pool_maxsize == 8
+    assert "Accept-Encoding" not in api_client.default_headers
@@ -0,0 +1,133 @@
+import json
+import threading
+from dataclasses import replace
+
+import pytest
+from kubernetes.client.exceptions import ApiException
+
+from kubepyhound.dump import COLLECTIONS, Options, watch_collection
+from kubepyhound.models.k8s.role import Role
+from kubepyhound.utils.checkpoint import Checkpoint
+from kubepyhound.utils.helpers import DumpClient
+from kubepyhound.utils.pager import ResourceVersionExpired, watch
+
+
+class WatchResponse:
+    """A watch stream of ``events``, as the API server sends them"""
+
+    def __init__(self, events: list[dict]):
+        self.lines = [json.dumps(event).encode() + b"\n" for event in events]
+
+    def stream(self, amt=None, decode_content=True):
+        yield from self.lines
+
+    def close(self):
+        pass
+
+    def release_conn(self):
+        pass
+
+
+def event(event_type: str, resource_object: dict, resource_version: str) -> dict:
+    metadata = {**resource_object["metadata"], "resourceVersion": resource_version}
+    return {"type": event_type, "object": {**resource_object, "metadata": metadata}}
+
+
+def expired() -> dict:
+    return {"type": "ERROR", "object": {"kind": "Status", "code": 410}}
+
+
+@pytest.fixture
+def role_api(fake_list):
+    """A role list call that answers the lists with the next of ``listings``
+    and the watches with the next of ``watches``, a list of events or an
+    exception. ``stop`` is set once the last watch has started"""
+
+    class RoleApi(fake_list):
+        def __init__(self):
+            super().__init__([])
+            self.listings: list[tuple[str, list[dict]]] = []
+            self.watches: list[list[dict] | Exception] = []
+            self.stop = threading.Event()
+
+        def __call__(self, watch=False, **kwargs):
+            if not watch:
+                if kwargs.get("_continue") is None:
+                    self.resource_version, self.items = self.listings.pop(0)
+                return super().__call__(**kwargs)
+            self.calls.append({"watch": True, **kwargs})
+            events = self.watches.pop(0)
+            if not self.watches:
+                self.stop.set()
+            if isinstance(events, Exception):
+                raise events
+            return WatchResponse(events)
+
+    return RoleApi()
+
+
+def test_watch_streams_events(role_api, roles):
+    role_api.watches = [
+        [
+            event("ADDED", roles("a"), "11"),
+            {"type": "BOOKMARK", "object": {"metadata": {"resourceVersion": "12"}}},
+            event("DELETED", roles("a"), "13"),
+        ]
+    ]
+
+    events = list(watch(role_api, Role, "10", timeout_seconds=30))
+
+    assert [(e.type, e.resource_version) for e in events] == [
+        ("ADDED", "11"),
+        ("BOOKMARK", "12"),
+        ("DELETED", "13"),
+    ]
+    assert events[0].object.metadata.name == "a" and events[1].object is None
+    call = role_api.calls[0]
+    assert call["resource_version"] == "10" and call["allow_watch_bookmarks"]
+    assert call["timeout_seconds"] == 30
+
+
+@pytest.mark.parametrize(
+    "events", [ApiException(status=410), [expired()]], ids=["status", "event"]
+)
+def test_expired_resource_version(role_api, events):
+    role_api.watches = [events]
+
+    with pytest.raises(ResourceVersionExpired):
+        list(watch(role_api, Role, "10"))
+
+
+def test_failed_watch(role_api):
+    role_api.watches = [[{"type": "ERROR", "object": {"message": "too old"}}]]
+
+    with pytest.raises(Exception, match="Watch failed: too old"):
+        list(watch(role_api, Role, "10"))
+
+
+def test_watch_collection_relists_once_expired(tmp_path, role_api, roles):
+    dump_client = DumpClient(tmp_path, "simple")
+    dump_client.deduplicated = None
+    # Left behind by an earlier run, deleted while nobody was watching
+    dump_client.write(
+        Role.model_validate(roles("old")),
+        name="old",
+        resource="roles",
+        namespace="default",
+    )
+    role_api.listings = [("10", [roles("a"), roles("b")]), ("20", [roles("c")])]
+    role_api.watches = [
+        [event("DELETED", roles("a"), "11"), expired()],
+        [event("ADDED", roles("d"), "21")],
+    ]
+    collection = replace(COLLECTIONS["roles"](), list_func=role_api)
+    checkpoint = Checkpoint(tmp_path / "checkpoint.json")
+
+    watch_collection(
+        Options(client=dump_client), "roles", collection, checkpoint, role_api.stop
+    )
+
+    assert sorted(name for _, name in dump_client.stored("roles")) == ["c", "d"]
+    assert checkpoint.get("roles") == "21"
+    watches = [call for call in role_api.calls if call.get("watch")]
+    assert [call["resource_version"] for call in watches] == ["10", "20"]